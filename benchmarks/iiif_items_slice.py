@@ -0,0 +1,61 @@
+"""Compare serving the first page of canvases of a large manifest, sliced from the
+stored iiif_json in the database, against serving the whole manifest.
+
+The benchmark writes (and then deletes) manifests in the configured database,
+so it is run in a project with iiif_store installed, e.g.
+
+    cd example_project
+    DJANGO_SETTINGS_MODULE=example_project.settings python ../benchmarks/iiif_items_slice.py
+"""
+import pathlib
+import sys
+import timeit
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+import django
+
+django.setup()
+
+from iiif_store.deletion import delete_iiif_resources
+from iiif_store.models import IIIFResource
+from iiif_store.rendering import render_public_iiif_json
+from iiif_store.slicing import get_public_iiif_json_slice
+
+from replace_iiif_ids import make_manifest
+
+
+def get_first_page(resource_id):
+    return get_public_iiif_json_slice(resource_id, offset=0, limit=10)[0]
+
+
+def benchmark(func, resource_id, number):
+    return min(timeit.repeat(lambda: func(resource_id), number=number, repeat=3)) / number
+
+
+if __name__ == "__main__":
+    print(
+        f"{'canvases':>10} {'whole (MB)':>11} {'page (KB)':>10} {'whole (s)':>10} {'page (s)':>9} {'speedup':>8}"
+    )
+    for canvas_count in [100, 1000, 5000, 20000]:
+        manifest = make_manifest(canvas_count)
+        manifest["id"] = f"https://example.org/iiif/benchmark/{canvas_count}"
+        # bulk_create writes the manifest without indexing it.
+        (resource,) = IIIFResource.objects.bulk_create(
+            [
+                IIIFResource(
+                    original_id=manifest["id"], iiif_type="manifest", iiif_json=manifest
+                )
+            ]
+        )
+        try:
+            number = max(1, 200 // canvas_count)
+            whole_size = len(render_public_iiif_json(resource.id)) / 1024 / 1024
+            page_size = len(get_first_page(resource.id)) / 1024
+            whole = benchmark(render_public_iiif_json, resource.id, number)
+            page = benchmark(get_first_page, resource.id, number)
+            print(
+                f"{canvas_count:>10} {whole_size:11.2f} {page_size:10.1f} {whole:10.4f} {page:9.4f} {whole / page:7.1f}x"
+            )
+        finally:
+            delete_iiif_resources([resource.id])
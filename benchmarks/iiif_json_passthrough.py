@@ -0,0 +1,60 @@
+"""Compare serving the public iiif_json of a manifest by passing the stored JSON
+text through from the database, against decoding it and rendering it again with
+the DRF JSONRenderer.
+
+The benchmark writes (and then deletes) manifests in the configured database,
+so it is run in a project with iiif_store installed, e.g.
+
+    cd example_project
+    DJANGO_SETTINGS_MODULE=example_project.settings python ../benchmarks/iiif_json_passthrough.py
+"""
+import pathlib
+import sys
+import timeit
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+import django
+
+django.setup()
+
+from iiif_store.deletion import delete_iiif_resources
+from iiif_store.models import IIIFResource
+from iiif_store.rendering import get_stored_iiif_json_content, render_iiif_json
+
+from replace_iiif_ids import make_manifest
+
+
+def render_with_serializer(resource_id):
+    return render_iiif_json(IIIFResource.objects.get(id=resource_id).get_public_iiif_json())
+
+
+def benchmark(func, resource_id, number):
+    return min(timeit.repeat(lambda: func(resource_id), number=number, repeat=3)) / number
+
+
+if __name__ == "__main__":
+    print(
+        f"{'canvases':>10} {'size (MB)':>10} {'rendered (s)':>13} {'passthrough (s)':>16} {'speedup':>8}"
+    )
+    for canvas_count in [100, 1000, 5000, 20000]:
+        manifest = make_manifest(canvas_count)
+        manifest["id"] = f"https://example.org/iiif/benchmark/{canvas_count}"
+        # bulk_create writes the manifest without indexing it.
+        (resource,) = IIIFResource.objects.bulk_create(
+            [
+                IIIFResource(
+                    original_id=manifest["id"], iiif_type="manifest", iiif_json=manifest
+                )
+            ]
+        )
+        try:
+            number = max(1, 200 // canvas_count)
+            size = len(get_stored_iiif_json_content(resource.id)) / 1024 / 1024
+            rendered = benchmark(render_with_serializer, resource.id, number)
+            passthrough = benchmark(get_stored_iiif_json_content, resource.id, number)
+            print(
+                f"{canvas_count:>10} {size:10.2f} {rendered:13.4f} {passthrough:16.4f} {rendered / passthrough:7.1f}x"
+            )
+        finally:
+            delete_iiif_resources([resource.id])
@@ -0,0 +1,105 @@
+"""Compare indexing the text of a metadata-heavy manifest and its canvases with
+the markup-free fast path and cached html to text conversion, against parsing
+each value with BeautifulSoup and bleach.
+
+The benchmark indexes unsaved IIIF resources, so does not write to the database,
+but is run in a project with iiif_store installed, e.g.
+
+    cd example_project
+    DJANGO_SETTINGS_MODULE=example_project.settings python ../benchmarks/indexable_text.py
+"""
+import pathlib
+import sys
+import timeit
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+import django
+
+django.setup()
+
+import bleach
+from bs4 import BeautifulSoup
+
+from iiif_store.models import IIIFResource
+from iiif_store.serializers import IIIFResourceToIndexableSerializer
+from iiif_store.text import clean_html, html_to_text
+
+RIGHTS = (
+    '<span>Rights: <a href="http://rightsstatements.org/vocab/InC/1.0/">'
+    "In Copyright</a> &amp; used with permission</span>"
+)
+
+
+class BeautifulSoupIndexableSerializer(IIIFResourceToIndexableSerializer):
+    def _text_indexable(self, type, subtype, value, language):
+        return {
+            "type": type,
+            "subtype": subtype.lower(),
+            "indexable_text": BeautifulSoup(value, "html.parser").text,
+            "original_content": str({subtype: bleach.clean(value)}),
+            "language": language,
+        }
+
+
+def make_metadata_resources(canvas_count):
+    """Return a manifest and canvases with the repeated and mostly plain text
+    descriptive metadata of a digitised volume.
+    """
+    metadata = [
+        {"label": {"en": ["Collection"]}, "value": {"en": ["Newspapers of the North"]}},
+        {"label": {"en": ["Publisher"]}, "value": {"en": ["The Northern Echo"]}},
+        {"label": {"en": ["Language"]}, "value": {"en": ["English"], "cy": ["Saesneg"]}},
+        {"label": {"en": ["Attribution"]}, "value": {"en": [RIGHTS]}},
+        {"label": {"en": ["Date"]}, "value": {"en": ["1901-01-01"]}},
+    ]
+    resources = [
+        {
+            "type": "Manifest",
+            "label": {"en": ["The Northern Echo, 1901"]},
+            "summary": {"en": ["<p>A <b>daily</b> newspaper, digitised from microfilm.</p>"]},
+            "requiredStatement": {"label": {"en": ["Rights"]}, "value": {"en": [RIGHTS]}},
+            "metadata": metadata,
+            "navDate": "1901-01-01T00:00:00Z",
+        }
+    ]
+    for i in range(canvas_count):
+        resources.append(
+            {
+                "type": "Canvas",
+                "label": {"en": [f"Page {i + 1}"]},
+                "summary": {"en": [f"Issue {i // 8 + 1}, page {i % 8 + 1}"]},
+                "requiredStatement": {"label": {"en": ["Rights"]}, "value": {"en": [RIGHTS]}},
+                "metadata": metadata + [{"label": {"en": ["Page"]}, "value": {"none": [str(i + 1)]}}],
+            }
+        )
+    return [IIIFResource(iiif_type=r["type"].lower(), iiif_json=r) for r in resources]
+
+
+def index(serializer, resources):
+    # Each run starts from an empty cache, as for a single batch.
+    html_to_text.cache_clear()
+    clean_html.cache_clear()
+    return sum(len(serializer.to_indexables(resource)) for resource in resources)
+
+
+if __name__ == "__main__":
+    print(
+        f"{'canvases':>10} {'indexables':>11} {'parsed (s)':>11} {'fast path (s)':>14} {'speedup':>8}"
+    )
+    for canvas_count in [100, 1000, 5000]:
+        resources = make_metadata_resources(canvas_count)
+        indexable_count = index(IIIFResourceToIndexableSerializer(), resources)
+        parsed = min(
+            timeit.repeat(
+                lambda: index(BeautifulSoupIndexableSerializer(), resources), number=1, repeat=3
+            )
+        )
+        fast_path = min(
+            timeit.repeat(
+                lambda: index(IIIFResourceToIndexableSerializer(), resources), number=1, repeat=3
+            )
+        )
+        print(
+            f"{canvas_count:>10} {indexable_count:>11} {parsed:11.4f} {fast_path:14.4f} {parsed / fast_path:7.1f}x"
+        )
@@ -0,0 +1,85 @@
+"""Compare the single-pass replacement of child resource ids in a manifest
+against the previous per-relationship `str.replace` over the serialised manifest.
+
+    python benchmarks/replace_iiif_ids.py
+"""
+import json
+import pathlib
+import sys
+import timeit
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from iiif_store.tree import replace_iiif_ids
+
+
+def make_manifest(canvas_count):
+    items = []
+    for i in range(canvas_count):
+        canvas_id = f"https://example.org/iiif/canvas/{i}"
+        items.append(
+            {
+                "id": canvas_id,
+                "type": "Canvas",
+                "label": {"en": [f"Page {i}"]},
+                "height": 1000,
+                "width": 800,
+                "items": [
+                    {
+                        "id": f"{canvas_id}/page",
+                        "type": "AnnotationPage",
+                        "items": [
+                            {
+                                "id": f"{canvas_id}/page/annotation",
+                                "type": "Annotation",
+                                "motivation": "painting",
+                                "target": canvas_id,
+                                "body": {
+                                    "id": f"https://example.org/iiif-img/{i}/full/max/0/default.jpg",
+                                    "type": "Image",
+                                },
+                            }
+                        ],
+                    }
+                ],
+            }
+        )
+    return {
+        "id": "https://example.org/iiif/manifest",
+        "type": "Manifest",
+        "label": {"en": ["Benchmark manifest"]},
+        "items": items,
+    }
+
+
+def make_id_map(canvas_count):
+    return {
+        f"https://example.org/iiif/canvas/{i}": f"https://store.example.org/iiif/canvas/{i}/"
+        for i in range(canvas_count)
+    }
+
+
+def replace_with_str_replace(manifest, id_map):
+    manifest_str = json.dumps(manifest)
+    for original_id, public_id in id_map.items():
+        manifest_str = manifest_str.replace(original_id, public_id)
+    return json.loads(manifest_str)
+
+
+def benchmark(func, manifest, id_map, number):
+    return min(timeit.repeat(lambda: func(manifest, id_map), number=number, repeat=3)) / number
+
+
+if __name__ == "__main__":
+    print(f"{'canvases':>10} {'single pass (s)':>16} {'per canvas (us)':>16} {'str.replace (s)':>16}")
+    for canvas_count in [500, 1000, 2000, 4000, 8000]:
+        manifest = make_manifest(canvas_count)
+        id_map = make_id_map(canvas_count)
+        single_pass = benchmark(replace_iiif_ids, manifest, id_map, number=3)
+        if canvas_count <= 2000:
+            str_replace = f"{benchmark(replace_with_str_replace, manifest, id_map, number=1):16.4f}"
+        else:
+            str_replace = f"{'skipped':>16}"
+        print(
+            f"{canvas_count:>10} {single_pass:16.4f} {single_pass / canvas_count * 1e6:16.2f} {str_replace}"
+        )
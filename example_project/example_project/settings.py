@@ -166,5 +166,19 @@ REST_FRAMEWORK = {
 SEARCH_SERVICE = {}
 
 IIIF_STORE = {
-    "CANONICAL_HOSTNAME": env.str("CANONICAL_HOSTNAME", "http://localhost:8000")
+    "CANONICAL_HOSTNAME": env.str("CANONICAL_HOSTNAME", "http://localhost:8000"),
+    "RENDERED_IIIF_JSON_CACHE": env.str("RENDERED_IIIF_JSON_CACHE", None),
+    "PRECOMPRESSED_IIIF_JSON_MIN_SIZE": env.int("PRECOMPRESSED_IIIF_JSON_MIN_SIZE", 8 * 1024),
+    "DEDUPLICATED_IIIF_STORAGE": env.bool("DEDUPLICATED_IIIF_STORAGE", False),
+    "SERVE_TIME_IIIF_IDS": env.bool("SERVE_TIME_IIIF_IDS", False),
+    "CURSOR_PAGINATION": env.bool("CURSOR_PAGINATION", False),
+    "CURSOR_PAGINATION_COUNT": env.str("CURSOR_PAGINATION_COUNT", "estimate") or None,
+}
+
+# Tasks are queued in the database, and run by `manage.py qcluster`, or in the
+# process queuing them if Q_CLUSTER_SYNC is set.
+Q_CLUSTER = {
+    "name": "example_project",
+    "orm": "default",
+    "sync": env.bool("Q_CLUSTER_SYNC", False),
 }
@@ -0,0 +1,119 @@
+import json
+import logging
+import zlib
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+from .settings import iiif_store_settings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def compress(data):
+    codec = iiif_store_settings.IIIF_JSON_COMPRESSION
+    if codec == "zstd":
+        if zstandard is None:
+            raise ImproperlyConfigured(
+                "The zstandard package is required for zstd IIIF_JSON_COMPRESSION."
+            )
+        return zstandard.ZstdCompressor().compress(data)
+    if codec == "zlib":
+        return zlib.compress(data)
+    raise ImproperlyConfigured(f"Unsupported IIIF_JSON_COMPRESSION: {codec}")
+
+
+def decompress(data):
+    """Decompress zstd or zlib compressed data, identifying the codec from the
+    data itself, so that rows compressed with either codec can be read.
+    """
+    data = bytes(data)
+    if data.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise ImproperlyConfigured(
+                "The zstandard package is required to read zstd compressed iiif_json."
+            )
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def compress_iiif_json(iiif_json):
+    """Return the `(iiif_json, iiif_json_compressed)` values to store for the
+    iiif_json, which is compressed if COMPRESS_IIIF_JSON is set and its encoded
+    size reaches the IIIF_JSON_COMPRESSION_THRESHOLD.
+    """
+    if iiif_json is None or not iiif_store_settings.COMPRESS_IIIF_JSON:
+        return iiif_json, None
+    data = json.dumps(iiif_json, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if len(data) < iiif_store_settings.IIIF_JSON_COMPRESSION_THRESHOLD:
+        return iiif_json, None
+    return None, compress(data)
+
+
+def decompress_iiif_json(iiif_json, iiif_json_compressed):
+    """Return the iiif_json stored as the provided values."""
+    if iiif_json is None and iiif_json_compressed is not None:
+        return json.loads(decompress(iiif_json_compressed))
+    return iiif_json
+
+
+class CompressedJSONDescriptor(DeferredAttribute):
+    """Decompress the stored value of a CompressedJSONField the first time it is
+    read, rather than when the model instance is loaded.
+
+    Only instances loaded from the database are decompressed, so that unsaved
+    instances holding the values to store (e.g. for a `bulk_update`) are left
+    as they are.
+    """
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if value is None and not instance._state.adding:
+            compressed = getattr(instance, self.field.compressed_field)
+            if compressed is not None:
+                value = decompress_iiif_json(None, compressed)
+                instance.__dict__[self.field.attname] = value
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+
+class CompressedJSONField(models.JSONField):
+    """A JSONField which is stored compressed in the binary compressed_field
+    instead, when compression applies to its value (see `compress_iiif_json`).
+
+    The compressed_field must be declared after this field, so that it is
+    set when this field is prepared for saving. Compression is skipped for a
+    model instance with a false `compress_<name>` attribute, e.g. when the
+    stored value will be modified in the database.
+    """
+
+    descriptor_class = CompressedJSONDescriptor
+
+    def __init__(self, *args, compressed_field=None, **kwargs):
+        self.compressed_field = compressed_field
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["compressed_field"] = self.compressed_field
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.attname)
+        compressed = None
+        if getattr(model_instance, f"compress_{self.attname}", True):
+            value, compressed = compress_iiif_json(value)
+        setattr(model_instance, self.compressed_field, compressed)
+        return value
@@ -0,0 +1,105 @@
+import logging
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django.db.models import Q
+
+from search_service.models import Indexable, ResourceRelationship
+
+from .models import IIIFResource
+from .rendering import delete_rendered_iiif_json
+
+logger = logging.getLogger(__name__)
+
+
+def get_iiif_resource_ids(ids=None, original_ids=None):
+    """Return the ids of the IIIFResources with any of the provided ids or
+    original_ids.
+    """
+    return list(
+        IIIFResource.objects.filter(
+            Q(id__in=ids or []) | Q(original_id__in=original_ids or [])
+        ).values_list("id", flat=True)
+    )
+
+
+def get_exclusive_part_ids(resource_ids, content_type):
+    """Return a subquery of the ids of the resources which are only part of the
+    resources with the provided ids, so that resources which are also part of
+    another resource are kept.
+    """
+    part_of = ResourceRelationship.objects.filter(
+        type="isPartOf",
+        source_content_type=content_type,
+        target_content_type=content_type,
+    )
+    return (
+        part_of.filter(target_id__in=resource_ids)
+        .exclude(
+            source_id__in=part_of.exclude(target_id__in=resource_ids).values("source_id")
+        )
+        .values("source_id")
+    )
+
+
+def delete_iiif_resources(resource_ids, include_parts=True):
+    """Delete the IIIFResources with the provided ids, and the resources which
+    are only part of them, in one transaction.
+
+    The resources, their Indexables and their ResourceRelationships are each
+    deleted by a single statement, with the parts selected by a subquery, so
+    the number of queries does not grow with the number of resources. The
+    delete signals of the IIIFResources are not sent.
+    """
+    resource_ids = list(resource_ids)
+    if not resource_ids:
+        return 0
+    logger.debug(f"Deleting IIIFResources: ({len(resource_ids)}, {include_parts})")
+    content_type = ContentType.objects.get_for_model(IIIFResource)
+    part_ids = get_exclusive_part_ids(resource_ids, content_type) if include_parts else []
+
+    def deleted_ids_filter(field_name):
+        return Q(**{f"{field_name}__in": resource_ids}) | Q(**{f"{field_name}__in": part_ids})
+
+    with transaction.atomic():
+        # The parts are selected through their relationships, so these are
+        # deleted last.
+        Indexable.objects.filter(
+            deleted_ids_filter("resource_id"), resource_content_type=content_type
+        ).delete()
+        # n.b. the resources are deleted by a DELETE of the ids selected by the
+        # queryset, without being collected for the delete signals and
+        # cascades, which are handled here.
+        sql, params = (
+            IIIFResource.objects.filter(deleted_ids_filter("id"))
+            .values("id")
+            .query.sql_with_params()
+        )
+        opts = IIIFResource._meta
+        qn = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {qn(opts.db_table)} WHERE {qn(opts.pk.column)} IN ({sql})",
+                params,
+            )
+            deleted_count = cursor.rowcount
+        ResourceRelationship.objects.filter(
+            (deleted_ids_filter("source_id") & Q(source_content_type=content_type))
+            | (deleted_ids_filter("target_id") & Q(target_content_type=content_type))
+        ).delete()
+    # Cached parts are not served once their rows are deleted, and expire.
+    delete_rendered_iiif_json(resource_ids)
+    return deleted_count
+
+
+def delete_iiif_resource_parts(resource_ids):
+    """Delete the resources which are only part of the IIIFResources with the
+    provided ids, leaving the resources themselves.
+    """
+    content_type = ContentType.objects.get_for_model(IIIFResource)
+    part_ids = list(
+        get_exclusive_part_ids(resource_ids, content_type).values_list(
+            "source_id", flat=True
+        )
+    )
+    return delete_iiif_resources(part_ids, include_parts=False)
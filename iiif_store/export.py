@@ -0,0 +1,186 @@
+import gzip
+import json
+import logging
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.db.models import Q
+
+from search_service.models import ResourceRelationship
+
+from .ingest import IIIFBulkIngester
+from .models import IIIFResource, get_public_iiif_id_template
+from .settings import iiif_store_settings
+from .tree import replace_iiif_ids
+from .utils import batched
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMS = ["source", "public"]
+
+
+class IIIFResourceExporter(object):
+    """Export IIIFResources as NDJSON, with a line for each resource holding its
+    `id`, `iiif_type`, `original_id`, `modified` time and `iiif_json`.
+
+    The iiif_json is exported in either the `source` form, with the original
+    ids of the resource and its parts, as it would be ingested (e.g. by the
+    bulk ingest into another store), or the `public` form, as it is served.
+
+    The resources are read with a server-side cursor, `chunk_size` rows at a
+    time, and the lines are yielded as they are encoded, so that the memory
+    used does not grow with the number of resources exported.
+    """
+
+    def __init__(self, form="source", chunk_size=None):
+        if form not in EXPORT_FORMS:
+            raise ValueError(f"Unsupported export form: {form}")
+        self.form = form
+        self.chunk_size = chunk_size or iiif_store_settings.EXPORT_CHUNK_SIZE
+
+    def get_queryset(self, iiif_type=None, modified_after=None, modified_before=None):
+        filters = Q()
+        if iiif_type:
+            filters &= Q(iiif_type=iiif_type.lower())
+        if modified_after:
+            filters &= Q(modified__gte=modified_after)
+        if modified_before:
+            filters &= Q(modified__lt=modified_before)
+        return (
+            IIIFResource.objects.filter(filters)
+            .only(
+                "id",
+                "iiif_type",
+                "original_id",
+                "modified",
+                "iiif_json",
+                "iiif_json_compressed",
+            )
+            .order_by()
+        )
+
+    def get_original_id_map(self, resources):
+        """Return a map from the public id to the original id of each of the
+        resources and of the IIIFResources which are part of them.
+        """
+        template = get_public_iiif_id_template()
+        resource_ids = [resource.id for resource in resources]
+        content_type = ContentType.objects.get_for_model(IIIFResource)
+        parts = IIIFResource.objects.filter(
+            id__in=ResourceRelationship.objects.filter(
+                target_content_type=content_type,
+                target_id__in=resource_ids,
+                source_content_type=content_type,
+                type="isPartOf",
+            ).values("source_id")
+        ).values_list("id", "iiif_type", "original_id")
+        return {
+            template.format(iiif_type=iiif_type, id=id): original_id
+            for id, iiif_type, original_id in [
+                *(
+                    (resource.id, resource.iiif_type, resource.original_id)
+                    for resource in resources
+                ),
+                *parts,
+            ]
+        }
+
+    def iter_iiif_json(self, resources):
+        """Yield each of a chunk of resources with its iiif_json in the export form."""
+        if self.form == "public":
+            for resource in resources:
+                yield resource, resource.get_public_iiif_json()
+            return
+        # The stored iiif_json has the original ids if they are applied when served.
+        original_id_map = None
+        if not iiif_store_settings.SERVE_TIME_IIIF_IDS:
+            original_id_map = self.get_original_id_map(resources)
+        for resource in resources:
+            iiif_json = resource.get_assembled_iiif_json()
+            if original_id_map:
+                iiif_json = replace_iiif_ids(iiif_json, original_id_map)
+            yield resource, iiif_json
+
+    def iter_lines(self, queryset):
+        """Yield an encoded NDJSON line for each resource of the queryset."""
+        exported_count = 0
+        resources = queryset.iterator(chunk_size=self.chunk_size)
+        for chunk in batched(resources, self.chunk_size):
+            for resource, iiif_json in self.iter_iiif_json(chunk):
+                line = {
+                    "id": resource.id,
+                    "iiif_type": resource.iiif_type,
+                    "original_id": resource.original_id,
+                    "modified": resource.modified,
+                    "iiif_json": iiif_json,
+                }
+                yield (
+                    json.dumps(
+                        line, cls=DjangoJSONEncoder, separators=(",", ":"), ensure_ascii=False
+                    )
+                    + "\n"
+                ).encode("utf-8")
+            exported_count += len(chunk)
+            logger.debug(f"Exported IIIFResources: ({exported_count})")
+
+    def iter_gzip(self, lines):
+        """Compress the lines as a gzip stream, yielding the compressed bytes of
+        each chunk of lines.
+        """
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+        for chunk in batched(lines, self.chunk_size):
+            if data := compressor.compress(b"".join(chunk)):
+                yield data
+        yield compressor.flush()
+
+
+def open_export(path, mode="rb"):
+    """Open an NDJSON export, which is gzip compressed if its path ends with .gz."""
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+def iter_export_records(lines, iiif_types=None):
+    """Decode the records of an NDJSON export, skipping blank lines and records
+    whose `iiif_type` is not one of the iiif_types.
+    """
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if iiif_types and record.get("iiif_type") not in iiif_types:
+            continue
+        yield record
+
+
+def import_export_shard(path, batch_size=None, iiif_types=None):
+    """Ingest the records of an NDJSON export shard with the IIIFBulkIngester,
+    returning the result for each manifest.
+    """
+    with open_export(path) as export_file:
+        records = iter_export_records(export_file, iiif_types=iiif_types)
+        return IIIFBulkIngester(manifest_batch_size=batch_size).ingest_manifests(records)
+
+
+def import_export_shards(paths, max_workers=1, batch_size=None, iiif_types=None):
+    """Ingest NDJSON export shards, `max_workers` shards at a time, returning the
+    results for each shard in the order of the paths.
+
+    Only the manifests are ingested by default, as their canvases and ranges are
+    ingested as their parts.
+    """
+    iiif_types = iiif_types or ["manifest"]
+
+    def import_shard(path):
+        try:
+            return import_export_shard(path, batch_size=batch_size, iiif_types=iiif_types)
+        finally:
+            # Each worker thread has its own database connection.
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(import_shard, paths))
@@ -0,0 +1,184 @@
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.utils import timezone
+
+from .ingest import get_iiif_id
+from .models import IIIFHarvestSource
+from .serializers import SourceIIIFToIIIFResourcesSerializer
+from .settings import iiif_store_settings
+
+logger = logging.getLogger(__name__)
+
+
+class IIIFHarvester(object):
+    """Fetch IIIF Manifests and Collections from their urls and ingest them.
+
+    The urls are fetched concurrently by a bounded pool of worker threads which
+    share one pooled HTTP session. Manifests are requested conditionally using
+    the ETag and Last-Modified of their previous harvest, so that unchanged
+    manifests are neither downloaded nor ingested again. The manifests listed by
+    a Collection are harvested in turn, following any nested Collections.
+
+    Responses are ingested one at a time in the calling thread, in the order of
+    the urls, through the same serializer pipeline as a posted manifest. At most
+    max_workers fetches are in flight at once, so that responses are not
+    buffered faster than they are ingested.
+    """
+
+    def __init__(self, max_workers=None, timeout=None, session=None):
+        self.max_workers = max_workers or iiif_store_settings.HARVEST_MAX_WORKERS
+        self.timeout = timeout or iiif_store_settings.HARVEST_TIMEOUT
+        self.session = session or self.get_session()
+
+    def get_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.max_workers, pool_maxsize=self.max_workers
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["Accept"] = "application/ld+json, application/json"
+        return session
+
+    def get_sources(self, urls):
+        """Return the IIIFHarvestSource for each of the urls, creating any which
+        have not been harvested before.
+        """
+        IIIFHarvestSource.objects.bulk_create(
+            [IIIFHarvestSource(url=url) for url in urls], ignore_conflicts=True
+        )
+        # n.b. the sources are read back, as the ids of those which already
+        # existed are not set by the bulk_create.
+        sources = {
+            source.url: source for source in IIIFHarvestSource.objects.filter(url__in=urls)
+        }
+        return [sources[url] for url in urls]
+
+    def get_conditional_headers(self, source):
+        # Collections are always fetched, so that their manifests are checked.
+        if source.iiif_type == "collection":
+            return {}
+        headers = {}
+        if source.etag:
+            headers["If-None-Match"] = source.etag
+        if source.last_modified:
+            headers["If-Modified-Since"] = source.last_modified
+        return headers
+
+    def fetch(self, source):
+        """Fetch the source url, returning the response or the exception raised."""
+        try:
+            response = self.session.get(
+                source.url,
+                headers=self.get_conditional_headers(source),
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            return response
+        except requests.RequestException as exc:
+            return exc
+
+    def ingest(self, iiif_json):
+        serializer = SourceIIIFToIIIFResourcesSerializer(data={"iiif_json": iiif_json})
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return serializer.data
+
+    def get_failed_result(self, source, error):
+        return {"url": source.url, "status": "failed", "error": error}
+
+    def harvest_source(self, source, response):
+        """Ingest the response fetched for the source, returning the result and
+        the urls of any resources listed by a Collection.
+        """
+        if isinstance(response, Exception):
+            return self.get_failed_result(source, str(response)), []
+        if response.status_code == requests.codes.not_modified:
+            return {"url": source.url, "status": "not_modified"}, []
+        try:
+            iiif_json = response.json()
+        except ValueError:
+            return self.get_failed_result(source, "The response is not valid JSON."), []
+        if not isinstance(iiif_json, dict) or not get_iiif_id(iiif_json):
+            error = "The response is not a IIIF resource."
+            return self.get_failed_result(source, error), []
+
+        iiif_type = iiif_json.get("type", iiif_json.get("@type", "")).lower()
+        iiif_type = iiif_type.rsplit(":", 1)[-1]
+        member_urls = []
+        result = {"url": source.url, "iiif_type": iiif_type, "status": "harvested"}
+        if iiif_type == "collection":
+            member_urls = [
+                get_iiif_id(member)
+                for member in iiif_json.get("items", iiif_json.get("manifests", []))
+                if isinstance(member, dict) and get_iiif_id(member)
+            ]
+            result["members"] = len(member_urls)
+        else:
+            try:
+                data = self.ingest(iiif_json)
+            except Exception as exc:
+                logger.exception(
+                    f"Failed to ingest harvested IIIF resource: ({source.url})"
+                )
+                return self.get_failed_result(source, str(exc)), []
+            if not (resources := data.get("resources")):
+                iiif_types = ", ".join(iiif_store_settings.IIIF_RESOURCE_TYPES)
+                error = f"The response has no IIIF resources of the types {iiif_types}."
+                return self.get_failed_result(source, error), []
+            result["id"] = resources[0].get("id")
+            result["resources"] = len(resources)
+            result["unchanged"] = len(data.get("unchanged"))
+
+        IIIFHarvestSource.objects.filter(id=source.id).update(
+            iiif_type=iiif_type,
+            etag=response.headers.get("ETag", ""),
+            last_modified=response.headers.get("Last-Modified", ""),
+            last_harvested=timezone.now(),
+            modified=timezone.now(),
+        )
+        return result, member_urls
+
+    def iter_fetched(self, executor, sources):
+        """Yield the `(source, response)` of each source in turn, keeping a
+        window of max_workers fetches submitted to the executor.
+        """
+        sources = iter(sources)
+        window = deque()
+        for source in sources:
+            window.append((source, executor.submit(self.fetch, source)))
+            if len(window) >= self.max_workers:
+                break
+        while window:
+            source, future = window.popleft()
+            response = future.result()
+            if (next_source := next(sources, None)) is not None:
+                window.append((next_source, executor.submit(self.fetch, next_source)))
+            yield source, response
+
+    def harvest(self, urls):
+        """Harvest the urls, returning a result for each url harvested, including
+        the urls of the manifests found in any Collections.
+        """
+        results = []
+        seen_urls = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while urls := [url for url in dict.fromkeys(urls) if url not in seen_urls]:
+                seen_urls.update(urls)
+                sources = self.get_sources(urls)
+                logger.debug(f"Harvesting IIIF resources: ({len(sources)})")
+                member_urls = []
+                for source, response in self.iter_fetched(executor, sources):
+                    try:
+                        result, source_member_urls = self.harvest_source(source, response)
+                    except Exception as exc:
+                        logger.exception(f"Failed to harvest IIIF resource: ({source.url})")
+                        result, source_member_urls = self.get_failed_result(source, str(exc)), []
+                    results.append(result)
+                    member_urls.extend(source_member_urls)
+                urls = member_urls
+        return results
@@ -0,0 +1,102 @@
+import logging
+import threading
+import weakref
+
+from django.db import transaction
+from django_q.tasks import async_task
+
+from .settings import iiif_store_settings
+from .utils import run_task
+
+logger = logging.getLogger(__name__)
+
+
+# The pending indexing of the atomic blocks of each connection in this thread.
+pending_indexing = threading.local()
+
+
+class PendingIIIFResourceIndexing(object):
+    """The ids of the IIIFResources to be indexed when the atomic block in which
+    they were written commits, registered as its on_commit callback.
+
+    Each atomic block, i.e. the transaction and each of its savepoints, has its
+    own, as Django discards the on_commit callbacks of a savepoint which is
+    rolled back, along with the ids they hold.
+    """
+
+    def __init__(self, using):
+        self.using = using
+        # A dict, as an ordered set of the ids.
+        self.object_ids = {}
+
+    def __call__(self):
+        # The callbacks still registered when the transaction commits are those of
+        # the atomic blocks which committed, and the first to run indexes the ids of
+        # them all together.
+        object_ids = {}
+        for pending in list(get_pending_indexing(self.using).values()):
+            object_ids.update(pending.object_ids)
+            pending.object_ids = {}
+        if object_ids:
+            dispatch_iiif_resource_indexing(list(object_ids))
+
+
+def get_pending_indexing(using):
+    """Return the PendingIIIFResourceIndexing registered by each atomic block of
+    the connection, by the savepoint ids of the block.
+
+    n.b. these are only referenced by the on_commit callbacks of the connection,
+    so those of a transaction or savepoint which is rolled back are dropped as
+    Django discards its callbacks.
+    """
+    if not hasattr(pending_indexing, "connections"):
+        pending_indexing.connections = {}
+    return pending_indexing.connections.setdefault(using, weakref.WeakValueDictionary())
+
+
+def dispatch_iiif_resource_indexing(object_ids):
+    """Index the IIIFResources with the provided ids into the search_service now,
+    either synchronously or in a django q task depending on the app settings.
+
+    The resources are indexed together by one IIIFResourceBatchIndexingTask, so
+    that an ingest queues a single task however many resources it writes.
+    """
+    if not object_ids:
+        return
+    # Imported here as the tasks depend on the serializers, which depend on this module.
+    from .tasks import IIIFResourceBatchIndexingTask
+
+    task = IIIFResourceBatchIndexingTask
+    if iiif_store_settings.ASYNC_INDEXING:
+        logger.debug(f"Queuing the IIIFResourceBatchIndexingTask for: ({len(object_ids)})")
+        async_task(run_task, task, object_ids=object_ids)
+    else:
+        logger.debug(f"Running the IIIFResourceBatchIndexingTask for: ({len(object_ids)})")
+        sync_task = task(object_ids=object_ids)
+        sync_task.run()
+
+
+def index_iiif_resources(object_ids, using=None):
+    """Index the IIIFResources with the provided ids into the search_service,
+    once the current transaction commits.
+
+    The ids requested during a transaction are collected, without duplicates,
+    and indexed together from its on_commit callback, so that each resource is
+    indexed once for each commit, and the indexing does not hold the write
+    transaction open. The ids requested in a savepoint which is rolled back are
+    discarded with it. Outside of a transaction they are indexed immediately.
+    """
+    if not iiif_store_settings.INDEX_IIIF_RESOURCES or not object_ids:
+        return
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        dispatch_iiif_resource_indexing(list(dict.fromkeys(object_ids)))
+        return
+    pending_by_savepoint = get_pending_indexing(connection.alias)
+    savepoint_ids = tuple(connection.savepoint_ids)
+    if (pending := pending_by_savepoint.get(savepoint_ids)) is None:
+        pending = PendingIIIFResourceIndexing(connection.alias)
+        transaction.on_commit(pending, using=connection.alias)
+        pending_by_savepoint[savepoint_ids] = pending
+    logger.debug(f"Indexing IIIFResources on commit: ({len(object_ids)})")
+    pending.object_ids.update(dict.fromkeys(object_ids))
@@ -0,0 +1,811 @@
+import json
+import logging
+import uuid
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+
+from search_service.models import ResourceRelationship
+
+from .compression import compress_iiif_json
+from .deletion import delete_iiif_resources
+from .indexing import index_iiif_resources
+from .models import IIIFResource
+from .settings import iiif_store_settings
+from .tree import (
+    collapse_iiif_elements,
+    get_content_hash,
+    get_iiif_id,
+    iter_iiif_elements,
+    replace_iiif_ids,
+)
+from .utils import batched, prefetch
+
+logger = logging.getLogger(__name__)
+
+
+def extract_resources_and_relationships(iiif_element, parent_ids=()):
+    """Extract the resource data for each distinct IIIF element of the
+    IIIF_RESOURCE_TYPES in the iiif_element, along with the `isPartOf`
+    relationships between their original ids.
+    """
+    resources = []
+    relationships = []
+    for element, element_parent_ids in iter_iiif_elements(
+        iiif_element, iiif_store_settings.IIIF_RESOURCE_TYPES, parent_ids=parent_ids
+    ):
+        resources.append({"iiif_json": element})
+        relationships.extend(
+            {"target": parent_id, "source": element.get("id")}
+            for parent_id in element_parent_ids
+        )
+    return resources, relationships
+
+
+class IIIFResourceIngester(object):
+    """Set-based create or update of IIIFResources, using the original id as
+    a unique identifier for IIIFResource objects.
+
+    Existing IIIFResources are resolved in a single query, and the public ids
+    are assigned before writing, so that each batch of resources can be
+    written with one `INSERT ... ON CONFLICT (original_id) DO UPDATE`.
+    """
+
+    insert_fields = [
+        "id",
+        "created",
+        "modified",
+        "original_id",
+        "iiif_type",
+        "label",
+        "thumbnail",
+        "iiif_json",
+        "iiif_json_compressed",
+        "content_hash",
+    ]
+    update_fields = [
+        "modified",
+        "iiif_type",
+        "label",
+        "thumbnail",
+        "iiif_json",
+        "iiif_json_compressed",
+        "content_hash",
+    ]
+
+    def __init__(self, batch_size=None, progress=None):
+        self.batch_size = batch_size or iiif_store_settings.INGEST_BATCH_SIZE
+        self.progress = progress
+
+    def report_progress(self, stage, count):
+        """Report the number of items written so far by a stage of the ingest to
+        the progress callback, if one has been provided.
+        """
+        if self.progress is not None:
+            self.progress(stage, count)
+
+    def get_existing_ids(self, original_ids):
+        return dict(
+            IIIFResource.objects.filter(original_id__in=original_ids).values_list(
+                "original_id", "id"
+            )
+        )
+
+    def get_existing_resources(self, original_ids):
+        return {
+            original_id: (id, content_hash)
+            for original_id, id, content_hash in IIIFResource.objects.filter(
+                original_id__in=original_ids
+            ).values_list("original_id", "id", "content_hash")
+        }
+
+    def build_resources(self, resources):
+        """Build unsaved IIIFResource instances for the provided resource data,
+        reusing the id of any existing IIIFResource with the same original id.
+
+        Each instance is marked as unchanged if the content hash of its source
+        iiif_json matches that of the existing IIIFResource. The resource data
+        may provide its own content hash, with an empty hash never matching.
+        """
+        resources_by_original_id = {}
+        for resource in resources:
+            iiif_json = resource.get("iiif_json", {})
+            original_id = get_iiif_id(iiif_json)
+            if original_id in resources_by_original_id:
+                logger.debug(f"Skipping repeated IIIF resource: ({original_id})")
+                continue
+            resources_by_original_id[original_id] = resource
+
+        existing_resources = self.get_existing_resources(list(resources_by_original_id))
+        logger.debug(
+            f"Found existing IIIFResources: ({len(existing_resources)}/{len(resources_by_original_id)})"
+        )
+        now = timezone.now()
+        instances = []
+        for original_id, resource in resources_by_original_id.items():
+            iiif_json = resource.get("iiif_json", {})
+            content_hash = resource.get("content_hash")
+            if content_hash is None:
+                content_hash = get_content_hash(iiif_json)
+            label = iiif_json.get("label", {})
+            thumbnail = iiif_json.get("thumbnail", {})
+            if iiif_store_settings.DEDUPLICATED_IIIF_STORAGE:
+                iiif_json = collapse_iiif_elements(
+                    iiif_json, iiif_store_settings.IIIF_RESOURCE_TYPES
+                )
+            existing_id, existing_content_hash = existing_resources.get(
+                original_id, (uuid.uuid4(), None)
+            )
+            instance = IIIFResource(
+                id=existing_id,
+                created=now,
+                modified=now,
+                original_id=original_id,
+                iiif_type=iiif_json.get("type", "").lower(),
+                label=label,
+                thumbnail=thumbnail,
+                iiif_json=iiif_json,
+                content_hash=content_hash,
+            )
+            instance.unchanged = bool(content_hash) and content_hash == existing_content_hash
+            instance.compress_iiif_json = resource.get("compress", True)
+            instance.update_iiif_id()
+            instances.append(instance)
+        return instances
+
+    def get_upsert_sql(self, row_count):
+        opts = IIIFResource._meta
+        qn = connection.ops.quote_name
+        columns = [qn(opts.get_field(name).column) for name in self.insert_fields]
+        row_placeholder = f"({', '.join(['%s'] * len(columns))})"
+        updates = [
+            f"{qn(opts.get_field(name).column)} = EXCLUDED.{qn(opts.get_field(name).column)}"
+            for name in self.update_fields
+        ]
+        return (
+            f"INSERT INTO {qn(opts.db_table)} ({', '.join(columns)}) "
+            f"VALUES {', '.join([row_placeholder] * row_count)} "
+            f"ON CONFLICT ({qn(opts.get_field('original_id').column)}) "
+            f"DO UPDATE SET {', '.join(updates)} "
+            f"RETURNING {qn(opts.pk.column)}, {qn(opts.get_field('created').column)}, "
+            f"{qn(opts.get_field('original_id').column)}"
+        )
+
+    def get_row_params(self, instance):
+        params = []
+        for name in self.insert_fields:
+            field = IIIFResource._meta.get_field(name)
+            params.append(field.get_db_prep_save(field.pre_save(instance, True), connection))
+        return params
+
+    def get_iiif_json_values(self, iiif_json):
+        """Return the iiif_json field values to store the iiif_json with, for
+        writes which bypass `pre_save`.
+        """
+        iiif_json, iiif_json_compressed = compress_iiif_json(iiif_json)
+        return {"iiif_json": iiif_json, "iiif_json_compressed": iiif_json_compressed}
+
+    def write_batch(self, instances):
+        params = [param for instance in instances for param in self.get_row_params(instance)]
+        with connection.cursor() as cursor:
+            cursor.execute(self.get_upsert_sql(len(instances)), params)
+            written = {original_id: (pk, created) for pk, created, original_id in cursor.fetchall()}
+
+        for instance in instances:
+            pk, created = written[instance.original_id]
+            instance.created = created
+            if pk != instance.id:
+                # The IIIFResource was created by a concurrent ingest after the
+                # existing ids were resolved, so the public id must be reassigned.
+                logger.debug(
+                    f"IIIFResource created concurrently, updating public id: ({instance.original_id}, {pk})"
+                )
+                instance.id = pk
+                instance.update_iiif_id()
+                IIIFResource.objects.filter(id=pk).update(
+                    **self.get_iiif_json_values(instance.iiif_json)
+                )
+            instance._state.adding = False
+
+    def upsert_resources(self, resources):
+        """Create or update the IIIFResources for the provided resource data, returning
+        the IIIFResource instances, including the unchanged instances which were
+        not written.
+        """
+        instances = self.build_resources(resources)
+        changed_instances = [instance for instance in instances if not instance.unchanged]
+        logger.debug(
+            f"Skipping unchanged IIIFResources: ({len(instances) - len(changed_instances)})"
+        )
+        written_count = 0
+        for batch in batched(changed_instances, self.batch_size):
+            logger.debug(f"Writing batch of IIIFResources: ({len(batch)})")
+            self.write_batch(batch)
+            written_count += len(batch)
+            self.report_progress("resources", written_count)
+        return instances
+
+    def get_existing_relationships(self, content_type, source_ids, target_ids):
+        existing_relationships = ResourceRelationship.objects.filter(
+            source_content_type=content_type,
+            source_id__in=source_ids,
+            target_content_type=content_type,
+            target_id__in=target_ids,
+        )
+        return {
+            (relationship.source_id, relationship.target_id, relationship.type): relationship
+            for relationship in existing_relationships
+        }
+
+    def create_relationships(self, relationships):
+        """Create the ResourceRelationships between IIIFResources for the provided
+        relationship data, which identifies the source and target by original id.
+        Relationships that already exist are not created again, so re-ingesting
+        the same resources is idempotent. Returns all of the ResourceRelationship
+        instances for the relationship data.
+        """
+        original_ids = {
+            original_id
+            for relationship in relationships
+            for original_id in (relationship.get("source"), relationship.get("target"))
+        }
+        resource_ids = self.get_existing_ids(list(original_ids))
+        content_type = ContentType.objects.get_for_model(IIIFResource)
+
+        keys = list(
+            dict.fromkeys(
+                (
+                    resource_ids[relationship.get("source")],
+                    resource_ids[relationship.get("target")],
+                    relationship.get("type", "isPartOf"),
+                )
+                for relationship in relationships
+            )
+        )
+        existing_relationships = self.get_existing_relationships(
+            content_type,
+            {source_id for source_id, target_id, type in keys},
+            {target_id for source_id, target_id, type in keys},
+        )
+
+        new_relationships = [
+            ResourceRelationship(
+                source_id=source_id,
+                source_content_type=content_type,
+                target_id=target_id,
+                target_content_type=content_type,
+                type=type,
+            )
+            for source_id, target_id, type in keys
+            if (source_id, target_id, type) not in existing_relationships
+        ]
+        logger.debug(
+            f"Creating ResourceRelationships: ({len(new_relationships)}/{len(keys)})"
+        )
+        # n.b. ResourceRelationship has no unique constraint to conflict on, so
+        # the existing relationships are excluded before they are created.
+        ResourceRelationship.objects.bulk_create(new_relationships, batch_size=self.batch_size)
+        self.report_progress("relationships", len(keys))
+        created_relationships = iter(new_relationships)
+        return [
+            existing_relationships.get(key) or next(created_relationships)
+            for key in keys
+        ]
+
+    def update_parent_resources_with_child_resource_ids(self, resources, relationships):
+        """Replace the original ids of child resources embedded in their parent
+        resources with the public ids of the child IIIFResources.
+
+        The ids are replaced in a single pass over each parent, and each parent
+        is written once. Unchanged parents are only written if any of their
+        children were. Returns the updated parent IIIFResource instances.
+        """
+        resources_by_id = {resource.id: resource for resource in resources}
+        id_map = {
+            resources_by_id[relationship.source_id].original_id: get_iiif_id(
+                resources_by_id[relationship.source_id].iiif_json
+            )
+            for relationship in relationships
+        }
+        parent_ids = {relationship.target_id for relationship in relationships}
+        changed_parent_ids = {
+            relationship.target_id
+            for relationship in relationships
+            if not resources_by_id[relationship.source_id].unchanged
+        }
+        now = timezone.now()
+        if iiif_store_settings.SERVE_TIME_IIIF_IDS:
+            # The public ids are applied when the parents are served, so only the
+            # modified time, which keys their cached id maps, is updated.
+            touched_parent_ids = [
+                parent_id
+                for parent_id in changed_parent_ids
+                if resources_by_id[parent_id].unchanged
+            ]
+            IIIFResource.objects.filter(id__in=touched_parent_ids).update(modified=now)
+            return []
+        updated_parents = []
+        for parent_id in parent_ids:
+            parent = resources_by_id[parent_id]
+            if parent.unchanged and parent_id not in changed_parent_ids:
+                continue
+            iiif_json = replace_iiif_ids(parent.iiif_json, id_map)
+            if iiif_json is not parent.iiif_json:
+                updated_parents.append(
+                    IIIFResource(
+                        id=parent.id, modified=now, **self.get_iiif_json_values(iiif_json)
+                    )
+                )
+        logger.debug(f"Updating child resource ids in parents: ({len(updated_parents)})")
+        IIIFResource.objects.bulk_update(
+            updated_parents,
+            ["iiif_json", "iiif_json_compressed", "modified"],
+            batch_size=self.batch_size,
+        )
+        return updated_parents
+
+    def update_parents_of_written_parts(self, written_ids):
+        """Update the modified time of the stored parents of the written
+        IIIFResources, e.g. the other manifests sharing a canvas, with one
+        statement through their `isPartOf` relationships.
+
+        With DEDUPLICATED_IIIF_STORAGE a parent is served with the iiif_json of
+        its parts, so its modified time, which keys its cached assembled
+        iiif_json and its ETag, must change when any of its parts are written.
+        """
+        if not iiif_store_settings.DEDUPLICATED_IIIF_STORAGE or not written_ids:
+            return 0
+        content_type = ContentType.objects.get_for_model(IIIFResource)
+        parent_ids = ResourceRelationship.objects.filter(
+            source_content_type=content_type,
+            source_id__in=written_ids,
+            target_content_type=content_type,
+            type="isPartOf",
+        ).values("target_id")
+        return (
+            IIIFResource.objects.filter(id__in=parent_ids)
+            .exclude(id__in=written_ids)
+            .update(modified=timezone.now())
+        )
+
+    def ingest(self, resources, relationships):
+        """Create or update the IIIFResources and ResourceRelationships extracted
+        from a source IIIF document, and index the written IIIFResources.
+        """
+        with transaction.atomic():
+            resource_instances = self.upsert_resources(resources)
+            relationship_instances = self.create_relationships(relationships)
+            updated_parents = self.update_parent_resources_with_child_resource_ids(
+                resource_instances, relationship_instances
+            )
+            changed_ids = {
+                instance.id for instance in resource_instances if not instance.unchanged
+            }
+            changed_ids.update(parent.id for parent in updated_parents)
+            self.update_parents_of_written_parts(changed_ids)
+        index_iiif_resources(list(changed_ids))
+        self.report_progress("indexing", len(changed_ids))
+        return resource_instances, relationship_instances
+
+
+class IIIFManifestUpdater(IIIFResourceIngester):
+    """Update a stored IIIF Manifest from a new version of its source, comparing
+    the incoming resources with the stored resources which are part of it, as
+    found through their `isPartOf` relationships.
+
+    New and changed resources are written, unchanged resources and their
+    relationships are left as they are, and stored resources which are no longer
+    part of the manifest are deleted, so that the writes made by an update
+    depend on the number of changed resources rather than the manifest size.
+    """
+
+    relationship_type = "isPartOf"
+
+    def get_stored_relationships(self, content_type, root_id, changed_ids):
+        """Return the `(id, source_id, target_id)` of the stored relationships to
+        the root resource, and from or to any of the changed resources.
+        """
+        return list(
+            ResourceRelationship.objects.filter(
+                Q(target_id__in=changed_ids | {root_id}) | Q(source_id__in=changed_ids),
+                source_content_type=content_type,
+                target_content_type=content_type,
+                type=self.relationship_type,
+            ).values_list("id", "source_id", "target_id")
+        )
+
+    def get_orphan_relationships(self, content_type, orphan_ids):
+        return list(
+            ResourceRelationship.objects.filter(
+                source_content_type=content_type,
+                source_id__in=orphan_ids,
+                target_content_type=content_type,
+                type=self.relationship_type,
+            ).values_list("id", "source_id", "target_id")
+        )
+
+    def update(self, resources, relationships):
+        """Update the stored manifest, which must be the first of the extracted
+        resources, returning the IIIFResource instances, the ResourceRelationships
+        created and the ids of the deleted IIIFResources.
+        """
+        content_type = ContentType.objects.get_for_model(IIIFResource)
+        with transaction.atomic():
+            resource_instances = self.upsert_resources(resources)
+            resources_by_original_id = {
+                resource.original_id: resource for resource in resource_instances
+            }
+            root = resources_by_original_id[get_iiif_id(resources[0].get("iiif_json", {}))]
+            incoming_keys = {
+                (
+                    resources_by_original_id[relationship.get("source")].id,
+                    resources_by_original_id[relationship.get("target")].id,
+                )
+                for relationship in relationships
+            }
+            incoming_ids = {resource.id for resource in resource_instances}
+            changed_ids = {
+                resource.id for resource in resource_instances if not resource.unchanged
+            }
+
+            stored_relationships = self.get_stored_relationships(
+                content_type, root.id, changed_ids
+            )
+            stored_part_ids = {
+                source_id
+                for id, source_id, target_id in stored_relationships
+                if target_id == root.id
+            }
+            orphan_ids = stored_part_ids - incoming_ids
+            if orphan_ids:
+                stored_relationships += self.get_orphan_relationships(
+                    content_type, orphan_ids
+                )
+            tree_ids = incoming_ids | stored_part_ids
+            stored_keys = {
+                (source_id, target_id) for id, source_id, target_id in stored_relationships
+            }
+
+            # Orphans which are also part of another resource are kept, and only
+            # their relationships to this manifest are removed.
+            shared_ids = {
+                source_id
+                for id, source_id, target_id in stored_relationships
+                if source_id in orphan_ids and target_id not in tree_ids
+            }
+            stale_relationship_ids = {
+                id
+                for id, source_id, target_id in stored_relationships
+                if source_id in tree_ids
+                and target_id in tree_ids
+                and (source_id, target_id) not in incoming_keys
+            }
+            logger.debug(
+                f"Deleting stale ResourceRelationships: ({len(stale_relationship_ids)})"
+            )
+            ResourceRelationship.objects.filter(id__in=stale_relationship_ids).delete()
+
+            # A relationship between two unchanged resources was created when they
+            # were last ingested, so only those with a changed end can be new.
+            new_relationships = [
+                ResourceRelationship(
+                    source_id=source_id,
+                    source_content_type=content_type,
+                    target_id=target_id,
+                    target_content_type=content_type,
+                    type=self.relationship_type,
+                )
+                for source_id, target_id in incoming_keys
+                if (source_id in changed_ids or target_id in changed_ids)
+                and (source_id, target_id) not in stored_keys
+            ]
+            logger.debug(f"Creating ResourceRelationships: ({len(new_relationships)})")
+            ResourceRelationship.objects.bulk_create(
+                new_relationships, batch_size=self.batch_size
+            )
+            self.report_progress("relationships", len(new_relationships))
+
+            updated_parents = self.update_parent_resources_with_child_resource_ids(
+                resource_instances,
+                [
+                    ResourceRelationship(source_id=source_id, target_id=target_id)
+                    for source_id, target_id in incoming_keys
+                ],
+            )
+            changed_ids.update(parent.id for parent in updated_parents)
+            self.update_parents_of_written_parts(changed_ids)
+            deleted_ids = orphan_ids - shared_ids
+            delete_iiif_resources(deleted_ids)
+        index_iiif_resources(list(changed_ids))
+        self.report_progress("indexing", len(changed_ids))
+        return resource_instances, new_relationships, deleted_ids
+
+
+class IIIFManifestStreamIngester(IIIFResourceIngester):
+    """Ingest a IIIF Manifest from an IIIFManifestStreamReader, writing the
+    canvases in its `items` in fixed size batches as they are parsed.
+
+    The manifest is written first without its items, which are appended to the
+    stored manifest batch by batch, and any properties following the items are
+    added once the stream has been read. The manifest id and type must precede
+    its items.
+    """
+
+    def __init__(self, batch_size=None, stream_batch_size=None, **kwargs):
+        super().__init__(batch_size=batch_size, **kwargs)
+        self.stream_batch_size = (
+            stream_batch_size or iiif_store_settings.STREAM_INGEST_BATCH_SIZE
+        )
+
+    def append_items(self, manifest, items):
+        opts = IIIFResource._meta
+        qn = connection.ops.quote_name
+        iiif_json_column = qn(opts.get_field("iiif_json").column)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {qn(opts.db_table)} SET {iiif_json_column} = jsonb_set("
+                f"{iiif_json_column}, '{{items}}', "
+                f"COALESCE({iiif_json_column} -> 'items', '[]'::jsonb) || %s::jsonb) "
+                f"WHERE {qn(opts.pk.column)} = %s",
+                [json.dumps(items), manifest.id],
+            )
+
+    def write_manifest(self, manifest_json, has_items=True):
+        manifest_id = get_iiif_id(manifest_json)
+        if not manifest_id or not manifest_json.get("type"):
+            raise ParseError(
+                "Streaming ingest requires the manifest id and type to precede its items."
+            )
+        if has_items:
+            manifest_json = {**manifest_json, "items": []}
+        # The stored manifest is rebuilt from its items, so is always written,
+        # and is not compressed, as the items are appended to it as jsonb.
+        (manifest,) = self.upsert_resources(
+            [{"iiif_json": manifest_json, "content_hash": "", "compress": False}]
+        )
+        return manifest
+
+    def write_items(self, manifest, items):
+        """Write the IIIFResources and relationships for a batch of the manifest
+        items, then append the items with replaced child ids to the manifest.
+        """
+        resources = []
+        relationships = []
+        for item in items:
+            item_resources, item_relationships = extract_resources_and_relationships(
+                item, parent_ids=[manifest.original_id]
+            )
+            resources.extend(item_resources)
+            relationships.extend(item_relationships)
+        resource_instances = self.upsert_resources(resources)
+        relationship_instances = self.create_relationships(relationships)
+        # The manifest items are replaced below, rather than by writing the manifest.
+        updated_parents = self.update_parent_resources_with_child_resource_ids(
+            resource_instances,
+            [
+                relationship
+                for relationship in relationship_instances
+                if relationship.target_id != manifest.id
+            ],
+        )
+        id_map = {
+            resource.original_id: get_iiif_id(resource.iiif_json)
+            for resource in resource_instances
+        }
+        if iiif_store_settings.DEDUPLICATED_IIIF_STORAGE:
+            items = collapse_iiif_elements(
+                {"items": items}, iiif_store_settings.IIIF_RESOURCE_TYPES
+            )["items"]
+        if not iiif_store_settings.SERVE_TIME_IIIF_IDS:
+            items = [replace_iiif_ids(item, id_map) for item in items]
+        self.append_items(manifest, items)
+        changed_ids = {
+            resource.id for resource in resource_instances if not resource.unchanged
+        }
+        changed_ids.update(parent.id for parent in updated_parents)
+        self.update_parents_of_written_parts(changed_ids)
+        return resource_instances, relationship_instances, changed_ids
+
+    def finalise_manifest(self, manifest, manifest_json):
+        """Add the manifest properties which followed its items in the stream."""
+        manifest_properties = {
+            key: value for key, value in manifest_json.items() if key not in manifest.iiif_json
+        }
+        if not manifest_properties:
+            return
+        opts = IIIFResource._meta
+        qn = connection.ops.quote_name
+        iiif_json_column = qn(opts.get_field("iiif_json").column)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {qn(opts.db_table)} SET {iiif_json_column} = "
+                f"{iiif_json_column} || %s::jsonb WHERE {qn(opts.pk.column)} = %s",
+                [json.dumps(manifest_properties), manifest.id],
+            )
+        IIIFResource.objects.filter(id=manifest.id).update(
+            label=manifest_json.get("label", {}),
+            thumbnail=manifest_json.get("thumbnail", {}),
+        )
+
+    def ingest_stream(self, reader):
+        """Ingest the manifest parsed by the reader, returning a summary of the
+        IIIFResources and relationships written.
+        """
+        manifest_json = {}
+        manifest = None
+        items = []
+        resource_count = 0
+        relationship_count = 0
+        changed_ids = set()
+
+        def write_items(items):
+            nonlocal resource_count, relationship_count
+            resource_instances, relationship_instances, written_ids = self.write_items(
+                manifest, items
+            )
+            resource_count += len(resource_instances)
+            relationship_count += len(relationship_instances)
+            changed_ids.update(written_ids)
+
+        with transaction.atomic():
+            for key, value in reader:
+                if key != "items":
+                    manifest_json[key] = value
+                    continue
+                if manifest is None:
+                    manifest = self.write_manifest(manifest_json)
+                items.append(value)
+                if len(items) >= self.stream_batch_size:
+                    write_items(items)
+                    items = []
+            if manifest is None:
+                manifest = self.write_manifest(manifest_json, has_items=False)
+            if items:
+                write_items(items)
+            self.finalise_manifest(manifest, manifest_json)
+        changed_ids.add(manifest.id)
+        index_iiif_resources(list(changed_ids))
+        return {
+            "id": manifest.id,
+            "iiif_type": manifest.iiif_type,
+            "original_id": manifest.original_id,
+            "resources": resource_count + 1,
+            "relationships": relationship_count,
+            "unchanged": resource_count + 1 - len(changed_ids),
+        }
+
+
+class IIIFBulkIngester(IIIFResourceIngester):
+    """Ingest many IIIF Manifests as a pipeline of stages: the resources and
+    relationships of each manifest are extracted in a background thread while
+    the previous manifests are written, and each batch of manifests is written
+    in one transaction.
+
+    If a batch fails to be written, its manifests are retried one at a time, so
+    that a single invalid manifest only fails itself.
+    """
+
+    def __init__(self, batch_size=None, manifest_batch_size=None, **kwargs):
+        super().__init__(batch_size=batch_size, **kwargs)
+        self.manifest_batch_size = (
+            manifest_batch_size or iiif_store_settings.BULK_INGEST_BATCH_SIZE
+        )
+
+    def extract_manifest(self, manifest_json):
+        """Return the resources and relationships of the manifest, raising a
+        ValueError if any of them cannot be ingested.
+        """
+        if not get_iiif_id(manifest_json) or not manifest_json.get("type"):
+            raise ValueError("The manifest has no id or type.")
+        resources, relationships = extract_resources_and_relationships(manifest_json)
+        for resource in resources:
+            if not get_iiif_id(resource["iiif_json"]):
+                raise ValueError(
+                    f"The manifest has a {resource['iiif_json'].get('type')} with no id."
+                )
+        return resources, relationships
+
+    def extract(self, sources):
+        """Yield the `(manifest_json, extracted, error)` of each source, where
+        error is the reason a manifest which cannot be extracted has failed, so
+        that it only fails itself.
+
+        If the sources cannot be parsed, e.g. a line of NDJSON is not valid JSON,
+        the sources end with a failed source, so that the manifests before it
+        are still written.
+        """
+        try:
+            for source in sources:
+                manifest_json = source.get("iiif_json", source)
+                try:
+                    yield manifest_json, self.extract_manifest(manifest_json), None
+                except (AttributeError, KeyError, TypeError, ValueError) as exc:
+                    logger.debug(
+                        f"Failed to extract manifest: ({get_iiif_id(manifest_json)}, {exc})"
+                    )
+                    yield manifest_json, None, str(exc)
+        except (ParseError, ValueError) as exc:
+            logger.debug(f"Failed to parse manifests: ({exc})")
+            yield {}, None, str(exc)
+
+    def get_failed_result(self, manifest_json, error):
+        return {
+            "original_id": get_iiif_id(manifest_json),
+            "status": "failed",
+            "error": error,
+        }
+
+    def write_manifests(self, manifests):
+        """Write the resources and relationships of the extracted manifests in one
+        transaction, returning the result for each manifest.
+        """
+        resources = []
+        relationships = []
+        for manifest_json, (manifest_resources, manifest_relationships) in manifests:
+            resources.extend(manifest_resources)
+            relationships.extend(manifest_relationships)
+        resource_instances, relationship_instances = self.ingest(resources, relationships)
+        instances_by_original_id = {
+            instance.original_id: instance for instance in resource_instances
+        }
+        results = []
+        for manifest_json, (manifest_resources, manifest_relationships) in manifests:
+            manifest = instances_by_original_id[get_iiif_id(manifest_json)]
+            unchanged_count = sum(
+                instances_by_original_id[get_iiif_id(resource["iiif_json"])].unchanged
+                for resource in manifest_resources
+            )
+            results.append(
+                {
+                    "original_id": manifest.original_id,
+                    "id": manifest.id,
+                    "iiif_type": manifest.iiif_type,
+                    "status": "unchanged"
+                    if unchanged_count == len(manifest_resources)
+                    else "ingested",
+                    "resources": len(manifest_resources),
+                    "relationships": len(manifest_relationships),
+                    "unchanged": unchanged_count,
+                }
+            )
+        return results
+
+    def write_batch_of_manifests(self, batch):
+        """Write a batch of extracted manifests, returning the results in the order
+        of the batch.
+        """
+        results = {}
+        manifests = {}
+        for index, (manifest_json, extracted, error) in enumerate(batch):
+            if error is not None:
+                results[index] = self.get_failed_result(manifest_json, error)
+            else:
+                manifests[index] = (manifest_json, extracted)
+        if manifests:
+            try:
+                results.update(
+                    zip(manifests, self.write_manifests(list(manifests.values())))
+                )
+            except DatabaseError as exc:
+                logger.debug(f"Retrying failed batch of manifests individually: ({exc})")
+                for index, manifest in manifests.items():
+                    try:
+                        (results[index],) = self.write_manifests([manifest])
+                    except DatabaseError as exc:
+                        results[index] = self.get_failed_result(manifest[0], str(exc))
+        return [results[index] for index in range(len(batch))]
+
+    def ingest_manifests(self, sources):
+        """Ingest the IIIF Manifests from an iterable of sources, which are either
+        manifests or dicts with the manifest as their `iiif_json`, returning the
+        result for each manifest.
+        """
+        results = []
+        extracted = prefetch(self.extract(sources), self.manifest_batch_size)
+        for batch in batched(extracted, self.manifest_batch_size):
+            logger.debug(f"Writing batch of manifests: ({len(batch)})")
+            results.extend(self.write_batch_of_manifests(batch))
+        return results
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q, TextField
+from django.db.models.functions import Cast, Length
+
+from iiif_store.compression import compress_iiif_json, decompress_iiif_json
+from iiif_store.models import IIIFResource
+from iiif_store.settings import iiif_store_settings
+
+
+class Command(BaseCommand):
+    help = (
+        "Convert the stored iiif_json of existing IIIFResources in batches, compressing "
+        "or decompressing it according to the COMPRESS_IIIF_JSON settings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of IIIFResources converted in each batch.",
+        )
+
+    def get_queryset(self):
+        """Return the IIIFResources whose stored iiif_json does not match the
+        compression settings.
+        """
+        if not iiif_store_settings.COMPRESS_IIIF_JSON:
+            return IIIFResource.objects.filter(iiif_json_compressed__isnull=False)
+        return IIIFResource.objects.alias(
+            iiif_json_length=Length(Cast("iiif_json", TextField()))
+        ).filter(
+            Q(iiif_json_length__gte=iiif_store_settings.IIIF_JSON_COMPRESSION_THRESHOLD)
+            | Q(iiif_json_compressed__isnull=False)
+        )
+
+    def handle(self, *args, **options):
+        queryset = self.get_queryset().order_by("id")
+        converted_count = 0
+        last_id = None
+        while True:
+            batch_queryset = queryset if last_id is None else queryset.filter(id__gt=last_id)
+            batch = list(
+                batch_queryset.values_list("id", "iiif_json", "iiif_json_compressed")[
+                    : options["batch_size"]
+                ]
+            )
+            if not batch:
+                break
+            last_id = batch[-1][0]
+            resources = []
+            for id, iiif_json, iiif_json_compressed in batch:
+                stored_iiif_json = decompress_iiif_json(iiif_json, iiif_json_compressed)
+                iiif_json, iiif_json_compressed = compress_iiif_json(stored_iiif_json)
+                resources.append(
+                    IIIFResource(
+                        id=id, iiif_json=iiif_json, iiif_json_compressed=iiif_json_compressed
+                    )
+                )
+            IIIFResource.objects.bulk_update(resources, ["iiif_json", "iiif_json_compressed"])
+            converted_count += len(resources)
+            self.stdout.write(f"Converted {converted_count} IIIFResources.")
+        self.stdout.write(self.style.SUCCESS(f"Converted {converted_count} IIIFResources."))
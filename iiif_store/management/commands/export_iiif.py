@@ -0,0 +1,90 @@
+import itertools
+import sys
+
+from django.core.management.base import BaseCommand
+from django.utils.dateparse import parse_datetime
+
+from iiif_store.export import EXPORT_FORMS, IIIFResourceExporter, open_export
+
+
+class Command(BaseCommand):
+    help = (
+        "Export the IIIF resources as NDJSON, one resource per line, to a file, a "
+        "set of numbered shards, or stdout."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "output",
+            help="The file to write, or - for stdout. With --shard-size, the prefix "
+            "of the shard files.",
+        )
+        parser.add_argument("--iiif-type", help="Only export resources of this type.")
+        parser.add_argument(
+            "--modified-after",
+            type=parse_datetime,
+            help="Only export resources modified at or after this ISO 8601 time.",
+        )
+        parser.add_argument(
+            "--modified-before",
+            type=parse_datetime,
+            help="Only export resources modified before this ISO 8601 time.",
+        )
+        parser.add_argument(
+            "--form",
+            choices=EXPORT_FORMS,
+            default="source",
+            help="Export the iiif_json with its original ids (source) or as it is served (public).",
+        )
+        parser.add_argument("--gzip", action="store_true", help="Gzip the output.")
+        parser.add_argument(
+            "--shard-size",
+            type=int,
+            help="Write shards of this many resources, as <output>-00000.ndjson etc.",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, help="Number of resources read at a time."
+        )
+
+    def get_shard_path(self, output, index, gzip):
+        return f"{output}-{index:05d}.ndjson{'.gz' if gzip else ''}"
+
+    def write_lines(self, output_file, lines, gzip, exporter):
+        if gzip:
+            lines = exporter.iter_gzip(lines)
+        for data in lines:
+            output_file.write(data)
+
+    def handle(self, *args, **options):
+        exporter = IIIFResourceExporter(form=options["form"], chunk_size=options["chunk_size"])
+        lines = exporter.iter_lines(
+            exporter.get_queryset(
+                iiif_type=options["iiif_type"],
+                modified_after=options["modified_after"],
+                modified_before=options["modified_before"],
+            )
+        )
+        output, gzip = options["output"], options["gzip"]
+        if output == "-":
+            self.write_lines(sys.stdout.buffer, lines, gzip, exporter)
+            sys.stdout.buffer.flush()
+            return
+        if not options["shard_size"]:
+            # The gzip compression is applied by iter_gzip, so the file is opened raw.
+            with open(output, "wb") as output_file:
+                self.write_lines(output_file, lines, gzip, exporter)
+            self.stdout.write(self.style.SUCCESS(f"Exported to {output}."))
+            return
+        shard_paths = []
+        # Each shard is streamed from the lines as they are exported, rather than
+        # holding a shard of lines in memory.
+        while (first_line := next(lines, None)) is not None:
+            shard_lines = itertools.chain(
+                [first_line], itertools.islice(lines, options["shard_size"] - 1)
+            )
+            shard_paths.append(self.get_shard_path(output, len(shard_paths), gzip))
+            with open(shard_paths[-1], "wb") as output_file:
+                self.write_lines(output_file, shard_lines, gzip, exporter)
+        for shard_path in shard_paths:
+            self.stdout.write(shard_path)
+        self.stdout.write(self.style.SUCCESS(f"Exported {len(shard_paths)} shards."))
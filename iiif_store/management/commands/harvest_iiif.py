@@ -0,0 +1,37 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from iiif_store.harvest import IIIFHarvester
+
+
+class Command(BaseCommand):
+    help = (
+        "Fetch and ingest the IIIF Manifests at the provided urls, along with the "
+        "manifests listed by any Collections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("urls", nargs="*", help="IIIF Manifest or Collection urls.")
+        parser.add_argument(
+            "--file",
+            help="A file listing a url per line to harvest, in addition to any urls provided.",
+        )
+        parser.add_argument(
+            "--workers", type=int, help="Number of urls to fetch concurrently."
+        )
+
+    def handle(self, *args, **options):
+        urls = list(options["urls"])
+        if options["file"]:
+            with open(options["file"], encoding="utf-8") as url_file:
+                urls.extend(line.strip() for line in url_file if line.strip())
+        harvester = IIIFHarvester(max_workers=options["workers"])
+        results = harvester.harvest(urls)
+        for result in results:
+            self.stdout.write(json.dumps(result, default=str))
+        failed_count = sum(result.get("status") == "failed" for result in results)
+        summary = f"Harvested {len(results)} urls, {failed_count} failed."
+        self.stdout.write(
+            self.style.ERROR(summary) if failed_count else self.style.SUCCESS(summary)
+        )
@@ -0,0 +1,45 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from iiif_store.export import import_export_shards
+
+
+class Command(BaseCommand):
+    help = (
+        "Ingest the IIIF Manifests of NDJSON exports (e.g. the shards written by "
+        "export_iiif) with the bulk ingest, importing several shards in parallel."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths", nargs="+", help="NDJSON export files, gzipped if they end with .gz."
+        )
+        parser.add_argument(
+            "--workers", type=int, default=1, help="Number of files imported concurrently."
+        )
+        parser.add_argument(
+            "--batch-size", type=int, help="Number of manifests written in each transaction."
+        )
+        parser.add_argument(
+            "--iiif-type",
+            action="append",
+            dest="iiif_types",
+            help="Import records of this type (default: manifest). May be repeated.",
+        )
+
+    def handle(self, *args, **options):
+        shard_results = import_export_shards(
+            options["paths"],
+            max_workers=options["workers"],
+            batch_size=options["batch_size"],
+            iiif_types=options["iiif_types"],
+        )
+        results = [result for results in shard_results for result in results]
+        for result in results:
+            self.stdout.write(json.dumps(result, default=str))
+        failed_count = sum(result.get("status") == "failed" for result in results)
+        summary = f"Imported {len(results)} manifests, {failed_count} failed."
+        self.stdout.write(
+            self.style.ERROR(summary) if failed_count else self.style.SUCCESS(summary)
+        )
@@ -0,0 +1,35 @@
+# Generated by Django 4.0.6 on 2026-10-17 09:12
+
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('iiif_store', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IIIFIngestJob',
+            fields=[
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('id', model_utils.fields.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('complete', 'Complete'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('original_id', models.URLField(blank=True, verbose_name='IIIF id')),
+                ('iiif_json', models.JSONField(blank=True, null=True)),
+                ('resources_written', models.PositiveIntegerField(default=0)),
+                ('relationships_written', models.PositiveIntegerField(default=0)),
+                ('indexing_queued', models.PositiveIntegerField(default=0)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
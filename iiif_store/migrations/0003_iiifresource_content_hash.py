@@ -0,0 +1,19 @@
+# Generated by Django 4.0.6 on 2026-10-17 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('iiif_store', '0002_iiifingestjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='iiifresource',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.0.6 on 2026-10-17 11:58
+
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('iiif_store', '0003_iiifresource_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IIIFHarvestSource',
+            fields=[
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('id', model_utils.fields.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('url', models.URLField(max_length=2048, unique=True)),
+                ('iiif_type', models.CharField(blank=True, max_length=30)),
+                ('etag', models.CharField(blank=True, max_length=512)),
+                ('last_modified', models.CharField(blank=True, max_length=64)),
+                ('last_harvested', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
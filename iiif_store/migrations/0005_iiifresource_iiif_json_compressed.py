@@ -0,0 +1,24 @@
+# Generated by Django 4.0.6 on 2026-10-17 12:40
+
+from django.db import migrations, models
+import iiif_store.compression
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('iiif_store', '0004_iiifharvestsource'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='iiifresource',
+            name='iiif_json_compressed',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='iiifresource',
+            name='iiif_json',
+            field=iiif_store.compression.CompressedJSONField(blank=True, compressed_field='iiif_json_compressed', null=True),
+        ),
+    ]
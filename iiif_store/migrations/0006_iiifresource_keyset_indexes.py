@@ -0,0 +1,21 @@
+# Generated by Django 4.0.6 on 2026-10-17 19:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('iiif_store', '0005_iiifresource_iiif_json_compressed'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='iiifresource',
+            index=models.Index(fields=['iiif_type', 'modified', 'id'], name='iiif_store__iiif_ty_7338a3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='iiifresource',
+            index=models.Index(fields=['modified', 'id'], name='iiif_store__modifie_31495d_idx'),
+        ),
+    ]
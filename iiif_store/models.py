@@ -1,14 +1,21 @@
 import logging
+from functools import lru_cache
 
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.contrib.gis.db import models
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
+from model_utils.models import TimeStampedModel, UUIDModel
 
 from search_service.models import (
         BaseSearchResource, 
+        ResourceRelationship, 
         )
 
+from .compression import CompressedJSONField, decompress_iiif_json
 from .settings import iiif_store_settings
+from .tree import expand_iiif_elements, get_iiif_id, replace_iiif_ids
 
 logger = logging.getLogger(__name__)
 
@@ -18,13 +25,27 @@ class IIIFResource(BaseSearchResource):
     iiif_type = models.CharField(max_length=30)
     label = models.JSONField(blank=True, null=True)
     thumbnail = models.JSONField(blank=True, null=True)
-    iiif_json = models.JSONField(blank=True)
+    iiif_json = CompressedJSONField(
+        blank=True, null=True, compressed_field="iiif_json_compressed"
+    )
+    iiif_json_compressed = models.BinaryField(blank=True, null=True, editable=False)
+    # Hash of the source iiif_json this IIIFResource was last ingested from.
+    content_hash = models.CharField(max_length=64, blank=True)
 
-    def save(self, *args, **kwargs):
-        iiif_store_public_url = iiif_store_settings.CANONICAL_HOSTNAME + reverse(
-            "iiif_store:iiifresource-iiif_detail",
-            kwargs={"iiif_type": self.iiif_type, "id": self.id},
-        )
+    def get_public_iiif_id(self):
+        return get_public_iiif_id_template().format(iiif_type=self.iiif_type, id=self.id)
+
+    def update_iiif_id(self):
+        """Set the id of the stored iiif_json to the public url of this IIIFResource.
+        The iiif_json is replaced rather than modified in place, so that any
+        source document it was extracted from is left untouched.
+
+        If SERVE_TIME_IIIF_IDS is set, the original id is kept, and the public id
+        is applied when the iiif_json is served.
+        """
+        if iiif_store_settings.SERVE_TIME_IIIF_IDS:
+            return
+        iiif_store_public_url = self.get_public_iiif_id()
         id_key = "id"
         current_id = self.iiif_json.get(id_key)
         if not current_id:
@@ -35,9 +56,58 @@ class IIIFResource(BaseSearchResource):
             logger.debug(
                 f"Updating iiif id for IIIFResource to public url: ({current_id} -> {iiif_store_public_url})"
             )
-            iiif_json = self.iiif_json
-            iiif_json[id_key] = iiif_store_public_url
-            self.iiif_json = iiif_json
+            self.iiif_json = {**self.iiif_json, id_key: iiif_store_public_url}
+
+    def get_assembled_iiif_json(self):
+        """Return the iiif_json with the references to the IIIFResources which are
+        part of it replaced by their iiif_json, fetching all of the parts in one
+        query. The assembled iiif_json is cached by the modified time of this
+        IIIFResource, which the ingest updates whenever any of its parts are
+        written, including through another parent.
+
+        The parts are stored with only their own id replaced, so any other
+        references to their original ids (e.g. annotation targets) are replaced
+        in the assembled iiif_json, as they are in a parent which embeds them.
+        """
+        if not iiif_store_settings.DEDUPLICATED_IIIF_STORAGE:
+            return self.iiif_json
+        cache_key = f"iiif_store:assembled_iiif_json:{self.id}:{self.modified.timestamp()}"
+        iiif_json = cache.get(cache_key)
+        if iiif_json is None:
+            parts_by_id = {}
+            id_map = {}
+            for original_id, *values in IIIFResource.objects.filter(
+                id__in=get_part_ids(self.id)
+            ).values_list("original_id", "iiif_json", "iiif_json_compressed"):
+                part = decompress_iiif_json(*values)
+                parts_by_id[get_iiif_id(part)] = part
+                id_map[original_id] = get_iiif_id(part)
+            iiif_json = expand_iiif_elements(
+                self.iiif_json, parts_by_id, iiif_store_settings.IIIF_RESOURCE_TYPES
+            )
+            # With SERVE_TIME_IIIF_IDS the parts keep their original ids, and
+            # all of the ids are replaced when the iiif_json is served.
+            if not iiif_store_settings.SERVE_TIME_IIIF_IDS:
+                iiif_json = replace_iiif_ids(iiif_json, id_map)
+            cache.set(
+                cache_key, iiif_json, iiif_store_settings.ASSEMBLED_IIIF_JSON_CACHE_TIMEOUT
+            )
+        return iiif_json
+
+    def get_public_iiif_json(self):
+        """Return the assembled iiif_json with the public ids of this IIIFResource
+        and of the IIIFResources which are part of it.
+        """
+        iiif_json = self.get_assembled_iiif_json()
+        if not iiif_store_settings.SERVE_TIME_IIIF_IDS:
+            return iiif_json
+        return replace_iiif_ids(iiif_json, get_public_iiif_id_map(self.id, self.modified))
+
+    def save(self, *args, **kwargs):
+        self.update_iiif_id()
+        # The iiif_json no longer necessarily matches the ingested source, so
+        # the next ingest of the source must write it.
+        self.content_hash = ""
         super().save(*args, **kwargs)
 
     class Meta: 
@@ -45,4 +115,89 @@ class IIIFResource(BaseSearchResource):
                 models.Index(fields=["original_id"]), 
                 models.Index(fields=["iiif_type"]), 
                 models.Index(fields=["label"]), 
+                models.Index(fields=["iiif_type", "modified", "id"]),
+                models.Index(fields=["modified", "id"]),
                 ]
+
+
+@lru_cache(maxsize=None)
+def get_public_iiif_id_template():
+    """Return a format string for the public url of a IIIFResource, with
+    `{iiif_type}` and `{id}` fields, reversing the url only once per process.
+    """
+    url = iiif_store_settings.CANONICAL_HOSTNAME + reverse(
+        "iiif_store:iiifresource-iiif_detail",
+        kwargs={"iiif_type": "__iiif_type__", "id": "__id__"},
+    )
+    return (
+        url.replace("{", "{{")
+        .replace("}", "}}")
+        .replace("__iiif_type__", "{iiif_type}")
+        .replace("__id__", "{id}")
+    )
+
+
+def get_part_ids(resource_id):
+    """Return a queryset of the ids of the IIIFResources which are part of the
+    IIIFResource with the resource_id.
+    """
+    content_type = ContentType.objects.get_for_model(IIIFResource)
+    return ResourceRelationship.objects.filter(
+        target_content_type=content_type,
+        target_id=resource_id,
+        source_content_type=content_type,
+        type="isPartOf",
+    ).values("source_id")
+
+
+@lru_cache(maxsize=iiif_store_settings.IIIF_ID_MAP_CACHE_SIZE)
+def get_public_iiif_id_map(resource_id, modified):
+    """Return a map from the original id to the public id of the IIIFResource
+    and each of the IIIFResources which are part of it.
+
+    The map is cached by the modified time of the IIIFResource, which the ingest
+    updates whenever any of its parts are written.
+    """
+    template = get_public_iiif_id_template()
+    return {
+        original_id: template.format(iiif_type=iiif_type, id=id)
+        for id, iiif_type, original_id in IIIFResource.objects.filter(
+            models.Q(id=resource_id) | models.Q(id__in=get_part_ids(resource_id))
+        ).values_list("id", "iiif_type", "original_id")
+    }
+
+
+class IIIFIngestJob(TimeStampedModel, UUIDModel):
+    """An ingest of a IIIF resource carried out asynchronously in a django q task,
+    recording the progress and result of the ingest.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", _("Queued")
+        RUNNING = "running", _("Running")
+        COMPLETE = "complete", _("Complete")
+        FAILED = "failed", _("Failed")
+
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.QUEUED
+    )
+    original_id = models.URLField(verbose_name=_("IIIF id"), blank=True)
+    # The raw payload is cleared once it has been ingested.
+    iiif_json = models.JSONField(blank=True, null=True)
+    resources_written = models.PositiveIntegerField(default=0)
+    relationships_written = models.PositiveIntegerField(default=0)
+    indexing_queued = models.PositiveIntegerField(default=0)
+    result = models.JSONField(blank=True, null=True)
+    error = models.TextField(blank=True)
+
+
+class IIIFHarvestSource(TimeStampedModel, UUIDModel):
+    """A url from which IIIF resources are harvested, storing the validators from
+    the last response so that unchanged resources are not fetched again.
+    """
+
+    url = models.URLField(max_length=2048, unique=True)
+    iiif_type = models.CharField(max_length=30, blank=True)
+    etag = models.CharField(max_length=512, blank=True)
+    last_modified = models.CharField(max_length=64, blank=True)
+    last_harvested = models.DateTimeField(blank=True, null=True)
@@ -0,0 +1,123 @@
+import base64
+import binascii
+import json
+import logging
+import uuid
+
+from django.db import connections
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from .settings import iiif_store_settings
+
+logger = logging.getLogger(__name__)
+
+
+class IIIFResourceCursorPagination(BasePagination):
+    """Paginate IIIFResources by keyset on `(modified, id)`, so that each page
+    is read from the `(iiif_type, modified, id)` or `(modified, id)` index in
+    the same time however deep it is.
+
+    The cursor holds the `(modified, id)` of the last resource of the previous
+    page. Resources modified while they are paginated move to the end, so they
+    may be listed twice but are never skipped. The count of the resources is
+    exact, estimated from the query plan, or omitted, as set by
+    CURSOR_PAGINATION_COUNT.
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    page_size = api_settings.PAGE_SIZE
+
+    def encode_cursor(self, modified, resource_id):
+        position = json.dumps([modified.isoformat(), str(resource_id)])
+        return base64.urlsafe_b64encode(position.encode("utf-8")).decode("ascii")
+
+    def decode_cursor(self, request):
+        if not (cursor := request.query_params.get(self.cursor_query_param)):
+            return None
+        try:
+            modified, resource_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            modified, resource_id = parse_datetime(modified), uuid.UUID(resource_id)
+        except (TypeError, ValueError, UnicodeEncodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if modified is None:
+            raise NotFound(self.invalid_cursor_message)
+        return modified, resource_id
+
+    def get_count(self, queryset):
+        count_mode = iiif_store_settings.CURSOR_PAGINATION_COUNT
+        if count_mode == "exact":
+            return queryset.count()
+        if count_mode == "estimate":
+            sql, params = queryset.query.sql_with_params()
+            with connections[queryset.db].cursor() as cursor:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return plan[0]["Plan"]["Plan Rows"]
+        return None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.page_size:
+            return None
+        self.request = request
+        self.count = self.get_count(queryset)
+        # n.b. the keyset is annotated, as the serializer may not load modified.
+        queryset = queryset.annotate(cursor_modified=F("modified")).order_by(
+            "modified", "id"
+        )
+        if position := self.decode_cursor(request):
+            modified, resource_id = position
+            # The leading bound lets the index range scan start at the cursor.
+            queryset = queryset.filter(modified__gte=modified).filter(
+                Q(modified__gt=modified) | Q(id__gt=resource_id)
+            )
+        results = list(queryset[: self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(last.cursor_modified, last.id),
+        )
+
+    def get_paginated_response(self, data):
+        response_data = {"next": self.get_next_link(), "results": data}
+        if self.count is not None:
+            response_data = {"count": self.count, **response_data}
+        return Response(response_data)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class IIIFResourcePaginationMixin(object):
+    """Paginate with the IIIFResourceCursorPagination if CURSOR_PAGINATION is
+    set, or the default pagination class otherwise.
+    """
+
+    @property
+    def pagination_class(self):
+        if iiif_store_settings.CURSOR_PAGINATION:
+            return IIIFResourceCursorPagination
+        return api_settings.DEFAULT_PAGINATION_CLASS
@@ -1,7 +1,51 @@
+import json
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
 from search_service.parsers import (
     ResourceSearchParser,
 )
 
+from .streaming import IIIFManifestStreamReader
+
 
 class IIIFResourceSearchParser(ResourceSearchParser):
     pass
+
+
+class IIIFManifestStreamParser(BaseParser):
+    """Defers parsing of a posted IIIF Manifest, returning a reader which parses
+    the request stream incrementally as the manifest is ingested.
+    """
+
+    media_type = "application/json"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", "utf-8")
+        return IIIFManifestStreamReader(stream, encoding=encoding)
+
+
+class NDJSONParser(BaseParser):
+    """Parses newline delimited JSON, returning a generator which decodes each
+    line of the request stream as it is consumed.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", "utf-8")
+        return self.iter_lines(stream, encoding)
+
+    def iter_lines(self, stream, encoding):
+        if stream is None:
+            return
+        for line_number, line in enumerate(stream, start=1):
+            line = line.decode(encoding).strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as exc:
+                raise ParseError(f"NDJSON parse error on line {line_number} - {exc}")
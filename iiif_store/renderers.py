@@ -0,0 +1,22 @@
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Renders a list as newline delimited JSON, with a line for each item, and
+    any other data as a single line.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        items = data if isinstance(data, list) else [data]
+        return b"".join(
+            (json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+            for item in items
+        )
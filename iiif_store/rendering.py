@@ -0,0 +1,185 @@
+import gzip
+import hashlib
+import logging
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import TextField
+from django.db.models.functions import Cast
+from django.utils.http import quote_etag
+from rest_framework.renderers import JSONRenderer
+
+from .compression import decompress
+from .models import IIIFResource
+from .settings import iiif_store_settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+def get_rendered_iiif_json_cache():
+    """Return the cache backend configured to hold rendered public iiif_json, or
+    None if RENDERED_IIIF_JSON_CACHE is not set.
+    """
+    if alias := iiif_store_settings.RENDERED_IIIF_JSON_CACHE:
+        return caches[alias]
+    return None
+
+
+def get_rendered_iiif_json_cache_key(resource_id, encoding=None):
+    if encoding:
+        return f"iiif_store:rendered_iiif_json:{resource_id}:{encoding}"
+    return f"iiif_store:rendered_iiif_json:{resource_id}"
+
+
+def get_content_encoding(accept_encoding):
+    """Return the first of the PRECOMPRESSED_IIIF_JSON_ENCODINGS accepted by the
+    Accept-Encoding header, or None.
+    """
+    accepted = {}
+    for coding in accept_encoding.split(","):
+        coding, _, params = coding.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for encoding in iiif_store_settings.PRECOMPRESSED_IIIF_JSON_ENCODINGS:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress_content(content, encoding):
+    if encoding == "gzip":
+        # A fixed mtime gives the same bytes for the same content.
+        return gzip.compress(content, mtime=0)
+    if encoding == "br":
+        if brotli is None:
+            raise ImproperlyConfigured(
+                "The brotli package is required for br PRECOMPRESSED_IIIF_JSON_ENCODINGS."
+            )
+        return brotli.compress(content)
+    raise ImproperlyConfigured(f"Unsupported PRECOMPRESSED_IIIF_JSON_ENCODINGS: {encoding}")
+
+
+def get_iiif_json_etag(*values):
+    """Return a strong ETag for a public iiif_json response, from the values
+    which identify its version, e.g. the id and modified time of a resource.
+    """
+    version = ":".join(str(value) for value in values)
+    return quote_etag(hashlib.sha1(version.encode("utf-8")).hexdigest())
+
+
+def render_iiif_json(iiif_json):
+    return JSONRenderer().render(iiif_json)
+
+
+def get_rendered_iiif_json(resource_id, modified, encoding=None):
+    """Return the cached `(content, content_encoding)` of the response to a
+    request for the public iiif_json of the IIIFResource accepting the
+    encoding, or None if it is not cached for the modified time.
+    """
+    if (cache := get_rendered_iiif_json_cache()) is None:
+        return None
+    cached = cache.get(get_rendered_iiif_json_cache_key(resource_id, encoding))
+    if cached is not None and cached[0] == modified.timestamp():
+        return cached[1], cached[2]
+    return None
+
+
+def is_iiif_json_passthrough():
+    """Return True if the public iiif_json is the stored iiif_json, so that it
+    can be served as it is read from the database.
+    """
+    return (
+        iiif_store_settings.IIIF_JSON_PASSTHROUGH
+        and not iiif_store_settings.SERVE_TIME_IIIF_IDS
+        and not iiif_store_settings.DEDUPLICATED_IIIF_STORAGE
+    )
+
+
+def get_stored_iiif_json_content(resource_id):
+    """Return the stored iiif_json of the IIIFResource as JSON bytes, selected as
+    text (i.e. `iiif_json::text`) so that it is never decoded, or the stored
+    bytes themselves if it is compressed.
+    """
+    iiif_json_text, iiif_json_compressed = (
+        IIIFResource.objects.filter(id=resource_id)
+        .annotate(iiif_json_text=Cast("iiif_json", output_field=TextField()))
+        .values_list("iiif_json_text", "iiif_json_compressed")
+        .get()
+    )
+    if iiif_json_text is not None:
+        return iiif_json_text.encode("utf-8")
+    if iiif_json_compressed is not None:
+        # Compressed iiif_json is encoded as compact JSON before compression.
+        return decompress(iiif_json_compressed)
+    return render_iiif_json(None)
+
+
+def render_public_iiif_json(resource_id):
+    """Return the response bytes of the public iiif_json of the IIIFResource,
+    passing the stored iiif_json through from the database where possible.
+    """
+    if is_iiif_json_passthrough():
+        return get_stored_iiif_json_content(resource_id)
+    return render_iiif_json(IIIFResource.objects.get(id=resource_id).get_public_iiif_json())
+
+
+def set_rendered_iiif_json(resource_id, modified, content, content_encoding=None, encoding=None):
+    """Cache the response to a request for the public iiif_json of the
+    IIIFResource accepting the encoding, against its modified time, if a cache
+    is configured.
+    """
+    if (cache := get_rendered_iiif_json_cache()) is not None:
+        cache.set(
+            get_rendered_iiif_json_cache_key(resource_id, encoding),
+            (modified.timestamp(), content, content_encoding),
+            iiif_store_settings.RENDERED_IIIF_JSON_CACHE_TIMEOUT,
+        )
+
+
+def get_public_iiif_json_content(resource_id, modified, encoding=None):
+    """Return the `(content, content_encoding)` of the response to a request for
+    the public iiif_json of the IIIFResource accepting the encoding.
+
+    The rendered bytes, and their compressed variant for the encoding if they
+    reach the PRECOMPRESSED_IIIF_JSON_MIN_SIZE, are each produced once for the
+    modified time of the resource and then read from the cache, if one is
+    configured.
+    """
+    if rendered := get_rendered_iiif_json(resource_id, modified, encoding):
+        return rendered
+    if encoding and (rendered := get_rendered_iiif_json(resource_id, modified)):
+        content = rendered[0]
+    else:
+        content = render_public_iiif_json(resource_id)
+        set_rendered_iiif_json(resource_id, modified, content)
+    if not encoding:
+        return content, None
+    content_encoding = None
+    if len(content) >= iiif_store_settings.PRECOMPRESSED_IIIF_JSON_MIN_SIZE:
+        content, content_encoding = compress_content(content, encoding), encoding
+    set_rendered_iiif_json(resource_id, modified, content, content_encoding, encoding)
+    return content, content_encoding
+
+
+def delete_rendered_iiif_json(resource_ids):
+    if (cache := get_rendered_iiif_json_cache()) is not None:
+        encodings = [None, *iiif_store_settings.PRECOMPRESSED_IIIF_JSON_ENCODINGS]
+        cache.delete_many(
+            [
+                get_rendered_iiif_json_cache_key(resource_id, encoding)
+                for resource_id in resource_ids
+                for encoding in encodings
+            ]
+        )
@@ -1,12 +1,8 @@
 import logging
-import copy
-import bleach
-import json
-from bs4 import BeautifulSoup
+from urllib.parse import urlparse
 import dateutil.parser
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
-from django.contrib.contenttypes.models import ContentType
 from django.utils.translation import get_language
 
 from search_service.serializers.indexing import (
@@ -19,6 +15,7 @@ from search_service.serializers.search import BaseRankSnippetSearchSerializer
 from search_service.models import ResourceRelationship
 
 from .models import (
+    IIIFIngestJob,
     IIIFResource,
 )
 from .fields import (
@@ -32,6 +29,14 @@ from .fields import (
     IIIFManifestCanvasesField, 
 )
 
+from .export import EXPORT_FORMS
+from .ingest import (
+    IIIFManifestUpdater,
+    IIIFResourceIngester,
+    extract_resources_and_relationships,
+    get_iiif_id,
+)
+from .text import clean_html, html_to_text
 from .utils import HyperlinkedMultiArgRelatedField
 from .settings import iiif_store_settings
 
@@ -41,42 +46,9 @@ logger = logging.getLogger(__name__)
 
 
 class IIIFResourceCreateSerializer(serializers.ModelSerializer):
-    iiif_type = serializers.CharField(required=False)
-    original_id = serializers.CharField(
-        required=False,
-    )
-    thumbnail = serializers.JSONField(required=False)
-    label = serializers.JSONField(required=False)
-
-    def to_internal_value(self, data):
-        original_id = data.get("iiif_json", {}).get("id", "")
-        if not original_id:
-            original_id = data.get("iiif_json", {}).get("@id", "")
-        data["iiif_type"] = data.get("iiif_json", {}).get("type", "").lower()
-        data["original_id"] = original_id
-        data["thumbnail"] = data.get("iiif_json", {}).get("thumbnail", {})
-        data["label"] = data.get("iiif_json", {}).get("label", {})
-        return super().to_internal_value(data)
-
-    def save(self, **kwargs):
-        """This will act as a create or update for IIIFResources, using the original id as
-        a unique identifier for IIIFResource objects.
-        """
-        if self.instance is None:
-            original_id = self.validated_data.get("original_id", "")
-            logger.debug(
-                f"No instance supplied, looking for existing IIIFResources: ({original_id})"
-            )
-            try:
-                existing_resource = IIIFResource.objects.get(original_id=original_id)
-                if existing_resource:
-                    logger.debug(
-                        f"Using existing IIIFResource as instance: ({original_id}, {existing_resource.id})"
-                    )
-                    self.instance = existing_resource
-            except IIIFResource.DoesNotExist:
-                logger.debug(f"No existing IIIFResource: ({original_id})")
-        return super().save(**kwargs)
+    """The IIIFResources written by an ingest, which are created or updated by
+    the IIIFResourceIngester.
+    """
 
     class Meta:
         model = IIIFResource
@@ -91,69 +63,38 @@ class IIIFResourceCreateSerializer(serializers.ModelSerializer):
 
 
 class IIIFResourceRelationshipCreateSerializer(serializers.ModelSerializer):
-    def to_internal_value(self, data):
-        source_resource = IIIFResource.objects.get(original_id=data.get("source"))
-        target_resource = IIIFResource.objects.get(original_id=data.get("target"))
-        relationship_type = data.get("type", "isPartOf")
-        return {
-            "source_id": source_resource.id,
-            "source_content_type": ContentType.objects.get_for_model(source_resource),
-            "target_id": target_resource.id,
-            "target_content_type": ContentType.objects.get_for_model(target_resource),
-            "type": relationship_type,
-        }
+    """The relationships written by an ingest, which are created by the
+    IIIFResourceIngester.
+    """
 
     class Meta:
         model = ResourceRelationship
         fields = "__all__"
 
 
+def validate_updated_iiif_type(iiif_json):
+    """Raise a ValidationError unless the iiif_json is of one of the
+    IIIF_RESOURCE_TYPES, as an update replaces the stored resource it is ingested as.
+    """
+    iiif_types = iiif_store_settings.IIIF_RESOURCE_TYPES
+    if not isinstance(iiif_json, dict) or iiif_json.get("type") not in iiif_types:
+        raise serializers.ValidationError(
+            f"Only IIIF resources of the types {', '.join(iiif_types)} can be updated."
+        )
+
+
 class SourceIIIFToIIIFResourcesSerializer(serializers.Serializer):
     """Extract all distinct IIIF elements from a IIIF resource (e.g. a Manifest),
     along with `ispartof` relationship between the original iiif ids.
     """
 
-    def get_distinct_iiif_elements_and_relationships(self, iiif_element, parent_ids=[]):
-        if iiif_element.get("type") in iiif_store_settings.IIIF_RESOURCE_TYPES:
-            resource_id = iiif_element.get("id")
-            relationships = [
-                {
-                    "target": parent_id,
-                    "source": resource_id,
-                }
-                for parent_id in parent_ids
-            ]
-            child_parent_ids = [resource_id] + parent_ids
-            resources = [{"iiif_json": copy.deepcopy(iiif_element)}]
-        else:
-            relationships = []
-            resources = []
-            child_parent_ids = [] + parent_ids
-        if items := iiif_element.get("items"):
-            for i in items:
-                res, rels = self.get_distinct_iiif_elements_and_relationships(
-                    i, child_parent_ids
-                )
-                resources.extend(res)
-                relationships.extend(rels)
-        return resources, relationships
-
-    def update_parent_resources_with_child_resource_ids(self, relationships):
-        """ """
-        parent_data = {
-            rel.target_id: json.dumps(rel.target.iiif_json) for rel in relationships
-        }
-        for rel in relationships:
-            parent_data[rel.target_id] = parent_data[rel.target_id].replace(
-                rel.source.original_id, rel.source.iiif_json.get("id")
-            )
-        for parent_id, parent_iiif_json_str in parent_data.items():
-            parent_resource = IIIFResource.objects.get(id=parent_id)
-            parent_resource.iiif_json = json.loads(parent_iiif_json_str)
-            parent_resource.save()
-
     def to_internal_value(self, data):
-        resources, relationships = self.get_distinct_iiif_elements_and_relationships(
+        if self.context.get("update"):
+            try:
+                validate_updated_iiif_type(data.get("iiif_json"))
+            except serializers.ValidationError as exc:
+                raise serializers.ValidationError({"iiif_json": exc.detail})
+        resources, relationships = extract_resources_and_relationships(
             data.get("iiif_json")
         )
         return {
@@ -162,25 +103,143 @@ class SourceIIIFToIIIFResourcesSerializer(serializers.Serializer):
         }
 
     def create(self, validated_data):
-        resource_serializer = IIIFResourceCreateSerializer(
-            data=validated_data.get("resources"), many=True
-        )
-        resource_serializer.is_valid(raise_exception=True)
-        resource_instances = resource_serializer.save()
-
+        deleted_ids = None
+        if self.context.get("update"):
+            (
+                resource_instances,
+                relationship_instances,
+                deleted_ids,
+            ) = IIIFManifestUpdater().update(
+                validated_data.get("resources"), validated_data.get("relationships")
+            )
+        else:
+            resource_instances, relationship_instances = IIIFResourceIngester().ingest(
+                validated_data.get("resources"), validated_data.get("relationships")
+            )
+        resource_serializer = IIIFResourceCreateSerializer(resource_instances, many=True)
         relationship_serializer = IIIFResourceRelationshipCreateSerializer(
-            data=validated_data.get("relationships"), many=True
+            relationship_instances, many=True
         )
-        relationship_serializer.is_valid(raise_exception=True)
-        relationship_instances = relationship_serializer.save()
-        self.update_parent_resources_with_child_resource_ids(relationship_instances)
         self._data = {
             "resources": resource_serializer.data,
             "relationships": relationship_serializer.data,
+            "unchanged": [
+                instance.id for instance in resource_instances if instance.unchanged
+            ],
         }
+        if deleted_ids is not None:
+            self._data["deleted"] = list(deleted_ids)
         return resource_instances + relationship_instances
 
 
+class IIIFItemsSliceQueryParamSerializer(serializers.Serializer):
+    offset = serializers.IntegerField(min_value=0, required=False)
+    limit = serializers.IntegerField(min_value=1, required=False)
+    canvas = serializers.CharField(required=False)
+    radius = serializers.IntegerField(min_value=0, required=False)
+
+    def validate(self, data):
+        max_limit = iiif_store_settings.ITEMS_SLICE_MAX_LIMIT
+        if "canvas" in data:
+            if "offset" in data or "limit" in data:
+                raise serializers.ValidationError(
+                    "Provide either the offset and limit, or the canvas and radius."
+                )
+            radius = data.get("radius", iiif_store_settings.ITEMS_SLICE_LIMIT // 2)
+            if 2 * radius + 1 > max_limit:
+                raise serializers.ValidationError(
+                    {"radius": f"Ensure this value is at most {(max_limit - 1) // 2}."}
+                )
+            return {"canvas_id": data.get("canvas"), "radius": radius}
+        if "radius" in data:
+            raise serializers.ValidationError({"canvas": "The radius requires a canvas."})
+        limit = data.get("limit", iiif_store_settings.ITEMS_SLICE_LIMIT)
+        if limit > max_limit:
+            raise serializers.ValidationError(
+                {"limit": f"Ensure this value is at most {max_limit}."}
+            )
+        return {"offset": data.get("offset", 0), "limit": limit}
+
+
+class IIIFExportQueryParamSerializer(serializers.Serializer):
+    iiif_type = serializers.CharField(max_length=30, required=False)
+    modified_after = serializers.DateTimeField(required=False)
+    modified_before = serializers.DateTimeField(required=False)
+    form = serializers.ChoiceField(choices=EXPORT_FORMS, default="source")
+    gzip = serializers.BooleanField(default=False)
+
+
+class IIIFHarvestSerializer(serializers.Serializer):
+    urls = serializers.ListField(
+        child=serializers.CharField(max_length=2048), allow_empty=False
+    )
+
+    def validate_urls(self, urls):
+        # Internal hostnames without a domain (e.g. http://iiif-server/) are allowed.
+        for url in urls:
+            parsed_url = urlparse(url)
+            if parsed_url.scheme not in ["http", "https"] or not parsed_url.netloc:
+                raise serializers.ValidationError(f"Enter a valid http(s) url: {url}")
+        return urls
+
+
+class IIIFResourceBulkDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.UUIDField(), required=False)
+    original_ids = serializers.ListField(
+        child=serializers.CharField(max_length=200), required=False
+    )
+
+    def validate(self, data):
+        if not data.get("ids") and not data.get("original_ids"):
+            raise serializers.ValidationError("Provide the ids or original_ids to delete.")
+        return data
+
+
+class IIIFIngestJobCreateSerializer(serializers.ModelSerializer):
+    iiif_json = serializers.JSONField()
+
+    def validate_iiif_json(self, iiif_json):
+        if not isinstance(iiif_json, dict) or not (
+            get_iiif_id(iiif_json) and iiif_json.get("type")
+        ):
+            raise serializers.ValidationError("A IIIF resource with an id and type is required.")
+        if self.context.get("update"):
+            validate_updated_iiif_type(iiif_json)
+        return iiif_json
+
+    def create(self, validated_data):
+        validated_data["original_id"] = get_iiif_id(validated_data.get("iiif_json"))
+        return super().create(validated_data)
+
+    class Meta:
+        model = IIIFIngestJob
+        fields = ["iiif_json"]
+
+
+class IIIFIngestJobAPISerializer(serializers.HyperlinkedModelSerializer):
+    class Meta:
+        model = IIIFIngestJob
+        fields = [
+            "url",
+            "id",
+            "status",
+            "original_id",
+            "created",
+            "modified",
+            "resources_written",
+            "relationships_written",
+            "indexing_queued",
+            "result",
+            "error",
+        ]
+        extra_kwargs = {
+            "url": {
+                "view_name": "api:iiif_store:iiifingestjob-detail",
+                "lookup_field": "id",
+            }
+        }
+
+
 class IIIFResourceAPIDetailSerializer(serializers.HyperlinkedModelSerializer):
     class Meta:
         model = IIIFResource
@@ -247,7 +306,7 @@ class IIIFResourceAPISearchSerializer(BaseRankSnippetSearchSerializer):
 
 class IIIFResourcePublicDetailSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
-        return instance.iiif_json
+        return instance.get_public_iiif_json()
 
     class Meta:
         model = IIIFResource
@@ -318,8 +377,8 @@ class IIIFResourceToIndexableSerializer(BaseModelToIndexableSerializer):
         return {
             "type": type,
             "subtype": subtype.lower(),
-            "indexable_text": BeautifulSoup(value, "html.parser").text,
-            "original_content": str({subtype: bleach.clean(value)}),
+            "indexable_text": html_to_text(value),
+            "original_content": str({subtype: clean_html(value)}),
             "language": language,
         }
 
@@ -339,7 +398,7 @@ class IIIFResourceToIndexableSerializer(BaseModelToIndexableSerializer):
                 "subtype": subtype.lower(),
                 "indexable_date_range_start": parsed_date,
                 "indexable_date_range_end": parsed_date,
-                "original_content": str({subtype: bleach.clean(value)}),
+                "original_content": str({subtype: clean_html(value)}),
             }
 
     def _normalise_field(self, field_data):
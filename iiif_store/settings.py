@@ -5,9 +5,35 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_SETTINGS = {
         "CANONICAL_HOSTNAME": "", 
+        "SERVE_TIME_IIIF_IDS": False, # If True, iiif_json is stored with its original ids, and the public ids are applied when it is served.
+        "IIIF_ID_MAP_CACHE_SIZE": 1024, # Number of per-resource public id maps cached in each process when SERVE_TIME_IIIF_IDS is True.
         "INDEX_IIIF_RESOURCES": True, # If True, IIIFResources will be indexed into the search_service on save. 
         "ASYNC_INDEXING": False, # If True, indexing will be carried out asynchronously in a django q task. 
+        "INDEXING_BATCH_SIZE": 200, # Number of IIIFResources indexed in each transaction by the batch indexing task.
+        "ASYNC_INGEST": False, # If True, posted IIIF resources will be ingested asynchronously in a django q task, unless the async query param is false.
         "IIIF_RESOURCE_TYPES": ["Manifest", "Canvas"], # Defines which IIIF Resources will be generated from a manifest.
+        "DEDUPLICATED_IIIF_STORAGE": False, # If True, IIIF Resources embedded in a stored parent are replaced by references to them, and reassembled when the parent is served.
+        "COMPRESS_IIIF_JSON": False, # If True, iiif_json reaching the IIIF_JSON_COMPRESSION_THRESHOLD is stored compressed, and decompressed when first read.
+        "IIIF_JSON_COMPRESSION": "zlib", # Codec used to compress iiif_json, either zlib or zstd (which requires the zstandard package).
+        "IIIF_JSON_COMPRESSION_THRESHOLD": 16 * 1024, # Size in bytes of the encoded iiif_json from which it is compressed.
+        "ASSEMBLED_IIIF_JSON_CACHE_TIMEOUT": 300, # Seconds for which reassembled parents are cached when DEDUPLICATED_IIIF_STORAGE is True.
+        "IIIF_JSON_PASSTHROUGH": True, # If True, public iiif_json is served as the JSON text read from the database, when it is stored as it is served.
+        "RENDERED_IIIF_JSON_CACHE": None, # Alias of the cache in CACHES holding the rendered bytes of public iiif_json responses, or None to render each response.
+        "RENDERED_IIIF_JSON_CACHE_TIMEOUT": 3600, # Seconds for which rendered public iiif_json responses are cached.
+        "PRECOMPRESSED_IIIF_JSON_ENCODINGS": ["gzip"], # Content encodings, in order of preference, of the compressed variants of rendered public iiif_json cached in the RENDERED_IIIF_JSON_CACHE, from gzip and br (which requires the brotli package).
+        "PRECOMPRESSED_IIIF_JSON_MIN_SIZE": 8 * 1024, # Size in bytes of rendered public iiif_json from which its compressed variants are served.
+        "PUBLIC_IIIF_CACHE_CONTROL": "public, no-cache", # Cache-Control header of public IIIF resource responses, which carry an ETag and Last-Modified time to revalidate with, or None to omit it.
+        "CURSOR_PAGINATION": False, # If True, IIIF resource lists are paginated by a cursor on (modified, id), rather than by page number.
+        "CURSOR_PAGINATION_COUNT": "estimate", # Count of the resources in cursor paginated lists, either "exact", "estimate" (from the query plan), or None to omit it.
+        "ITEMS_SLICE_LIMIT": 100, # Number of items in a slice of the public iiif_json, if the offset is requested without a limit.
+        "ITEMS_SLICE_MAX_LIMIT": 1000, # Maximum number of items in a slice of the public iiif_json.
+        "INDEXABLE_TEXT_CACHE_SIZE": 4096, # Number of indexed text values, and their cleaned html, cached in each process.
+        "INGEST_BATCH_SIZE": 500, # Number of IIIFResources written per INSERT ... ON CONFLICT statement during ingest.
+        "BULK_INGEST_BATCH_SIZE": 20, # Number of manifests written in each transaction by the bulk ingest.
+        "STREAM_INGEST_BATCH_SIZE": 100, # Number of canvases held in memory and written together by the streaming ingest.
+        "EXPORT_CHUNK_SIZE": 500, # Number of IIIFResources read from the database at a time by the export.
+        "HARVEST_MAX_WORKERS": 8, # Number of urls fetched concurrently, and connections pooled per host, by the harvester.
+        "HARVEST_TIMEOUT": 30, # Seconds to wait for a harvested url to connect or send data.
         }
 
 
@@ -0,0 +1,168 @@
+import logging
+
+from django.db.models import (
+    BooleanField,
+    ExpressionWrapper,
+    Func,
+    IntegerField,
+    JSONField,
+    Q,
+    TextField,
+    Value,
+)
+from django.db.models.expressions import RawSQL
+from django.db.models.fields.json import KeyTransform
+from django.db.models.functions import Cast, Coalesce, JSONObject
+
+from .models import IIIFResource
+from .rendering import is_iiif_json_passthrough, render_iiif_json
+
+logger = logging.getLogger(__name__)
+
+ITEMS_SLICE_PATH = "$.items[$start to $end]"
+
+
+class JSONBPathQueryArray(Func):
+    function = "jsonb_path_query_array"
+    output_field = JSONField()
+
+
+class JSONBArrayLength(Func):
+    function = "jsonb_array_length"
+    output_field = IntegerField()
+
+
+class JSONBConcat(Func):
+    arg_joiner = " || "
+    template = "(%(expressions)s)"
+    output_field = JSONField()
+
+
+class JSONBDeleteKey(Func):
+    arg_joiner = " - "
+    template = "(%(expressions)s)"
+    output_field = JSONField()
+
+
+def get_canvas_index_expression(canvas_id):
+    """Return an expression for the index of the item with the canvas_id in the
+    items of the stored iiif_json, or NULL if there is none.
+    """
+    table = IIIFResource._meta.db_table
+    return RawSQL(
+        "SELECT item.ordinality - 1 "
+        f'FROM jsonb_array_elements("{table}"."iiif_json" -> \'items\') '
+        "WITH ORDINALITY AS item(value, ordinality) "
+        "WHERE item.value ->> 'id' = %s LIMIT 1",
+        (canvas_id,),
+        output_field=IntegerField(),
+    )
+
+
+def get_items_window(offset=None, limit=None, canvas_index=None, radius=None):
+    """Return the `(start, end)` indexes, inclusive, of the items in the window
+    of `limit` items from the offset, or `radius` items around the canvas_index.
+    """
+    if canvas_index is not None:
+        return max(canvas_index - radius, 0), canvas_index + radius
+    return offset, offset + limit - 1
+
+
+def get_stored_canvas_index(resource_id, canvas_id):
+    """Return the `(index, stored)` of the item with the canvas_id in the items
+    of the stored iiif_json of the IIIFResource, which is None if there is no
+    such item, and whether the iiif_json is stored uncompressed.
+    """
+    return (
+        IIIFResource.objects.filter(id=resource_id)
+        .annotate(
+            canvas_index=get_canvas_index_expression(canvas_id),
+            stored=ExpressionWrapper(
+                Q(iiif_json__isnull=False), output_field=BooleanField()
+            ),
+        )
+        .values_list("canvas_index", "stored")
+        .get()
+    )
+
+
+def get_stored_iiif_json_slice(resource_id, offset=None, limit=None, canvas_id=None, radius=None):
+    """Return the `(content, start, end, total)` of the stored iiif_json of the
+    IIIFResource with only the window of its items, extracted in the database
+    with a JSON path query, along with the indexes of the first and last items
+    of the window and the number of items.
+
+    Returns None if the stored iiif_json is compressed, and a tuple of None if
+    there is no item with the canvas_id.
+    """
+    canvas_index = None
+    if canvas_id is not None:
+        canvas_index, stored = get_stored_canvas_index(resource_id, canvas_id)
+        if not stored:
+            return None
+        if canvas_index is None:
+            return None, None, None, None
+    start, end = get_items_window(offset, limit, canvas_index, radius)
+    # n.b. the bounds are cast, as untyped parameters are text in the path variables.
+    path_vars = JSONObject(
+        start=Cast(Value(start), output_field=IntegerField()),
+        end=Cast(Value(end), output_field=IntegerField()),
+    )
+    # The iiif_json is selected as text, so that it is never decoded.
+    iiif_json_slice = JSONBConcat(
+        JSONBDeleteKey("iiif_json", Cast(Value("items"), output_field=TextField())),
+        JSONObject(
+            items=JSONBPathQueryArray("iiif_json", Value(ITEMS_SLICE_PATH), path_vars)
+        ),
+    )
+    iiif_json_text, items_count = (
+        IIIFResource.objects.filter(id=resource_id)
+        .annotate(
+            iiif_json_text=Cast(iiif_json_slice, output_field=TextField()),
+            items_count=Coalesce(
+                JSONBArrayLength(KeyTransform("items", "iiif_json")), Value(0)
+            ),
+        )
+        .values_list("iiif_json_text", "items_count")
+        .get()
+    )
+    if iiif_json_text is None:
+        return None
+    return iiif_json_text.encode("utf-8"), start, end, items_count
+
+
+def slice_iiif_json(iiif_json, offset=None, limit=None, canvas_id=None, radius=None):
+    """Return the `(iiif_json, start, end, total)` of the iiif_json with only the
+    window of its items, as for get_stored_iiif_json_slice.
+    """
+    items = iiif_json.get("items") or []
+    canvas_index = None
+    if canvas_id is not None:
+        canvas_index = next(
+            (index for index, item in enumerate(items) if item.get("id") == canvas_id), None
+        )
+        if canvas_index is None:
+            return None, None, None, None
+    start, end = get_items_window(offset, limit, canvas_index, radius)
+    return {**iiif_json, "items": items[start : end + 1]}, start, end, len(items)
+
+
+def get_public_iiif_json_slice(resource_id, **window):
+    """Return the `(content, start, end, total)` of the public iiif_json of the
+    IIIFResource with only the window of its items, as for
+    get_stored_iiif_json_slice.
+
+    The window is extracted in the database where the stored iiif_json is the
+    public iiif_json, so that only the window is read into memory, and from the
+    assembled public iiif_json otherwise.
+    """
+    if is_iiif_json_passthrough():
+        if (stored_slice := get_stored_iiif_json_slice(resource_id, **window)) is not None:
+            return stored_slice
+    logger.debug(f"Slicing public iiif_json items: ({resource_id})")
+    iiif_json, start, end, total = slice_iiif_json(
+        IIIFResource.objects.get(id=resource_id).get_public_iiif_json(), **window
+    )
+    if iiif_json is None:
+        return None, None, None, None
+    return render_iiif_json(iiif_json), start, end, total
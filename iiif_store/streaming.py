@@ -0,0 +1,109 @@
+import codecs
+import json
+import logging
+
+from rest_framework.exceptions import ParseError
+
+logger = logging.getLogger(__name__)
+
+WHITESPACE = " \t\n\r"
+
+
+class IIIFManifestStreamReader(object):
+    """Incrementally parse a IIIF Manifest from a file-like stream of JSON bytes.
+
+    The top level properties of the manifest are decoded one at a time, and the
+    elements of the top level `items` are decoded and yielded one at a time, so
+    only a single canvas (plus one read chunk) is held in memory at once.
+    """
+
+    def __init__(self, stream, encoding="utf-8", chunk_size=64 * 1024):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder(encoding)()
+        self.buffer = ""
+        self.position = 0
+        self.exhausted = False
+
+    def read(self, size=None):
+        """Append at least `size` characters from the stream to the buffer,
+        dropping the part of the buffer which has already been parsed.
+        """
+        if self.exhausted:
+            return False
+        self.buffer = self.buffer[self.position :]
+        self.position = 0
+        chunk = self.stream.read(max(size or 0, self.chunk_size))
+        if not chunk:
+            self.exhausted = True
+            self.buffer += self.text_decoder.decode(b"", final=True)
+            return False
+        self.buffer += self.text_decoder.decode(chunk)
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.read():
+                raise ParseError("Unexpected end of JSON stream.")
+
+    def expect(self, *characters):
+        character = self.peek()
+        if character not in characters:
+            raise ParseError(
+                f"JSON parse error - expected {' or '.join(characters)} at '{character}'"
+            )
+        self.position += 1
+        return character
+
+    def decode_value(self):
+        """Decode the next complete JSON value from the stream, reading more of the
+        stream whenever the buffered value is incomplete.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                # A value which ends the buffer may be a truncated number.
+                if end < len(self.buffer) or self.exhausted:
+                    self.position = end
+                    return value
+            except json.JSONDecodeError as exc:
+                if self.exhausted:
+                    raise ParseError(f"JSON parse error - {exc}")
+            # Grow the reads with the size of the value, so that a large value is
+            # decoded in a logarithmic number of attempts.
+            self.read(len(self.buffer) - self.position)
+
+    def __iter__(self):
+        """Yield a `(key, value)` tuple for each top level property of the manifest,
+        except for `items`, for which a `("items", element)` tuple is yielded for
+        each element in turn.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.position += 1
+            return
+        while True:
+            key = self.decode_value()
+            if not isinstance(key, str):
+                raise ParseError("JSON parse error - expected a property name.")
+            self.expect(":")
+            if key == "items" and self.peek() == "[":
+                self.position += 1
+                if self.peek() == "]":
+                    self.position += 1
+                else:
+                    while True:
+                        yield key, self.decode_value()
+                        if self.expect(",", "]") == "]":
+                            break
+            else:
+                yield key, self.decode_value()
+            if self.expect(",", "}") == "}":
+                return
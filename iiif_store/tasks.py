@@ -1,15 +1,190 @@
 import logging
+import uuid
 
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from search_service.models import Indexable
 from search_service.tasks import BaseSearchServiceIndexingTask
 
+from .ingest import (
+        IIIFManifestUpdater, 
+        IIIFResourceIngester, 
+        extract_resources_and_relationships, 
+        )
+from .languages import get_iso639_2_language
 from .models import (
+        IIIFIngestJob, 
         IIIFResource, 
         )
 
 from .serializers import (
         IIIFResourceToIndexableSerializer, 
         )
+from .settings import iiif_store_settings
+from .utils import batched
+
+logger = logging.getLogger(__name__)
+
 
 class IIIFResourceIndexingTask(BaseSearchServiceIndexingTask):
     model = IIIFResource
     serializer_class = IIIFResourceToIndexableSerializer
+
+
+class IIIFResourceBatchIndexingTask(object):
+    """Index many IIIFResources, e.g. all of those written by one ingest, in a
+    single task rather than a task for each resource.
+
+    The resources are indexed in chunks of INDEXING_BATCH_SIZE, each in one
+    transaction. The resources of a chunk are read by one query, skipping any
+    which have been deleted since the task was queued, and their Indexables
+    are replaced by one delete and one bulk create, so the number of queries
+    grows with the number of chunks rather than of resources.
+    """
+
+    model = IIIFResource
+    serializer_class = IIIFResourceToIndexableSerializer
+
+    def __init__(self, object_ids, chunk_size=None):
+        # The ids may be strings, e.g. when the task is queued by name.
+        self.object_ids = list(
+            dict.fromkeys(uuid.UUID(str(object_id)) for object_id in object_ids)
+        )
+        self.chunk_size = chunk_size or iiif_store_settings.INDEXING_BATCH_SIZE
+
+    def get_indexable(self, data):
+        """Return an unsaved Indexable for the data of one indexable, as output
+        by the serializer_class.
+        """
+        data = dict(data)
+        data["resource_content_type_id"] = data.pop("resource_content_type")
+        language = data.pop("language", None)
+        return Indexable(language_iso639_2=get_iso639_2_language(language), **data)
+
+    def index_chunk(self, object_ids):
+        """Replace the Indexables of the resources with the provided ids, returning
+        the number of resources indexed.
+        """
+        instances = list(self.model.objects.filter(id__in=object_ids))
+        if not instances:
+            return 0
+        serializer = self.serializer_class(instances, many=True)
+        indexables = [
+            self.get_indexable(data)
+            for instance_data in serializer.data
+            for data in instance_data
+        ]
+        with transaction.atomic():
+            Indexable.objects.filter(
+                resource_id__in=[instance.id for instance in instances],
+                resource_content_type=ContentType.objects.get_for_model(self.model),
+            ).delete()
+            Indexable.objects.bulk_create(indexables)
+        return len(instances)
+
+    def run(self):
+        """Index the resources, returning the number indexed."""
+        indexed_count = 0
+        for chunk in batched(self.object_ids, self.chunk_size):
+            indexed_count += self.index_chunk(chunk)
+            logger.debug(f"Indexed IIIFResources: ({indexed_count}/{len(self.object_ids)})")
+        return indexed_count
+
+
+class IIIFIngestJobTask(object):
+    """Ingest the IIIF resource stored on an IIIFIngestJob, recording the
+    progress of each stage of the ingest on the job as it is made.
+
+    The ingest is written in one transaction, so a job which fails has written
+    nothing, and its progress is reset. The progress is written through a
+    separate database connection, so that it is visible while the ingest
+    transaction is open.
+    """
+
+    progress_fields = {
+        "resources": "resources_written",
+        "relationships": "relationships_written",
+        "indexing": "indexing_queued",
+    }
+
+    def __init__(self, job_id, update=False):
+        self.job_id = job_id
+        self.update = update
+        self.progress_connection = None
+
+    def update_job(self, **kwargs):
+        IIIFIngestJob.objects.filter(id=self.job_id).update(
+            modified=timezone.now(), **kwargs
+        )
+
+    def get_progress_connection(self):
+        if self.progress_connection is None:
+            self.progress_connection = connections.create_connection(
+                router.db_for_write(IIIFIngestJob)
+            )
+        return self.progress_connection
+
+    def update_progress(self, stage, count):
+        connection = self.get_progress_connection()
+        opts = IIIFIngestJob._meta
+        qn = connection.ops.quote_name
+        progress_column = qn(opts.get_field(self.progress_fields[stage]).column)
+        modified_column = qn(opts.get_field("modified").column)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {qn(opts.db_table)} SET {progress_column} = %s, "
+                f"{modified_column} = %s WHERE {qn(opts.pk.column)} = %s",
+                [count, timezone.now(), str(self.job_id)],
+            )
+
+    def close_progress_connection(self):
+        if self.progress_connection is not None:
+            self.progress_connection.close()
+            self.progress_connection = None
+
+    def run(self):
+        job = IIIFIngestJob.objects.get(id=self.job_id)
+        logger.debug(f"Running IIIFIngestJob: ({job.id}, {job.original_id})")
+        self.update_job(status=IIIFIngestJob.Status.RUNNING)
+        try:
+            resources, relationships = extract_resources_and_relationships(job.iiif_json)
+            if self.update:
+                updater = IIIFManifestUpdater(progress=self.update_progress)
+                resource_instances, relationship_instances, deleted_ids = updater.update(
+                    resources, relationships
+                )
+            else:
+                ingester = IIIFResourceIngester(progress=self.update_progress)
+                resource_instances, relationship_instances = ingester.ingest(
+                    resources, relationships
+                )
+        except Exception as exc:
+            logger.exception(f"IIIFIngestJob failed: ({job.id})")
+            self.update_job(
+                status=IIIFIngestJob.Status.FAILED,
+                error=str(exc),
+                **{field: 0 for field in self.progress_fields.values()},
+            )
+            raise
+        finally:
+            self.close_progress_connection()
+        result = {
+            "resources": [
+                {
+                    "id": str(instance.id),
+                    "iiif_type": instance.iiif_type,
+                    "original_id": instance.original_id,
+                }
+                for instance in resource_instances
+            ],
+            "relationships": len(relationship_instances),
+            "unchanged": [
+                str(instance.id) for instance in resource_instances if instance.unchanged
+            ],
+        }
+        self.update_job(
+            status=IIIFIngestJob.Status.COMPLETE, result=result, iiif_json=None
+        )
+        return result
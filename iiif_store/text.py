@@ -0,0 +1,64 @@
+import re
+from functools import lru_cache
+from html.parser import HTMLParser
+
+import bleach
+
+from .settings import iiif_store_settings
+
+# Values without any of these characters are unchanged by both the html parsing
+# and the cleaning, which also drops NULs and normalises line breaks.
+MARKUP_PATTERN = re.compile(r"[<>&\r\x00]")
+
+
+def is_plain_text(value):
+    """Return True if the value has no markup, entities or characters which are
+    changed when it is parsed as html.
+    """
+    return MARKUP_PATTERN.search(value) is None
+
+
+class HTMLTextParser(HTMLParser):
+    """Collect the text of an html fragment, i.e. its data with the character
+    references converted, leaving out tags, comments, declarations and the
+    contents of script and style elements.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.text = []
+        self.in_cdata_content = False
+
+    def handle_starttag(self, tag, attrs):
+        self.in_cdata_content = tag in self.CDATA_CONTENT_ELEMENTS
+
+    def handle_endtag(self, tag):
+        self.in_cdata_content = False
+
+    def handle_data(self, data):
+        if not self.in_cdata_content:
+            self.text.append(data)
+
+    def get_text(self):
+        self.close()
+        return "".join(self.text)
+
+
+@lru_cache(maxsize=iiif_store_settings.INDEXABLE_TEXT_CACHE_SIZE)
+def html_to_text(value):
+    """Return the text of a value which may be an html fragment."""
+    if is_plain_text(value):
+        return value
+    parser = HTMLTextParser()
+    parser.feed(value)
+    return parser.get_text()
+
+
+@lru_cache(maxsize=iiif_store_settings.INDEXABLE_TEXT_CACHE_SIZE)
+def clean_html(value):
+    """Return the value with any html which is not allowed escaped, as by
+    bleach.clean.
+    """
+    if is_plain_text(value):
+        return value
+    return bleach.clean(value)
@@ -0,0 +1,137 @@
+import hashlib
+import json
+
+
+def get_iiif_id(iiif_json):
+    """Version-agnostic retrieval of the id of a IIIF resource."""
+    return iiif_json.get("id") or iiif_json.get("@id", "")
+
+
+def replace_iiif_id(value, id_map):
+    """Return the replacement for a string value which is a mapped IIIF id,
+    or a mapped IIIF id with a fragment (e.g. a `#xywh=` annotation target).
+    """
+    if replacement := id_map.get(value):
+        return replacement
+    if "#" in value:
+        iiif_id, fragment = value.split("#", 1)
+        if replacement := id_map.get(iiif_id):
+            return f"{replacement}#{fragment}"
+    return value
+
+
+def replace_iiif_ids(iiif_element, id_map):
+    """Replace any string values in the iiif_element which are keys of the id_map
+    with the mapped value, in a single pass over the tree.
+
+    The iiif_element is not modified, only the dicts and lists containing a
+    replaced value are copied, and unchanged subtrees are shared with the
+    returned element.
+    """
+    if isinstance(iiif_element, str):
+        return replace_iiif_id(iiif_element, id_map)
+    if isinstance(iiif_element, dict):
+        replaced = None
+        for key, value in iiif_element.items():
+            new_value = replace_iiif_ids(value, id_map)
+            if new_value is not value:
+                if replaced is None:
+                    replaced = dict(iiif_element)
+                replaced[key] = new_value
+        return iiif_element if replaced is None else replaced
+    if isinstance(iiif_element, list):
+        replaced = None
+        for index, value in enumerate(iiif_element):
+            new_value = replace_iiif_ids(value, id_map)
+            if new_value is not value:
+                if replaced is None:
+                    replaced = list(iiif_element)
+                replaced[index] = new_value
+        return iiif_element if replaced is None else replaced
+    return iiif_element
+
+
+def iter_iiif_elements(iiif_element, iiif_types, parent_ids=()):
+    """Lazily yield each element of the provided iiif_types found by following the
+    `items` of the iiif_element, in document order, along with the ids of its
+    ancestors of those types (nearest first), starting from the parent_ids.
+
+    The tree is traversed iteratively and the elements are yielded as they are,
+    without being copied, so they share their subtrees with the iiif_element.
+    """
+    stack = [(iiif_element, tuple(parent_ids))]
+    while stack:
+        element, parent_ids = stack.pop()
+        if element.get("type") in iiif_types:
+            yield element, parent_ids
+            parent_ids = (element.get("id"),) + parent_ids
+        if items := element.get("items"):
+            stack.extend((item, parent_ids) for item in reversed(items))
+
+
+def iter_collection_manifests(iiif_element):
+    """Lazily yield each Manifest embedded in the provided IIIF Collection,
+    following the `items` of any nested Collections.
+    """
+    stack = [iiif_element]
+    while stack:
+        element = stack.pop()
+        if element.get("type") == "Manifest":
+            yield element
+        elif element.get("type") == "Collection":
+            stack.extend(reversed(element.get("items", [])))
+
+
+def collapse_iiif_elements(iiif_element, iiif_types):
+    """Return the iiif_element with each element of the iiif_types found by
+    following its `items` replaced by a reference with only its id and type.
+
+    Only the dicts and lists containing a replaced element are copied.
+    """
+    items = iiif_element.get("items")
+    if not isinstance(items, list):
+        return iiif_element
+    collapsed_items = None
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        if item.get("type") in iiif_types:
+            collapsed_item = {"id": get_iiif_id(item), "type": item.get("type")}
+        else:
+            collapsed_item = collapse_iiif_elements(item, iiif_types)
+        if collapsed_item is not item:
+            if collapsed_items is None:
+                collapsed_items = list(items)
+            collapsed_items[index] = collapsed_item
+    if collapsed_items is None:
+        return iiif_element
+    return {**iiif_element, "items": collapsed_items}
+
+
+def expand_iiif_elements(iiif_element, iiif_elements_by_id, iiif_types):
+    """Return the iiif_element with each reference to an element of the
+    iiif_types found by following its `items` replaced by the element with the
+    same id in iiif_elements_by_id, which is expanded in turn. References to
+    elements which are not in iiif_elements_by_id are left as they are.
+    """
+    items = iiif_element.get("items")
+    if not isinstance(items, list):
+        return iiif_element
+    expanded_items = []
+    for item in items:
+        if isinstance(item, dict):
+            if item.get("type") in iiif_types and item.get("id") in iiif_elements_by_id:
+                item = iiif_elements_by_id[item.get("id")]
+            item = expand_iiif_elements(item, iiif_elements_by_id, iiif_types)
+        expanded_items.append(item)
+    return {**iiif_element, "items": expanded_items}
+
+
+def get_content_hash(iiif_element):
+    """Return a stable sha256 hex digest of the iiif_element, which does not
+    depend on the order of the keys of its dicts or on its formatting.
+    """
+    normalised = json.dumps(
+        iiif_element, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(normalised.encode("utf-8")).hexdigest()
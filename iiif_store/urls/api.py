@@ -1,5 +1,6 @@
 from rest_framework import routers
 from ..views import (
+    IIIFIngestJobAPIViewSet,
     IIIFResourceAPIViewSet,
     IIIFServicesAPIViewSet,
     IIIFResourceAPISearchViewSet,
@@ -9,6 +10,7 @@ app_name = "iiif_store"
 
 router = routers.DefaultRouter()
 router.register("iiif", IIIFResourceAPIViewSet)
+router.register("jobs", IIIFIngestJobAPIViewSet)
 router.register("services", IIIFServicesAPIViewSet, basename="services")
 router.register("search", IIIFResourceAPISearchViewSet, basename="search")
 urlpatterns = router.urls
@@ -1,6 +1,11 @@
 import pydoc
 import logging
+import queue
+import threading
+from functools import lru_cache
 
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
 from rest_framework.relations import HyperlinkedRelatedField
 
 logger = logging.getLogger(__name__)
@@ -17,7 +22,106 @@ def run_task(task, **kwargs):
     return result
 
 
+def batched(iterable, batch_size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def prefetch(iterable, size):
+    """Consume the iterable in a background thread, up to `size` items ahead of
+    the caller, so that the work of producing and consuming the items overlaps.
+    Exceptions raised by the iterable are re-raised in the caller.
+    """
+    items = queue.Queue(maxsize=size)
+    stopped = threading.Event()
+    end = object()
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except Exception as exc:
+            put((end, exc))
+        else:
+            put((end, None))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, exc = items.get()
+            if exc is not None:
+                raise exc
+            if item is end:
+                return
+            yield item
+    finally:
+        stopped.set()
+
+
+@lru_cache(maxsize=None)
+def get_serializer_model_fields(serializer_class):
+    """Return the names of the model fields read by the fields of a
+    ModelSerializer class, or None if they cannot be determined.
+
+    Fields with `source="*"` read the whole instance, and are only followed
+    through the `lookup_field` and `url_kwarg_field_mapping` of url fields.
+    Serializers which override `to_representation` may read anything.
+    """
+    model = getattr(getattr(serializer_class, "Meta", None), "model", None)
+    if model is None:
+        return None
+    if serializer_class.to_representation is not serializers.Serializer.to_representation:
+        return None
+
+    sources = set()
+    for field in serializer_class().fields.values():
+        if field.source != "*":
+            sources.add(field.source_attrs[0])
+            continue
+        lookups = [
+            *getattr(field, "url_kwarg_field_mapping", {}).values(),
+            getattr(field, "lookup_field", None),
+        ]
+        if not any(lookups):
+            return None
+        sources.update(lookup.split(".")[0] for lookup in lookups if lookup)
+
+    model_fields = {model._meta.pk.name}
+    for name in sources - {"pk"}:
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Not a model field, e.g. an annotation or a property.
+            continue
+        if not model_field.concrete:
+            continue
+        model_fields.add(model_field.name)
+        if compressed_field := getattr(model_field, "compressed_field", None):
+            model_fields.add(compressed_field)
+    return sorted(model_fields)
+
+
 class ActionBasedSerializerMixin(object):
+    """Select the serializer class by the view action, and only load the model
+    fields read by that serializer when the queryset is read.
+    """
 
     serializer_mapping = {
         "default": None,
@@ -31,6 +135,15 @@ class ActionBasedSerializerMixin(object):
         else:
             return self.serializer_class
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Instances which may be saved or deleted are loaded in full.
+        if self.action in ["update", "partial_update", "destroy"]:
+            return queryset
+        if fields := get_serializer_model_fields(self.get_serializer_class()):
+            queryset = queryset.only(*fields)
+        return queryset
+
 
 class HyperlinkedMultiArgRelatedField(HyperlinkedRelatedField):
     def __init__(self, view_name=None, **kwargs):
@@ -1,10 +1,21 @@
+import json
 import logging
+from urllib.parse import urlencode
 
 # Django Imports
-from rest_framework import viewsets
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
 
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from django.db.models import Count, Max
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django_q.tasks import async_task
 
 
 from search_service.filters import (
@@ -20,13 +31,58 @@ from search_service.views import (
 
 # Local imports
 from .models import (
+    IIIFIngestJob,
     IIIFResource,
 )
+from .deletion import (
+    delete_iiif_resources,
+    get_iiif_resource_ids,
+)
+from .export import (
+    IIIFResourceExporter,
+)
+from .harvest import (
+    IIIFHarvester,
+)
+from .ingest import (
+    IIIFBulkIngester,
+    IIIFManifestStreamIngester,
+)
+from .pagination import (
+    IIIFResourcePaginationMixin,
+)
 from .parsers import (
+    IIIFManifestStreamParser,
     IIIFResourceSearchParser,
+    NDJSONParser,
+)
+from .renderers import (
+    NDJSONRenderer,
+)
+from .rendering import (
+    get_content_encoding,
+    get_iiif_json_etag,
+    get_public_iiif_json_content,
+    get_rendered_iiif_json_cache,
+    is_iiif_json_passthrough,
+)
+from .slicing import (
+    get_public_iiif_json_slice,
+)
+from .streaming import (
+    IIIFManifestStreamReader,
+)
+from .tree import (
+    iter_collection_manifests,
 )
 from .serializers import (
     SourceIIIFToIIIFResourcesSerializer,
+    IIIFExportQueryParamSerializer,
+    IIIFItemsSliceQueryParamSerializer,
+    IIIFHarvestSerializer,
+    IIIFResourceBulkDeleteSerializer,
+    IIIFIngestJobAPISerializer,
+    IIIFIngestJobCreateSerializer,
     IIIFResourceAPIDetailSerializer,
     IIIFResourceAPIListSerializer,
     IIIFResourceAPISearchSerializer,
@@ -37,15 +93,23 @@ from .serializers import (
     IIIFInfoSerializer,
 )
 
+from .settings import iiif_store_settings
+from .tasks import (
+    IIIFIngestJobTask,
+)
+
 # This should be replaced by an import from a utils package.
 from .utils import (
     ActionBasedSerializerMixin,
+    run_task,
 )
 
 logger = logging.getLogger(__name__)
 
 
-class IIIFResourceAPIViewSet(ActionBasedSerializerMixin, viewsets.ModelViewSet):
+class IIIFResourceAPIViewSet(
+    IIIFResourcePaginationMixin, ActionBasedSerializerMixin, viewsets.ModelViewSet
+):
     queryset = IIIFResource.objects.all()
     serializer_mapping = {
         "default": IIIFResourceAPIDetailSerializer,
@@ -54,6 +118,139 @@ class IIIFResourceAPIViewSet(ActionBasedSerializerMixin, viewsets.ModelViewSet):
     }
     lookup_field = "id"
 
+    def is_async_ingest(self, request):
+        if async_param := request.query_params.get("async"):
+            return async_param.lower() in ["true", "1"]
+        return iiif_store_settings.ASYNC_INGEST
+
+    def is_update_ingest(self, request):
+        return request.query_params.get("update", "").lower() in ["true", "1"]
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["update"] = self.is_update_ingest(self.request)
+        return context
+
+    def create(self, request, *args, **kwargs):
+        """Ingest a posted IIIF resource, or if async ingest is requested, store it
+        and queue the ingest, responding with the IIIFIngestJob to poll.
+        """
+        if not self.is_async_ingest(request):
+            return super().create(request, *args, **kwargs)
+        context = self.get_serializer_context()
+        serializer = IIIFIngestJobCreateSerializer(data=request.data, context=context)
+        serializer.is_valid(raise_exception=True)
+        job = serializer.save()
+        logger.debug(f"Queuing the IIIFIngestJobTask for: ({job.id})")
+        async_task(
+            run_task,
+            IIIFIngestJobTask,
+            job_id=job.id,
+            update=self.is_update_ingest(request),
+        )
+        data = IIIFIngestJobAPISerializer(job, context=context).data
+        return Response(
+            data,
+            status=status.HTTP_202_ACCEPTED,
+            # n.b. the url is a Hyperlink, which is not a plain str.
+            headers={"Location": str(data.get("url"))},
+        )
+
+    @action(detail=False, methods=["post"], parser_classes=[IIIFManifestStreamParser])
+    def stream(self, request, *args, **kwargs):
+        """Ingest a IIIF Manifest posted as the request body, parsing and writing
+        its canvases in batches as the body is read, rather than parsing the
+        whole manifest into memory first.
+        """
+        if not isinstance(request.data, IIIFManifestStreamReader):
+            raise ParseError("A IIIF Manifest must be posted as the request body.")
+        result = IIIFManifestStreamIngester().ingest_stream(request.data)
+        return Response(result, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["post"], parser_classes=[NDJSONParser, JSONParser])
+    def bulk(self, request, *args, **kwargs):
+        """Ingest many IIIF Manifests, posted either as NDJSON with a manifest (or
+        `{"iiif_json": manifest}`) per line, or as a IIIF Collection with embedded
+        manifests. The `batch_size` query param sets the number of manifests
+        written in each transaction.
+        """
+        batch_size = request.query_params.get("batch_size")
+        if batch_size is not None and (not batch_size.isdigit() or int(batch_size) < 1):
+            raise ParseError("batch_size must be a positive integer.")
+        if isinstance(request.data, dict):
+            sources = iter_collection_manifests(request.data.get("iiif_json", request.data))
+        else:
+            sources = request.data
+        results = IIIFBulkIngester(
+            manifest_batch_size=batch_size and int(batch_size)
+        ).ingest_manifests(sources)
+        return Response({"results": results})
+
+    @action(detail=False, methods=["post"], parser_classes=[JSONParser])
+    def harvest(self, request, *args, **kwargs):
+        """Fetch and ingest the IIIF Manifests at the posted `urls`, along with the
+        manifests listed by any Collections. Manifests which have not changed
+        since they were last harvested are not fetched again.
+        """
+        serializer = IIIFHarvestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = IIIFHarvester().harvest(serializer.validated_data.get("urls"))
+        return Response({"results": results})
+
+    @action(detail=False, methods=["post"], parser_classes=[JSONParser])
+    def bulk_delete(self, request, *args, **kwargs):
+        """Delete the IIIF resources with the posted `ids` or `original_ids`, along
+        with the canvases which are only part of the deleted manifests, and
+        their relationships and indexables, in one transaction.
+        """
+        serializer = IIIFResourceBulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        resource_ids = get_iiif_resource_ids(
+            ids=serializer.validated_data.get("ids"),
+            original_ids=serializer.validated_data.get("original_ids"),
+        )
+        return Response({"deleted": delete_iiif_resources(resource_ids)})
+
+    @action(detail=False, renderer_classes=[JSONRenderer, NDJSONRenderer])
+    def export(self, request, *args, **kwargs):
+        """Stream the IIIF resources, optionally filtered by `iiif_type` and by a
+        `modified_after` and `modified_before` time, as NDJSON, gzip compressed
+        if `gzip` is true. The iiif_json is exported in the `source` form, with
+        its original ids, or the `public` form, as it is served.
+        """
+        serializer = IIIFExportQueryParamSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        exporter = IIIFResourceExporter(form=params.get("form"))
+        lines = exporter.iter_lines(
+            exporter.get_queryset(
+                iiif_type=params.get("iiif_type"),
+                modified_after=params.get("modified_after"),
+                modified_before=params.get("modified_before"),
+            )
+        )
+        # A gzipped export is a .gz file, rather than NDJSON with a content
+        # encoding which clients would decode before saving it.
+        if params.get("gzip"):
+            response = StreamingHttpResponse(
+                exporter.iter_gzip(lines), content_type="application/gzip"
+            )
+            filename = "iiif_store.ndjson.gz"
+        else:
+            response = StreamingHttpResponse(lines, content_type=NDJSONRenderer.media_type)
+            filename = "iiif_store.ndjson"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    def perform_destroy(self, instance):
+        delete_iiif_resources([instance.id])
+
+
+class IIIFIngestJobAPIViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = IIIFIngestJob.objects.defer("iiif_json").order_by("-created")
+    serializer_class = IIIFIngestJobAPISerializer
+    lookup_field = "id"
+
 
 class IIIFServicesAPIViewSet(viewsets.GenericViewSet):
     """Provides endpoints to which IIIF data can be posted for
@@ -66,12 +263,13 @@ class IIIFServicesAPIViewSet(viewsets.GenericViewSet):
 
 
 class IIIFResourcePublicViewSet(
-    ActionBasedSerializerMixin, viewsets.ReadOnlyModelViewSet
+    IIIFResourcePaginationMixin, ActionBasedSerializerMixin, viewsets.ReadOnlyModelViewSet
 ):
     queryset = IIIFResource.objects.all()
     serializer_mapping = {
         "default": IIIFResourcePublicDetailSerializer,
         "list": IIIFResourcePublicListSerializer,
+        "list_iiif_type": IIIFResourcePublicListSerializer,
     }
     lookup_field = "id"
 
@@ -80,14 +278,223 @@ class IIIFResourcePublicViewSet(
         filter_kwargs = {}
         if iiif_type := self.kwargs.get("iiif_type"):
             filter_kwargs["iiif_type"] = iiif_type
+        if self.action in ["retrieve", "retrieve_iiif"] and (
+            self.is_rendered_response()
+            or self.is_conditional_request()
+            or self.is_items_slice_request()
+        ):
+            # The response may not need the iiif_json, which is loaded if it does.
+            queryset = queryset.only("id", "modified")
         return queryset.filter(**filter_kwargs)
 
+    def is_compact_json_response(self):
+        renderer = getattr(self.request, "accepted_renderer", None)
+        return (
+            isinstance(renderer, JSONRenderer)
+            and renderer.get_indent(self.request.accepted_media_type, {}) is None
+        )
+
+    def is_rendered_response(self):
+        """Return True if the response can be the rendered bytes of the iiif_json,
+        i.e. compact JSON is requested, and the iiif_json is either cached or
+        passed through from the database.
+        """
+        return self.is_compact_json_response() and (
+            get_rendered_iiif_json_cache() is not None or is_iiif_json_passthrough()
+        )
+
+    def is_items_slice_request(self):
+        return any(
+            param in self.request.query_params
+            for param in IIIFItemsSliceQueryParamSerializer().fields
+        )
+
+    def get_items_window(self, request):
+        """Return the window of the items of the iiif_json requested by either the
+        `offset` and `limit`, or the `canvas` id and `radius`, query params, or
+        None if the whole iiif_json is requested.
+        """
+        if not self.is_items_slice_request():
+            return None
+        serializer = IIIFItemsSliceQueryParamSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def is_conditional_request(self):
+        return any(
+            header in self.request.META
+            for header in ["HTTP_IF_NONE_MATCH", "HTTP_IF_MODIFIED_SINCE"]
+        )
+
+    def is_precompressed_response(self):
+        """Return True if the response can be a cached compressed variant of the
+        rendered bytes of the iiif_json, depending on the Accept-Encoding.
+        """
+        return (
+            bool(iiif_store_settings.PRECOMPRESSED_IIIF_JSON_ENCODINGS)
+            and self.is_rendered_response()
+            and get_rendered_iiif_json_cache() is not None
+            and not self.is_items_slice_request()
+        )
+
+    def get_content_encoding(self, request):
+        """Return the encoding of the compressed variant of the response accepted
+        by the request, or None.
+        """
+        if not self.is_precompressed_response():
+            return None
+        return get_content_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+
+    def get_not_modified_response(self, request, etag, last_modified):
+        """Return a 304 response if the request is conditional on the etag or
+        last_modified time, and these have not changed, or None.
+        """
+        return get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=last_modified and int(last_modified.timestamp()),
+        )
+
+    def set_conditional_headers(self, response, etag, last_modified):
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        if cache_control := iiif_store_settings.PUBLIC_IIIF_CACHE_CONTROL:
+            response["Cache-Control"] = cache_control
+        return response
+
+    def get_items_slice_links(self, request, start, end, total, limit):
+        """Return the Link header for the windows of `limit` items before and after
+        the window from start to end, inclusive, of the total items.
+        """
+        url = request.build_absolute_uri()
+        for param in ["canvas", "radius"]:
+            url = remove_query_param(url, param)
+        links = []
+        if start > 0:
+            prev_url = replace_query_param(url, "offset", max(start - limit, 0))
+            links.append(f'<{replace_query_param(prev_url, "limit", limit)}>; rel="prev"')
+        if end + 1 < total:
+            next_url = replace_query_param(url, "offset", end + 1)
+            links.append(f'<{replace_query_param(next_url, "limit", limit)}>; rel="next"')
+        return ", ".join(links)
+
+    def get_items_slice_response(self, request, instance, window):
+        """Respond with the public iiif_json of the IIIF resource with only the
+        window of its items, which is extracted from the stored iiif_json in the
+        database where possible.
+        """
+        content, start, end, total = get_public_iiif_json_slice(instance.id, **window)
+        if content is None:
+            raise NotFound("The canvas is not one of the items.")
+        if self.is_compact_json_response():
+            response = HttpResponse(content, content_type=request.accepted_renderer.media_type)
+        else:
+            response = Response(json.loads(content))
+        limit = window.get("limit", 2 * window.get("radius", 0) + 1)
+        if links := self.get_items_slice_links(request, start, end, total, limit):
+            response["Link"] = links
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        """Respond with the public iiif_json of the IIIF resource, or with a 304 if
+        it is unchanged since the ETag or Last-Modified time sent by the client.
+
+        JSON responses bypass the serializer and renderer, passing the stored
+        iiif_json through from the database where possible. If the
+        RENDERED_IIIF_JSON_CACHE is set, the response bytes, and their variant
+        compressed with an encoding accepted by the client, are then served
+        from the cache until the resource is modified.
+
+        A window of the items of the iiif_json, e.g. the first canvases of a
+        large manifest, is requested with the `offset` and `limit`, or the
+        `canvas` id and `radius`, query params, and linked to the windows
+        before and after it.
+        """
+        instance = self.get_object()
+        window = self.get_items_window(request)
+        encoding = self.get_content_encoding(request)
+        etag = get_iiif_json_etag(
+            request.accepted_media_type,
+            encoding,
+            instance.id,
+            instance.modified.isoformat(),
+            *(window.items() if window else []),
+        )
+        if response := self.get_not_modified_response(request, etag, instance.modified):
+            response = self.set_conditional_headers(response, etag, instance.modified)
+        elif window is not None:
+            response = self.get_items_slice_response(request, instance, window)
+            response = self.set_conditional_headers(response, etag, instance.modified)
+        elif self.is_rendered_response():
+            content, content_encoding = get_public_iiif_json_content(
+                instance.id, instance.modified, encoding
+            )
+            response = HttpResponse(
+                content, content_type=request.accepted_renderer.media_type
+            )
+            if content_encoding:
+                response["Content-Encoding"] = content_encoding
+            response = self.set_conditional_headers(response, etag, instance.modified)
+        else:
+            if instance.get_deferred_fields():
+                instance = IIIFResource.objects.get(id=instance.id)
+            response = Response(self.get_serializer(instance).data)
+            response = self.set_conditional_headers(response, etag, instance.modified)
+        if self.is_precompressed_response():
+            patch_vary_headers(response, ["Accept-Encoding"])
+        return response
+
     @action(detail=False, url_path=r"(?P<iiif_type>[^/.]+)", url_name="list_iiif_type")
     def list_iiif_type(self, request, *args, **kwargs):
         """List IIIF resources by type provided as the `iiif_type`
         kwarg passed in from the url_path.
+
+        The ETag and Last-Modified time of the list are those of the latest
+        modified resource of the type, the number of resources and the query
+        params of the page, so that unchanged pages are answered with a 304 from
+        a single aggregate query. The number of resources is only counted for
+        the 304 of a conditional request, otherwise it is that of the paginator.
+        With CURSOR_PAGINATION, which avoids counting the resources, the ETag
+        is that of the resources listed in the page instead.
         """
-        return self.list(request, *args, **kwargs)
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        if iiif_store_settings.CURSOR_PAGINATION and self.paginator.page_size:
+            response = self.list(request, *args, **kwargs)
+            etag = get_iiif_json_etag(
+                request.accepted_media_type,
+                query,
+                self.paginator.count,
+                *[(resource.id, resource.cursor_modified) for resource in self.paginator.page],
+            )
+            if not_modified_response := self.get_not_modified_response(request, etag, None):
+                response = not_modified_response
+            return self.set_conditional_headers(response, etag, None)
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.is_conditional_request():
+            aggregate = queryset.aggregate(count=Count("id"), modified=Max("modified"))
+            last_modified = aggregate.get("modified")
+            etag = get_iiif_json_etag(
+                request.accepted_media_type,
+                query,
+                aggregate.get("count"),
+                last_modified and last_modified.isoformat(),
+            )
+            if response := self.get_not_modified_response(request, etag, last_modified):
+                return self.set_conditional_headers(response, etag, last_modified)
+        response = self.list(request, *args, **kwargs)
+        if (page := getattr(self.paginator, "page", None)) is not None:
+            count = page.paginator.count
+        else:
+            count = len(response.data)
+        last_modified = queryset.aggregate(modified=Max("modified")).get("modified")
+        etag = get_iiif_json_etag(
+            request.accepted_media_type,
+            query,
+            count,
+            last_modified and last_modified.isoformat(),
+        )
+        return self.set_conditional_headers(response, etag, last_modified)
 
     @action(
         detail=False,
@@ -98,7 +505,7 @@ class IIIFResourcePublicViewSet(
         return self.retrieve(request, *args, **kwargs)
 
 
-class IIIFResourceAPISearchViewSet(BaseAPISearchViewSet):
+class IIIFResourceAPISearchViewSet(ActionBasedSerializerMixin, BaseAPISearchViewSet):
     queryset = IIIFResource.objects.all().distinct()
     parser_classes = [IIIFResourceSearchParser]
     filter_backends = [
@@ -109,7 +516,9 @@ class IIIFResourceAPISearchViewSet(BaseAPISearchViewSet):
     serializer_class = IIIFResourceAPISearchSerializer
 
 
-class IIIFResourcePublicSearchViewSet(BasePublicSearchViewSet):
+class IIIFResourcePublicSearchViewSet(
+    ActionBasedSerializerMixin, BasePublicSearchViewSet
+):
     queryset = IIIFResource.objects.all().distinct()
     query_param_serializer_class = IIIFResourceSearchQueryParamDataSerializer
     parser_classes = [IIIFResourceSearchParser]
@@ -1,6 +1,7 @@
 import json
 import pytest
 import pathlib
+import subprocess
 
 from .utils import is_responsive_404
 
@@ -15,14 +16,13 @@ def docker_compose_file(pytestconfig):
     return pathlib.Path(__file__).resolve().parent / "docker-compose.test.yml"
 
 
-@pytest.fixture(scope="session")
-def http_service(docker_ip, docker_services):
+def wait_for_http_service(docker_ip, docker_services, service):
     """
-    Ensure that Django service is up and responsive.
+    Ensure that the Django service is up and responsive, and return its url.
     """
 
     # `port_for` takes a container port and returns the corresponding host port
-    port = docker_services.port_for("test_container", 8000)
+    port = docker_services.port_for(service, 8000)
     url = "http://{}:{}".format(docker_ip, port)
     url404 = f"{url}/missing"
     docker_services.wait_until_responsive(
@@ -30,3 +30,68 @@ def http_service(docker_ip, docker_services):
     )
     return url
 
+
+@pytest.fixture(scope="session")
+def http_service(docker_ip, docker_services):
+    """
+    Ensure that Django service is up and responsive.
+    """
+    return wait_for_http_service(docker_ip, docker_services, "test_container")
+
+
+@pytest.fixture(scope="session")
+def http_service_dedup(docker_ip, docker_services):
+    """
+    Ensure that the Django service with DEDUPLICATED_IIIF_STORAGE is up and responsive.
+    """
+    return wait_for_http_service(docker_ip, docker_services, "test_container_dedup")
+
+
+@pytest.fixture(scope="session")
+def http_service_serve_time(docker_ip, docker_services):
+    """
+    Ensure that the Django service with SERVE_TIME_IIIF_IDS is up and responsive.
+    """
+    return wait_for_http_service(docker_ip, docker_services, "test_container_serve_time")
+
+
+@pytest.fixture(scope="session")
+def http_service_cursor(docker_ip, docker_services):
+    """
+    Ensure that the Django service with CURSOR_PAGINATION is up and responsive.
+    """
+    return wait_for_http_service(docker_ip, docker_services, "test_container_cursor")
+
+
+@pytest.fixture(scope="session")
+def django_shell(http_service, docker_compose_file, docker_compose_project_name):
+    """
+    Return a function which runs python code in the Django shell of the test
+    service, and returns the JSON printed on the last line of its output.
+    """
+
+    def run_code(code, service="test_container"):
+        completed = subprocess.run(
+            [
+                "docker",
+                "compose",
+                "-f",
+                str(docker_compose_file),
+                "-p",
+                docker_compose_project_name,
+                "exec",
+                "-T",
+                service,
+                "python3",
+                "manage.py",
+                "shell",
+                "-c",
+                code,
+            ],
+            capture_output=True,
+            text=True,
+        )
+        assert completed.returncode == 0, completed.stderr
+        return json.loads(completed.stdout.splitlines()[-1])
+
+    return run_code
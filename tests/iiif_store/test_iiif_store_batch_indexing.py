@@ -0,0 +1,100 @@
+import json
+import pytest
+import requests
+
+
+app_endpoint = "api/iiif_store"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+
+test_data_store = {}
+
+
+@pytest.fixture
+def search_manifest(tests_dir):
+    return json.load(
+        (tests_dir / "fixtures/search/iiif3/search_manifest_2.json").open(
+            encoding="utf-8"
+        )
+    )
+
+
+def get_indexables(http_service):
+    response = requests.get(
+        f"{http_service}/api/search_service/indexable/", headers=test_headers
+    )
+    assert response.status_code == 200
+    return response.json().get("results")
+
+
+def test_iiif_store_batch_indexing_create_manifest(http_service, search_manifest):
+    test_endpoint = "iiif"
+    status = 201
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/",
+        headers=test_headers,
+        json={"iiif_json": search_manifest},
+    )
+    assert response.status_code == status
+    resources = response.json().get("resources")
+    assert len(resources) == 3
+    for resource in resources:
+        test_data_store[resource.get("original_id")] = resource.get("id")
+
+
+def test_iiif_store_batch_indexing_indexes_each_resource(http_service, search_manifest):
+    # The manifest and its canvases are indexed by one batch indexing task.
+    labels = {
+        test_data_store.get(search_manifest.get("id")): "Automata",
+        **{
+            test_data_store.get(canvas.get("id")): canvas.get("label").get("en")[0]
+            for canvas in search_manifest.get("items")
+        },
+    }
+    label_indexables = {
+        indexable.get("resource_id"): indexable.get("indexable_text")
+        for indexable in get_indexables(http_service)
+        if indexable.get("resource_id") in labels
+        and indexable.get("subtype") == "label"
+    }
+    assert label_indexables == labels
+
+
+def test_iiif_store_batch_indexing_queries_per_chunk(django_shell):
+    # The manifest and its two canvases are indexed in two chunks.
+    queries = django_shell(
+        f"""
+import json
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from iiif_store.tasks import IIIFResourceBatchIndexingTask
+
+with CaptureQueriesContext(connection) as context:
+    indexed_count = IIIFResourceBatchIndexingTask(
+        {list(test_data_store.values())!r}, chunk_size=2
+    ).run()
+print(json.dumps([indexed_count, [query["sql"] for query in context.captured_queries]]))
+"""
+    )
+    indexed_count, sql = queries
+    assert indexed_count == 3
+
+    def count_queries(prefix):
+        return len([query for query in sql if query.startswith(prefix)])
+
+    assert count_queries('SELECT "iiif_store_iiifresource"') == 2
+    assert count_queries('DELETE FROM "search_service_indexable"') == 2
+    assert count_queries('INSERT INTO "search_service_indexable"') == 2
+
+
+def test_iiif_store_batch_indexing_delete(http_service, search_manifest):
+    test_endpoint = f"iiif/{test_data_store.get(search_manifest.get('id'))}"
+    status = 204
+    response = requests.delete(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/", headers=test_headers
+    )
+    assert response.status_code == status
+    assert not [
+        indexable
+        for indexable in get_indexables(http_service)
+        if indexable.get("resource_id") in test_data_store.values()
+    ]
@@ -0,0 +1,91 @@
+import copy
+import json
+import pytest
+import requests
+
+
+app_endpoint = "api/iiif_store"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+
+test_data_store = {}
+
+
+@pytest.fixture
+def search_manifest(tests_dir):
+    return json.load(
+        (tests_dir / "fixtures/search/iiif3/search_manifest_2.json").open(encoding="utf-8")
+    )
+
+
+def get_numbered_manifest(manifest, number):
+    numbered_manifest = copy.deepcopy(manifest)
+    numbered_manifest["id"] = f"{manifest.get('id')}/{number}"
+    for canvas in numbered_manifest.get("items"):
+        canvas["id"] = f"{canvas.get('id')}/{number}"
+    return numbered_manifest
+
+
+def test_iiif_store_api_iiif_bulk_delete_create_manifests(http_service, search_manifest):
+    test_endpoint = "iiif"
+    status = 201
+    for number in range(3):
+        response = requests.post(
+            f"{http_service}/{app_endpoint}/{test_endpoint}/",
+            headers=test_headers,
+            json={"iiif_json": get_numbered_manifest(search_manifest, number)},
+        )
+        assert response.status_code == status
+        resources = response.json().get("resources")
+        assert len(resources) == 3
+        test_data_store[number] = [resource.get("id") for resource in resources]
+
+
+def test_iiif_store_api_iiif_bulk_delete_requires_ids(http_service):
+    test_endpoint = "iiif/bulk_delete"
+    status = 400
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/",
+        headers=test_headers,
+        json={},
+    )
+    assert response.status_code == status
+
+
+def test_iiif_store_api_iiif_bulk_delete(http_service, search_manifest):
+    test_endpoint = "iiif/bulk_delete"
+    status = 200
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/",
+        headers=test_headers,
+        json={
+            "ids": [test_data_store[0][0]],
+            "original_ids": [get_numbered_manifest(search_manifest, 1).get("id")],
+        },
+    )
+    assert response.status_code == status
+    assert response.json() == {"deleted": 6}
+
+    for number, resource_ids in test_data_store.items():
+        for resource_id in resource_ids:
+            response = requests.get(
+                f"{http_service}/{app_endpoint}/iiif/{resource_id}/", headers=test_headers
+            )
+            assert response.status_code == (200 if number == 2 else 404)
+
+
+def test_iiif_store_api_iiif_bulk_delete_cleanup(http_service):
+    test_endpoint = "iiif/bulk_delete"
+    status = 200
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/",
+        headers=test_headers,
+        json={"ids": [test_data_store[2][0]]},
+    )
+    assert response.status_code == status
+    assert response.json() == {"deleted": 3}
+
+    test_endpoint = "iiif"
+    response = requests.get(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/", headers=test_headers
+    )
+    assert response.json().get("count") == 0
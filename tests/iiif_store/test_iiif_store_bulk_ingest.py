@@ -0,0 +1,138 @@
+import copy
+import json
+import pytest
+import requests
+
+
+app_endpoint = "api/iiif_store"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+ndjson_headers = {"Content-Type": "application/x-ndjson", "Accept": "application/json"}
+
+test_data_store = {"manifest_uuids": []}
+
+
+@pytest.fixture
+def iiif3_search_manifests(tests_dir):
+    iiif3_manifests = {}
+    for iiif3_file in sorted((tests_dir / "fixtures/search/iiif3/").iterdir()):
+        iiif3_manifests[iiif3_file.name] = json.load(iiif3_file.open(encoding="utf-8"))
+    return iiif3_manifests
+
+
+def test_iiif_store_api_iiif_bulk_ndjson(http_service, iiif3_search_manifests):
+    test_endpoint = "iiif/bulk"
+    status = 200
+    manifests = list(iiif3_search_manifests.values())
+    lines = [json.dumps(manifests[0]), json.dumps({"type": "Manifest"})] + [
+        json.dumps({"iiif_json": manifest}) for manifest in manifests[1:]
+    ]
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/?batch_size=2",
+        headers=ndjson_headers,
+        data="\n".join(lines),
+    )
+    assert response.status_code == status
+    results = response.json().get("results")
+    assert len(results) == len(manifests) + 1
+    assert results[1].get("status") == "failed"
+    results.pop(1)
+    for result, manifest in zip(results, manifests):
+        assert result.get("status") == "ingested"
+        assert result.get("original_id") == manifest.get("id")
+        assert result.get("iiif_type") == "manifest"
+        assert result.get("resources") == len(manifest.get("items")) + 1
+        test_data_store["manifest_uuids"].append(result.get("id"))
+
+
+def test_iiif_store_api_iiif_bulk_collection(http_service, iiif3_search_manifests):
+    test_endpoint = "iiif/bulk"
+    status = 200
+    manifests = list(iiif3_search_manifests.values())
+    collection = {
+        "@context": "http://iiif.io/api/presentation/3/context.json",
+        "id": "https://example.org/iiif/collection",
+        "type": "Collection",
+        "items": manifests,
+    }
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/",
+        headers=test_headers,
+        json=collection,
+    )
+    assert response.status_code == status
+    results = response.json().get("results")
+    assert [result.get("id") for result in results] == test_data_store["manifest_uuids"]
+
+
+def test_iiif_store_api_iiif_bulk_invalid_manifest(http_service, iiif3_search_manifests):
+    test_endpoint = "iiif/bulk"
+    status = 200
+    manifests = list(iiif3_search_manifests.values())
+    invalid_manifest = copy.deepcopy(manifests[1])
+    invalid_manifest["id"] = "https://example.org/iiif/invalid-manifest"
+    invalid_manifest.get("items")[0].pop("id")
+    lines = [json.dumps(manifests[0]), json.dumps(invalid_manifest), json.dumps(manifests[2])]
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/?batch_size=3",
+        headers=ndjson_headers,
+        data="\n".join(lines),
+    )
+    assert response.status_code == status
+    results = response.json().get("results")
+    assert len(results) == 3
+    assert results[1].get("status") == "failed"
+    assert results[1].get("original_id") == invalid_manifest.get("id")
+    assert results[1].get("error")
+    assert [results[0].get("id"), results[2].get("id")] == [
+        test_data_store["manifest_uuids"][0],
+        test_data_store["manifest_uuids"][2],
+    ]
+    assert results[0].get("status") == "unchanged"
+    assert results[2].get("status") == "unchanged"
+
+
+def test_iiif_store_api_iiif_bulk_invalid_ndjson(http_service, iiif3_search_manifests):
+    test_endpoint = "iiif/bulk"
+    status = 200
+    manifests = list(iiif3_search_manifests.values())
+    lines = [json.dumps(manifests[0]), json.dumps(manifests[1]), "{", json.dumps(manifests[2])]
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/?batch_size=1",
+        headers=ndjson_headers,
+        data="\n".join(lines),
+    )
+    # The manifests before the invalid line have been written, and are returned
+    # with a failed result for the rest of the lines.
+    assert response.status_code == status
+    results = response.json().get("results")
+    assert [result.get("id") for result in results[:2]] == test_data_store["manifest_uuids"][:2]
+    assert [result.get("status") for result in results] == ["unchanged", "unchanged", "failed"]
+    assert "line 3" in results[2].get("error")
+
+
+def test_iiif_store_api_iiif_bulk_list(http_service, iiif3_search_manifests):
+    test_endpoint = "iiif"
+    status = 200
+    response = requests.get(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/", headers=test_headers
+    )
+    assert response.status_code == status
+    assert response.json().get("count") == sum(
+        len(manifest.get("items")) + 1 for manifest in iiif3_search_manifests.values()
+    )
+
+
+def test_iiif_store_api_iiif_bulk_delete(http_service):
+    for manifest_id in test_data_store.get("manifest_uuids"):
+        test_endpoint = f"iiif/{manifest_id}"
+        status = 204
+        response = requests.delete(
+            f"{http_service}/{app_endpoint}/{test_endpoint}/", headers=test_headers
+        )
+        assert response.status_code == status
+
+    test_endpoint = "iiif"
+    response = requests.get(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/", headers=test_headers
+    )
+    assert response.json().get("count") == 0
@@ -0,0 +1,134 @@
+import copy
+import json
+import pytest
+import requests
+
+
+app_endpoint = "api/iiif_store"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+
+# More canvases than the PAGE_SIZE of the test services, so that they are listed in pages.
+canvas_count = 30
+
+test_data_store = {}
+
+
+@pytest.fixture
+def paginated_manifest(tests_dir):
+    manifest = json.load(
+        (tests_dir / "fixtures/search/iiif3/search_manifest_2.json").open(
+            encoding="utf-8"
+        )
+    )
+    canvas = manifest.get("items")[0]
+    manifest["items"] = [
+        {**copy.deepcopy(canvas), "id": f"{canvas.get('id')}/{index}"}
+        for index in range(canvas_count)
+    ]
+    return manifest
+
+
+@pytest.fixture
+def http_services(http_service_cursor, http_service_serve_time):
+    # The serve time service is cursor paginated with the estimated count.
+    return {"exact": http_service_cursor, "estimate": http_service_serve_time}
+
+
+def get_pages(url):
+    pages = []
+    while url:
+        response = requests.get(url, headers=test_headers)
+        assert response.status_code == 200
+        response_json = response.json()
+        pages.append(response_json)
+        url = response_json.get("next")
+    return pages
+
+
+def test_iiif_store_cursor_create_manifest(http_services, paginated_manifest):
+    test_endpoint = "iiif"
+    status = 201
+    for name, url in http_services.items():
+        response = requests.post(
+            f"{url}/{app_endpoint}/{test_endpoint}/",
+            headers=test_headers,
+            json={"iiif_json": paginated_manifest},
+        )
+        assert response.status_code == status
+        test_data_store[name] = {
+            resource.get("iiif_type"): resource.get("id")
+            for resource in response.json().get("resources")
+        }
+        test_data_store[(name, "resources")] = {
+            resource.get("id") for resource in response.json().get("resources")
+        }
+
+
+def test_iiif_store_cursor_public_iiif_list_iiif_type(http_service_cursor):
+    pages = get_pages(f"{http_service_cursor}/iiif/canvas/")
+    assert len(pages) == 2
+    urls = [result.get("url") for page in pages for result in page.get("results")]
+    assert len(urls) == canvas_count
+    assert len(set(urls)) == canvas_count
+    for page in pages:
+        assert page.get("count") == canvas_count
+        assert "previous" not in page
+
+
+def test_iiif_store_cursor_api_iiif_list(http_service_cursor):
+    pages = get_pages(f"{http_service_cursor}/{app_endpoint}/iiif/")
+    ids = [result.get("id") for page in pages for result in page.get("results")]
+    assert len(ids) == len(set(ids))
+    assert set(ids) == test_data_store.get(("exact", "resources"))
+
+
+def test_iiif_store_cursor_public_iiif_list_count_estimate(http_services):
+    # The estimate is read from the query plan, so is not necessarily exact.
+    response = requests.get(f"{http_services['estimate']}/iiif/canvas/", headers=test_headers)
+    assert response.status_code == 200
+    response_json = response.json()
+    assert isinstance(response_json.get("count"), int)
+    assert len(response_json.get("results")) < canvas_count
+    assert response_json.get("next")
+
+
+@pytest.mark.parametrize("cursor", ["invalid", "WyJub3QgYSBkYXRlIiwgIngiXQ=="])
+def test_iiif_store_cursor_public_iiif_list_invalid_cursor(http_service_cursor, cursor):
+    status = 404
+    response = requests.get(
+        f"{http_service_cursor}/iiif/canvas/?cursor={cursor}", headers=test_headers
+    )
+    assert response.status_code == status
+
+
+def test_iiif_store_cursor_public_iiif_list_not_modified(http_service_cursor):
+    first_page, second_page = get_pages(f"{http_service_cursor}/iiif/canvas/")
+    response = requests.get(f"{http_service_cursor}/iiif/canvas/", headers=test_headers)
+    etag = response.headers.get("ETag")
+    assert etag
+
+    status = 304
+    response = requests.get(
+        f"{http_service_cursor}/iiif/canvas/",
+        headers={**test_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == status
+    assert response.headers.get("ETag") == etag
+
+    # Each page has the ETag of the resources listed in it.
+    response = requests.get(
+        first_page.get("next"), headers={**test_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers.get("ETag") != etag
+    assert response.json() == second_page
+
+
+def test_iiif_store_cursor_delete(http_services):
+    status = 204
+    for name, url in http_services.items():
+        test_endpoint = f"iiif/{test_data_store.get(name).get('manifest')}"
+        response = requests.delete(
+            f"{url}/{app_endpoint}/{test_endpoint}/", headers=test_headers
+        )
+        assert response.status_code == status
@@ -0,0 +1,114 @@
+import copy
+import json
+import pytest
+import requests
+
+from ..utils import normalise_uuids
+
+
+app_endpoint = "api/iiif_store"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+
+test_data_store = {}
+
+
+@pytest.fixture
+def simple_iiif3_manifest(tests_dir):
+    return json.load(
+        (tests_dir / "fixtures/simple_iiif3_manifest.json").open(encoding="utf-8")
+    )
+
+
+@pytest.fixture
+def http_services(http_service, http_service_dedup):
+    return {"default": http_service, "dedup": http_service_dedup}
+
+
+def test_iiif_store_dedup_create_manifest(http_services, simple_iiif3_manifest):
+    test_endpoint = "iiif"
+    status = 201
+    for name, url in http_services.items():
+        response = requests.post(
+            f"{url}/{app_endpoint}/{test_endpoint}/",
+            headers=test_headers,
+            json={"iiif_json": simple_iiif3_manifest},
+        )
+        assert response.status_code == status
+        for resource in response.json().get("resources"):
+            test_data_store[(name, resource.get("iiif_type"))] = resource.get("id")
+
+
+def test_iiif_store_dedup_public_iiif_get_manifest(http_services):
+    responses = {}
+    for name, url in http_services.items():
+        test_endpoint = f"iiif/manifest/{test_data_store.get((name, 'manifest'))}"
+        response = requests.get(f"{url}/{test_endpoint}/", headers=test_headers)
+        assert response.status_code == 200
+        responses[name] = response.json()
+
+    manifest_json = responses["dedup"]
+    canvas_json = manifest_json.get("items")[0]
+    assert (
+        canvas_json.get("id")
+        == f"http://localhost:8000/iiif/canvas/{test_data_store.get(('dedup', 'canvas'))}/"
+    )
+    annotation_json = canvas_json.get("items")[0].get("items")[0]
+    assert annotation_json.get("target") == canvas_json.get("id")
+    assert normalise_uuids(manifest_json) == normalise_uuids(responses["default"])
+
+
+def test_iiif_store_dedup_public_iiif_get_canvas(http_services):
+    responses = {}
+    for name, url in http_services.items():
+        test_endpoint = f"iiif/canvas/{test_data_store.get((name, 'canvas'))}"
+        response = requests.get(f"{url}/{test_endpoint}/", headers=test_headers)
+        assert response.status_code == 200
+        responses[name] = response.json()
+    assert normalise_uuids(responses["dedup"]) == normalise_uuids(responses["default"])
+
+
+def test_iiif_store_dedup_shared_canvas_ingest(http_service_dedup, simple_iiif3_manifest):
+    # The canvas is re-ingested through another manifest, which changes it.
+    test_endpoint = f"iiif/manifest/{test_data_store.get(('dedup', 'manifest'))}"
+    response = requests.get(f"{http_service_dedup}/{test_endpoint}/", headers=test_headers)
+    assert response.status_code == 200
+    etag = response.headers.get("ETag")
+    assert etag
+
+    other_manifest = copy.deepcopy(simple_iiif3_manifest)
+    other_manifest["id"] = f"{simple_iiif3_manifest.get('id')}/other"
+    other_manifest["items"][0]["label"] = {"en": ["Shared canvas label"]}
+    response = requests.post(
+        f"{http_service_dedup}/{app_endpoint}/iiif/",
+        headers=test_headers,
+        json={"iiif_json": other_manifest},
+    )
+    assert response.status_code == 201
+    for resource in response.json().get("resources"):
+        if resource.get("iiif_type") == "manifest":
+            test_data_store[("dedup", "other_manifest")] = resource.get("id")
+
+    # The first manifest is served with the changed canvas, and a new ETag.
+    response = requests.get(
+        f"{http_service_dedup}/{test_endpoint}/",
+        headers={**test_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.headers.get("ETag") != etag
+    assert response.json().get("items")[0].get("label") == {"en": ["Shared canvas label"]}
+
+
+def test_iiif_store_dedup_delete(http_services):
+    status = 204
+    response = requests.delete(
+        f"{http_services['dedup']}/{app_endpoint}/iiif/"
+        f"{test_data_store.get(('dedup', 'other_manifest'))}/",
+        headers=test_headers,
+    )
+    assert response.status_code == status
+    for name, url in http_services.items():
+        test_endpoint = f"iiif/{test_data_store.get((name, 'manifest'))}"
+        response = requests.delete(
+            f"{url}/{app_endpoint}/{test_endpoint}/", headers=test_headers
+        )
+        assert response.status_code == status
@@ -0,0 +1,116 @@
+import gzip
+import json
+import pytest
+import requests
+
+
+app_endpoint = "api/iiif_store"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+ndjson_headers = {"Content-Type": "application/x-ndjson", "Accept": "application/x-ndjson"}
+
+test_data_store = {}
+
+
+@pytest.fixture
+def iiif3_search_manifests(tests_dir):
+    iiif3_manifests = {}
+    for iiif3_file in sorted((tests_dir / "fixtures/search/iiif3/").iterdir()):
+        iiif3_manifests[iiif3_file.name] = json.load(iiif3_file.open(encoding="utf-8"))
+    return iiif3_manifests
+
+
+def test_iiif_store_api_iiif_export_create_manifests(http_service, iiif3_search_manifests):
+    test_endpoint = "iiif/bulk"
+    status = 200
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/",
+        headers={"Content-Type": "application/x-ndjson", "Accept": "application/json"},
+        data="\n".join(json.dumps(manifest) for manifest in iiif3_search_manifests.values()),
+    )
+    assert response.status_code == status
+    results = response.json().get("results")
+    assert [result.get("status") for result in results] == ["ingested"] * len(results)
+    test_data_store["manifest_uuids"] = [result.get("id") for result in results]
+
+
+def test_iiif_store_api_iiif_export(http_service, iiif3_search_manifests):
+    test_endpoint = "iiif/export"
+    status = 200
+    response = requests.get(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/?iiif_type=manifest",
+        headers=ndjson_headers,
+    )
+    assert response.status_code == status
+    assert response.headers.get("Content-Type") == "application/x-ndjson"
+    records = [json.loads(line) for line in response.content.splitlines()]
+    assert sorted(record.get("id") for record in records) == sorted(
+        test_data_store["manifest_uuids"]
+    )
+    manifests = {manifest.get("id"): manifest for manifest in iiif3_search_manifests.values()}
+    for record in records:
+        assert record.get("iiif_type") == "manifest"
+        assert record.get("iiif_json") == manifests[record.get("original_id")]
+    test_data_store["export"] = response.content
+
+
+def test_iiif_store_api_iiif_export_gzip(http_service):
+    test_endpoint = "iiif/export"
+    status = 200
+    response = requests.get(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/?gzip=true&form=public",
+        headers=ndjson_headers,
+    )
+    assert response.status_code == status
+    assert response.headers.get("Content-Type") == "application/gzip"
+    assert response.headers.get("Content-Encoding") is None
+    assert "iiif_store.ndjson.gz" in response.headers.get("Content-Disposition")
+    lines = gzip.decompress(response.content).decode("utf-8").splitlines()
+    records = [json.loads(line) for line in lines]
+    manifest_records = [record for record in records if record.get("iiif_type") == "manifest"]
+    assert len(manifest_records) == len(test_data_store["manifest_uuids"])
+    assert len(records) > len(manifest_records)
+    for record in manifest_records:
+        assert record.get("iiif_json").get("id").endswith(f"/manifest/{record.get('id')}/")
+
+
+def test_iiif_store_api_iiif_export_invalid_form(http_service):
+    test_endpoint = "iiif/export"
+    status = 400
+    response = requests.get(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/?form=unknown",
+        headers=test_headers,
+    )
+    assert response.status_code == status
+
+
+def test_iiif_store_api_iiif_export_reimport(http_service):
+    test_endpoint = "iiif/bulk"
+    status = 200
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/",
+        headers={"Content-Type": "application/x-ndjson", "Accept": "application/json"},
+        data=test_data_store["export"],
+    )
+    assert response.status_code == status
+    results = response.json().get("results")
+    assert len(results) == len(test_data_store["manifest_uuids"])
+    for result in results:
+        assert result.get("status") == "unchanged"
+        assert result.get("id") in test_data_store["manifest_uuids"]
+
+
+def test_iiif_store_api_iiif_export_cleanup(http_service):
+    test_endpoint = "iiif/bulk_delete"
+    status = 200
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/",
+        headers=test_headers,
+        json={"ids": test_data_store["manifest_uuids"]},
+    )
+    assert response.status_code == status
+
+    test_endpoint = "iiif"
+    response = requests.get(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/", headers=test_headers
+    )
+    assert response.json().get("count") == 0
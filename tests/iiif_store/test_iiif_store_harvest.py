@@ -0,0 +1,116 @@
+import pytest
+import requests
+
+
+app_endpoint = "api/iiif_store"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+
+# Served to the test container by the fixtures service in docker-compose.test.yml.
+fixtures_url = "http://fixtures:8080"
+
+test_data_store = {"manifest_uuids": []}
+
+
+@pytest.fixture
+def harvest_urls():
+    return [
+        f"{fixtures_url}/search/iiif3/search_manifest_1.json",
+        f"{fixtures_url}/harvest/collection.json",
+        f"{fixtures_url}/missing.json",
+    ]
+
+
+def test_iiif_store_api_iiif_harvest(http_service, harvest_urls):
+    test_endpoint = "iiif/harvest"
+    status = 200
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/",
+        headers=test_headers,
+        json={"urls": harvest_urls},
+    )
+    assert response.status_code == status
+    results = response.json().get("results")
+    assert [result.get("url") for result in results] == harvest_urls + [
+        f"{fixtures_url}/search/iiif3/search_manifest_3.json",
+        f"{fixtures_url}/search/iiif3/search_manifest_4.json",
+    ]
+    assert [result.get("status") for result in results] == [
+        "harvested",
+        "harvested",
+        "failed",
+        "harvested",
+        "harvested",
+    ]
+    assert results[1].get("iiif_type") == "collection"
+    assert results[1].get("members") == 2
+    for result in results[0:1] + results[3:]:
+        assert result.get("iiif_type") == "manifest"
+        test_data_store["manifest_uuids"].append(result.get("id"))
+
+
+def test_iiif_store_api_iiif_harvest_not_modified(http_service, harvest_urls):
+    test_endpoint = "iiif/harvest"
+    status = 200
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/",
+        headers=test_headers,
+        json={"urls": harvest_urls},
+    )
+    assert response.status_code == status
+    results = response.json().get("results")
+    assert [result.get("status") for result in results] == [
+        "not_modified",
+        "harvested",
+        "failed",
+        "not_modified",
+        "not_modified",
+    ]
+
+
+def test_iiif_store_api_iiif_harvest_no_resources(http_service):
+    # The IIIF 2 manifest has no resources of the IIIF_RESOURCE_TYPES, and only
+    # fails itself.
+    harvest_urls = [
+        f"{fixtures_url}/harvest/iiif2_manifest.json",
+        f"{fixtures_url}/search/iiif3/search_manifest_2.json",
+    ]
+    test_endpoint = "iiif/harvest"
+    status = 200
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/",
+        headers=test_headers,
+        json={"urls": harvest_urls},
+    )
+    assert response.status_code == status
+    results = response.json().get("results")
+    assert [result.get("url") for result in results] == harvest_urls
+    assert [result.get("status") for result in results] == ["failed", "harvested"]
+    assert results[0].get("error")
+    test_data_store["manifest_uuids"].append(results[1].get("id"))
+
+
+def test_iiif_store_api_iiif_harvest_invalid_url(http_service):
+    test_endpoint = "iiif/harvest"
+    status = 400
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/",
+        headers=test_headers,
+        json={"urls": ["not a url"]},
+    )
+    assert response.status_code == status
+
+
+def test_iiif_store_api_iiif_harvest_delete(http_service):
+    for manifest_id in test_data_store.get("manifest_uuids"):
+        test_endpoint = f"iiif/{manifest_id}"
+        status = 204
+        response = requests.delete(
+            f"{http_service}/{app_endpoint}/{test_endpoint}/", headers=test_headers
+        )
+        assert response.status_code == status
+
+    test_endpoint = "iiif"
+    response = requests.get(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/", headers=test_headers
+    )
+    assert response.json().get("count") == 0
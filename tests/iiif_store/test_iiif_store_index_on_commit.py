@@ -0,0 +1,155 @@
+import copy
+import json
+import pytest
+import requests
+
+
+app_endpoint = "api/iiif_store"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+
+test_data_store = {}
+
+# Runs the transactions of the test in the Django shell of the test service,
+# printing the lists of ids dispatched to be indexed.
+dispatched_indexing_code = """
+import json
+from django.db import transaction
+from iiif_store import indexing
+
+dispatched = []
+indexing.dispatch_iiif_resource_indexing = dispatched.append
+{transactions}
+print(json.dumps(dispatched))
+"""
+
+
+def get_dispatched_indexing(django_shell, transactions):
+    return django_shell(dispatched_indexing_code.format(transactions=transactions))
+
+
+@pytest.fixture
+def search_manifest(tests_dir):
+    return json.load(
+        (tests_dir / "fixtures/search/iiif3/search_manifest_4.json").open(
+            encoding="utf-8"
+        )
+    )
+
+
+def get_label_indexables(http_service):
+    """Return the label indexables of the resources of the test manifest, by resource."""
+    response = requests.get(
+        f"{http_service}/api/search_service/indexable/", headers=test_headers
+    )
+    assert response.status_code == 200
+    label_indexables = {}
+    for indexable in response.json().get("results"):
+        if (
+            indexable.get("resource_id") in test_data_store.values()
+            and indexable.get("subtype") == "label"
+        ):
+            label_indexables.setdefault(indexable.get("resource_id"), []).append(
+                indexable.get("indexable_text")
+            )
+    return label_indexables
+
+
+def post_manifest(http_service, manifest, query=""):
+    test_endpoint = "iiif"
+    status = 201
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/{query}",
+        headers=test_headers,
+        json={"iiif_json": manifest},
+    )
+    assert response.status_code == status
+    for resource in response.json().get("resources"):
+        test_data_store[resource.get("original_id")] = resource.get("id")
+    return response.json()
+
+
+def test_iiif_store_index_on_commit_duplicate_ids(django_shell):
+    dispatched = get_dispatched_indexing(
+        django_shell,
+        """
+with transaction.atomic():
+    indexing.index_iiif_resources(["a", "b", "a"])
+    indexing.index_iiif_resources(["b", "c"])
+    with transaction.atomic():
+        indexing.index_iiif_resources(["c", "d"])
+""",
+    )
+    # Each id is indexed once, by a single dispatch when the transaction commits.
+    assert dispatched == [["a", "b", "c", "d"]]
+
+
+def test_iiif_store_index_on_commit_rolled_back_savepoint(django_shell):
+    dispatched = get_dispatched_indexing(
+        django_shell,
+        """
+with transaction.atomic():
+    indexing.index_iiif_resources(["a"])
+    try:
+        with transaction.atomic():
+            indexing.index_iiif_resources(["a", "b"])
+            raise ValueError("Rolled back")
+    except ValueError:
+        pass
+    with transaction.atomic():
+        indexing.index_iiif_resources(["c"])
+""",
+    )
+    assert dispatched == [["a", "c"]]
+
+
+def test_iiif_store_index_on_commit_rolled_back_transaction(django_shell):
+    dispatched = get_dispatched_indexing(
+        django_shell,
+        """
+try:
+    with transaction.atomic():
+        indexing.index_iiif_resources(["a"])
+        raise ValueError("Rolled back")
+except ValueError:
+    pass
+with transaction.atomic():
+    indexing.index_iiif_resources(["b"])
+""",
+    )
+    assert dispatched == [["b"]]
+
+
+def test_iiif_store_index_on_commit_create_manifest(http_service, search_manifest):
+    post_manifest(http_service, search_manifest)
+    # Each resource written by the ingest is indexed once, when it commits.
+    assert get_label_indexables(http_service) == {
+        test_data_store.get(search_manifest.get("id")): ["Pneumatica"],
+        **{
+            test_data_store.get(canvas.get("id")): canvas.get("label").get("en")
+            for canvas in search_manifest.get("items")
+        },
+    }
+
+
+def test_iiif_store_index_on_commit_update_manifest(http_service, search_manifest):
+    updated_manifest = copy.deepcopy(search_manifest)
+    removed_canvas = updated_manifest["items"].pop()
+    updated_manifest["items"][0]["label"] = {"en": ["Updated canvas"]}
+    response_json = post_manifest(http_service, updated_manifest, query="?update=true")
+    assert response_json.get("deleted") == [test_data_store.pop(removed_canvas.get("id"))]
+    # The indexables are those of the committed update, without those of the
+    # deleted canvas.
+    assert get_label_indexables(http_service) == {
+        test_data_store.get(search_manifest.get("id")): ["Pneumatica"],
+        test_data_store.get(updated_manifest["items"][0].get("id")): ["Updated canvas"],
+    }
+
+
+def test_iiif_store_index_on_commit_delete(http_service, search_manifest):
+    test_endpoint = f"iiif/{test_data_store.get(search_manifest.get('id'))}"
+    status = 204
+    response = requests.delete(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/", headers=test_headers
+    )
+    assert response.status_code == status
+    assert get_label_indexables(http_service) == {}
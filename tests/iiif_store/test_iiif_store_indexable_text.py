@@ -0,0 +1,80 @@
+import json
+import pytest
+import requests
+
+
+app_endpoint = "api/iiif_store"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+
+test_data_store = {}
+
+
+@pytest.fixture
+def metadata_manifest(tests_dir):
+    manifest = json.load(
+        (tests_dir / "fixtures/simple_iiif3_manifest.json").open(encoding="utf-8")
+    )
+    manifest["metadata"] = [
+        {"label": {"en": ["Plain"]}, "value": {"en": ["A plain value"]}},
+        {
+            "label": {"en": ["Html"]},
+            "value": {
+                "en": ["<p>An <b>html</b> value &amp; <script>alert(1)</script>more</p>"]
+            },
+        },
+    ]
+    return manifest
+
+
+def get_metadata_indexables(http_service):
+    response = requests.get(
+        f"{http_service}/api/search_service/indexable/", headers=test_headers
+    )
+    assert response.status_code == 200
+    return {
+        indexable.get("subtype"): indexable
+        for indexable in response.json().get("results")
+        if indexable.get("resource_id") == test_data_store.get("manifest")
+        and indexable.get("type") == "metadata"
+    }
+
+
+def test_iiif_store_indexable_text_create_manifest(http_service, metadata_manifest):
+    test_endpoint = "iiif"
+    status = 201
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/",
+        headers=test_headers,
+        json={"iiif_json": metadata_manifest},
+    )
+    assert response.status_code == status
+    for resource in response.json().get("resources"):
+        test_data_store[resource.get("iiif_type")] = resource.get("id")
+
+
+def test_iiif_store_indexable_text_plain_value(http_service):
+    indexable = get_metadata_indexables(http_service).get("plain")
+    assert indexable.get("indexable_text") == "A plain value"
+    assert indexable.get("original_content") == str({"Plain": "A plain value"})
+    assert indexable.get("language_iso639_2") == "eng"
+
+
+def test_iiif_store_indexable_text_html_value(http_service):
+    indexable = get_metadata_indexables(http_service).get("html")
+    # The text leaves out the tags and the contents of script elements.
+    assert indexable.get("indexable_text") == "An html value & more"
+    # The original content keeps the allowed tags, and escapes the others.
+    original_content = indexable.get("original_content")
+    assert "<b>html</b>" in original_content
+    assert "&amp;" in original_content
+    assert "<script>" not in original_content
+    assert "&lt;script&gt;" in original_content
+
+
+def test_iiif_store_indexable_text_delete(http_service):
+    test_endpoint = f"iiif/{test_data_store.get('manifest')}"
+    status = 204
+    response = requests.delete(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/", headers=test_headers
+    )
+    assert response.status_code == status
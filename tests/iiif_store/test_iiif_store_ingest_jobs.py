@@ -0,0 +1,112 @@
+import copy
+import json
+import pytest
+import requests
+
+
+app_endpoint = "api/iiif_store"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+
+test_data_store = {}
+
+
+@pytest.fixture
+def search_manifest(tests_dir):
+    return json.load(
+        (tests_dir / "fixtures/search/iiif3/search_manifest_2.json").open(
+            encoding="utf-8"
+        )
+    )
+
+
+def get_job(url):
+    response = requests.get(url, headers=test_headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_iiif_store_api_iiif_job_create(http_service, search_manifest):
+    test_endpoint = "iiif"
+    status = 202
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/?async=true",
+        headers=test_headers,
+        json={"iiif_json": search_manifest},
+    )
+    assert response.status_code == status
+    response_json = response.json()
+    assert response.headers.get("Location") == response_json.get("url")
+    assert response_json.get("original_id") == search_manifest.get("id")
+    assert response_json.get("status") in ["queued", "running", "complete"]
+    test_data_store["job_url"] = response_json.get("url")
+
+
+def test_iiif_store_api_iiif_job_poll(http_service, search_manifest):
+    # n.b. the test service runs the queued tasks synchronously, see Q_CLUSTER_SYNC.
+    job = get_job(test_data_store.get("job_url"))
+    assert job.get("status") == "complete"
+    assert job.get("error") == ""
+    assert job.get("resources_written") == len(search_manifest.get("items")) + 1
+    assert job.get("relationships_written") == len(search_manifest.get("items"))
+    assert job.get("indexing_queued") == len(search_manifest.get("items")) + 1
+    result = job.get("result")
+    assert result.get("relationships") == len(search_manifest.get("items"))
+    assert result.get("unchanged") == []
+    for resource in result.get("resources"):
+        test_data_store[resource.get("original_id")] = resource
+
+    manifest = test_data_store.get(search_manifest.get("id"))
+    assert manifest.get("iiif_type") == "manifest"
+    response = requests.get(
+        f"{http_service}/iiif/manifest/{manifest.get('id')}/", headers=test_headers
+    )
+    assert response.status_code == 200
+    assert response.json().get("label") == search_manifest.get("label")
+
+
+def test_iiif_store_api_iiif_job_list(http_service):
+    response = requests.get(f"{http_service}/{app_endpoint}/jobs/", headers=test_headers)
+    assert response.status_code == 200
+    assert test_data_store.get("job_url") in [
+        job.get("url") for job in response.json().get("results")
+    ]
+
+
+def test_iiif_store_api_iiif_job_update(http_service, search_manifest):
+    updated_manifest = copy.deepcopy(search_manifest)
+    updated_manifest["items"][0]["label"] = {"en": ["Updated canvas"]}
+    test_endpoint = "iiif"
+    status = 202
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/?async=true&update=true",
+        headers=test_headers,
+        json={"iiif_json": updated_manifest},
+    )
+    assert response.status_code == status
+    job = get_job(response.headers.get("Location"))
+    assert job.get("status") == "complete"
+    unchanged = job.get("result").get("unchanged")
+    canvas = test_data_store.get(search_manifest.get("items")[1].get("id"))
+    assert unchanged == [canvas.get("id")]
+
+
+def test_iiif_store_api_iiif_job_invalid(http_service):
+    test_endpoint = "iiif"
+    status = 400
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/?async=true",
+        headers=test_headers,
+        json={"iiif_json": {"type": "Manifest"}},
+    )
+    assert response.status_code == status
+    assert response.json().get("iiif_json")
+
+
+def test_iiif_store_api_iiif_job_delete(http_service, search_manifest):
+    manifest = test_data_store.get(search_manifest.get("id"))
+    test_endpoint = f"iiif/{manifest.get('id')}"
+    status = 204
+    response = requests.delete(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/", headers=test_headers
+    )
+    assert response.status_code == status
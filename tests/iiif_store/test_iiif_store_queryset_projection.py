@@ -0,0 +1,157 @@
+import json
+import pytest
+import requests
+
+
+app_endpoint = "api/iiif_store"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+
+test_data_store = {}
+
+queryset_sql_code = """
+import json
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from iiif_store import views
+
+viewset = getattr(views, {viewset_name!r})(
+    action={action!r},
+    request=Request(APIRequestFactory().get("/")),
+    format_kwarg=None,
+    args=(),
+    kwargs={kwargs!r},
+)
+print(json.dumps(str(viewset.get_queryset().query)))
+"""
+
+
+def get_queryset_sql(django_shell, viewset_name, action, **kwargs):
+    """Return the SQL of the queryset of a viewset action, as run by the test service."""
+    return django_shell(
+        queryset_sql_code.format(viewset_name=viewset_name, action=action, kwargs=kwargs)
+    )
+
+
+@pytest.fixture
+def simple_iiif3_manifest(tests_dir):
+    return json.load(
+        (tests_dir / "fixtures/simple_iiif3_manifest.json").open(encoding="utf-8")
+    )
+
+
+def get_api_detail(http_service, id):
+    response = requests.get(
+        f"{http_service}/{app_endpoint}/iiif/{id}/", headers=test_headers
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_iiif_store_projection_create_manifest(http_service, simple_iiif3_manifest):
+    test_endpoint = "iiif"
+    status = 201
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/",
+        headers=test_headers,
+        json={"iiif_json": simple_iiif3_manifest},
+    )
+    assert response.status_code == status
+    for resource in response.json().get("resources"):
+        test_data_store[resource.get("iiif_type")] = resource.get("id")
+
+
+def test_iiif_store_projection_api_list(http_service):
+    # The list only loads the columns read by its serializer.
+    response = requests.get(f"{http_service}/{app_endpoint}/iiif/", headers=test_headers)
+    assert response.status_code == 200
+    results = {result.get("id"): result for result in response.json().get("results")}
+    for id in test_data_store.values():
+        result = results.get(id)
+        assert "iiif_json" not in result
+        detail = get_api_detail(http_service, id)
+        for field in ["url", "iiif_type", "original_id", "label", "thumbnail"]:
+            assert result.get(field) == detail.get(field)
+
+
+@pytest.mark.parametrize("test_endpoint", ["iiif", "iiif/manifest"])
+def test_iiif_store_projection_public_list(http_service, test_endpoint):
+    response = requests.get(f"{http_service}/{test_endpoint}/", headers=test_headers)
+    assert response.status_code == 200
+    manifest_id = test_data_store.get("manifest")
+    (result,) = [
+        result
+        for result in response.json().get("results")
+        if result.get("url").endswith(f"/iiif/manifest/{manifest_id}/")
+    ]
+    assert "iiif_json" not in result
+    detail = get_api_detail(http_service, manifest_id)
+    assert result.get("iiif_type") == "manifest"
+    assert result.get("label") == detail.get("label")
+    assert result.get("thumbnail") == detail.get("thumbnail")
+
+
+@pytest.mark.parametrize(
+    "viewset_name,action,kwargs",
+    [
+        ("IIIFResourceAPIViewSet", "list", {}),
+        ("IIIFResourcePublicViewSet", "list", {}),
+        ("IIIFResourcePublicViewSet", "list_iiif_type", {"iiif_type": "manifest"}),
+        ("IIIFResourceAPISearchViewSet", "list", {}),
+        ("IIIFResourcePublicSearchViewSet", "list", {}),
+    ],
+)
+def test_iiif_store_projection_list_queryset_sql(
+    django_shell, viewset_name, action, kwargs
+):
+    sql = get_queryset_sql(django_shell, viewset_name, action, **kwargs)
+    assert '"iiif_store_iiifresource"."label"' in sql
+    assert '"iiif_store_iiifresource"."iiif_json"' not in sql
+    assert '"iiif_store_iiifresource"."iiif_json_compressed"' not in sql
+
+
+def test_iiif_store_projection_api_detail_queryset_sql(django_shell):
+    sql = get_queryset_sql(django_shell, "IIIFResourceAPIViewSet", "retrieve", id="x")
+    assert '"iiif_store_iiifresource"."iiif_json"' in sql
+    assert '"iiif_store_iiifresource"."iiif_json_compressed"' in sql
+    assert '"iiif_store_iiifresource"."content_hash"' not in sql
+
+
+def test_iiif_store_projection_api_update_queryset_sql(django_shell):
+    # The instance is loaded in full to be saved.
+    sql = get_queryset_sql(django_shell, "IIIFResourceAPIViewSet", "update", id="x")
+    assert '"iiif_store_iiifresource"."content_hash"' in sql
+
+
+def test_iiif_store_projection_api_detail(http_service, simple_iiif3_manifest):
+    manifest_id = test_data_store.get("manifest")
+    detail = get_api_detail(http_service, manifest_id)
+    iiif_json = detail.get("iiif_json")
+    assert iiif_json.get("id") == f"http://localhost:8000/iiif/manifest/{manifest_id}/"
+    assert iiif_json.get("label") == simple_iiif3_manifest.get("label")
+    assert len(iiif_json.get("items")) == len(simple_iiif3_manifest.get("items"))
+
+
+def test_iiif_store_projection_api_update(http_service):
+    # The instance is loaded in full to be saved, so no columns are lost.
+    manifest_id = test_data_store.get("manifest")
+    detail = get_api_detail(http_service, manifest_id)
+    label = {"en": ["Updated manifest label"]}
+    response = requests.patch(
+        f"{http_service}/{app_endpoint}/iiif/{manifest_id}/",
+        headers=test_headers,
+        json={"label": label},
+    )
+    assert response.status_code == 200
+    updated_detail = get_api_detail(http_service, manifest_id)
+    assert updated_detail.get("label") == label
+    for field in ["iiif_type", "original_id", "thumbnail", "iiif_json"]:
+        assert updated_detail.get(field) == detail.get(field)
+
+
+def test_iiif_store_projection_delete(http_service):
+    test_endpoint = f"iiif/{test_data_store.get('manifest')}"
+    status = 204
+    response = requests.delete(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/", headers=test_headers
+    )
+    assert response.status_code == status
@@ -0,0 +1,119 @@
+import copy
+import json
+import pytest
+import requests
+
+from ..utils import normalise_uuids
+
+
+app_endpoint = "api/iiif_store"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+
+test_data_store = {}
+
+
+@pytest.fixture
+def search_manifest(tests_dir):
+    return json.load(
+        (tests_dir / "fixtures/search/iiif3/search_manifest_2.json").open(
+            encoding="utf-8"
+        )
+    )
+
+
+@pytest.fixture
+def http_services(http_service, http_service_serve_time):
+    return {"default": http_service, "serve_time": http_service_serve_time}
+
+
+def post_manifest(http_services, manifest, query=""):
+    test_endpoint = "iiif"
+    status = 201
+    for name, url in http_services.items():
+        response = requests.post(
+            f"{url}/{app_endpoint}/{test_endpoint}/{query}",
+            headers=test_headers,
+            json={"iiif_json": manifest},
+        )
+        assert response.status_code == status
+        for resource in response.json().get("resources"):
+            test_data_store[(name, resource.get("original_id"))] = resource
+
+
+def get_public_iiif_json(http_services, original_id, query=""):
+    responses = {}
+    for name, url in http_services.items():
+        resource = test_data_store.get((name, original_id))
+        test_endpoint = f"iiif/{resource.get('iiif_type')}/{resource.get('id')}"
+        response = requests.get(f"{url}/{test_endpoint}/{query}", headers=test_headers)
+        assert response.status_code == 200
+        responses[name] = response.json()
+    return responses
+
+
+def test_iiif_store_serve_time_create_manifest(http_services, search_manifest):
+    post_manifest(http_services, search_manifest)
+
+
+def test_iiif_store_serve_time_api_iiif_get_manifest(http_services, search_manifest):
+    # The original ids are stored, and only applied when the manifest is served.
+    resource = test_data_store.get(("serve_time", search_manifest.get("id")))
+    response = requests.get(
+        f"{http_services['serve_time']}/{app_endpoint}/iiif/{resource.get('id')}/",
+        headers=test_headers,
+    )
+    assert response.status_code == 200
+    assert response.json().get("iiif_json").get("id") == search_manifest.get("id")
+
+
+def test_iiif_store_serve_time_public_iiif_get_manifest(http_services, search_manifest):
+    responses = get_public_iiif_json(http_services, search_manifest.get("id"))
+    manifest_json = responses["serve_time"]
+    resource = test_data_store.get(("serve_time", search_manifest.get("id")))
+    assert (
+        manifest_json.get("id")
+        == f"http://localhost:8000/iiif/manifest/{resource.get('id')}/"
+    )
+    assert normalise_uuids(manifest_json) == normalise_uuids(responses["default"])
+
+
+def test_iiif_store_serve_time_public_iiif_get_canvas(http_services, search_manifest):
+    for canvas in search_manifest.get("items"):
+        responses = get_public_iiif_json(http_services, canvas.get("id"))
+        assert normalise_uuids(responses["serve_time"]) == normalise_uuids(
+            responses["default"]
+        )
+
+
+def test_iiif_store_serve_time_public_iiif_get_manifest_items_slice(
+    http_services, search_manifest
+):
+    responses = get_public_iiif_json(
+        http_services, search_manifest.get("id"), query="?offset=1&limit=1"
+    )
+    assert len(responses["serve_time"].get("items")) == 1
+    assert normalise_uuids(responses["serve_time"]) == normalise_uuids(
+        responses["default"]
+    )
+
+
+def test_iiif_store_serve_time_update_manifest(http_services, search_manifest):
+    updated_manifest = copy.deepcopy(search_manifest)
+    updated_manifest["items"] = updated_manifest["items"][:1]
+    updated_manifest["items"][0]["label"] = {"en": ["Updated canvas"]}
+    post_manifest(http_services, updated_manifest, query="?update=true")
+    responses = get_public_iiif_json(http_services, search_manifest.get("id"))
+    assert len(responses["serve_time"].get("items")) == 1
+    assert normalise_uuids(responses["serve_time"]) == normalise_uuids(
+        responses["default"]
+    )
+
+
+def test_iiif_store_serve_time_delete(http_services, search_manifest):
+    status = 204
+    for name, url in http_services.items():
+        resource = test_data_store.get((name, search_manifest.get("id")))
+        response = requests.delete(
+            f"{url}/{app_endpoint}/iiif/{resource.get('id')}/", headers=test_headers
+        )
+        assert response.status_code == status
@@ -78,6 +78,27 @@ def test_iiif_store_api_iiif_create_manifest(http_service, simple_iiif3_manifest
     assert manifest_response_json.get("iiif_json") == expected_manifest
 
 
+def test_iiif_store_api_iiif_create_manifest_unchanged(http_service, simple_iiif3_manifest):
+    post_json = {
+        "iiif_json": simple_iiif3_manifest,
+    }
+    test_endpoint = "iiif"
+    status = 201
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/",
+        headers=test_headers,
+        json=post_json,
+    )
+    assert response.status_code == status
+    response_json = response.json()
+    assert len(response_json.get("resources")) == 2
+    for resource in response_json.get("resources"):
+        assert resource.get("id") == test_data_store.get(resource.get("iiif_type"))
+    assert sorted(response_json.get("unchanged")) == sorted(
+        [test_data_store.get("manifest"), test_data_store.get("canvas")]
+    )
+
+
 def test_iiif_store_api_iiif_list(http_service, simple_iiif3_manifest):
     test_endpoint = "iiif"
     status = 200
@@ -225,6 +246,122 @@ def test_iiif_store_public_iiif_get_manifest(http_service, simple_iiif3_manifest
     #assert response_json == expected_manifest
 
 
+def test_iiif_store_public_iiif_get_manifest_not_modified(http_service):
+    test_endpoint = f"iiif/manifest/{test_data_store.get('manifest')}"
+    response = requests.get(f"{http_service}/{test_endpoint}/", headers=test_headers)
+    assert response.status_code == 200
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    assert etag
+    assert last_modified
+
+    status = 304
+    response = requests.get(
+        f"{http_service}/{test_endpoint}/",
+        headers={**test_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == status
+    assert response.headers.get("ETag") == etag
+    assert response.content == b""
+
+    response = requests.get(
+        f"{http_service}/{test_endpoint}/",
+        headers={**test_headers, "If-Modified-Since": last_modified},
+    )
+    assert response.status_code == status
+
+
+def test_iiif_store_public_iiif_get_manifest_gzip(http_service):
+    # n.b. the test service caches rendered iiif_json, see RENDERED_IIIF_JSON_CACHE,
+    # and compresses it from PRECOMPRESSED_IIIF_JSON_MIN_SIZE.
+    test_endpoint = f"iiif/manifest/{test_data_store.get('manifest')}"
+    response = requests.get(
+        f"{http_service}/{test_endpoint}/",
+        headers={**test_headers, "Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.headers.get("Content-Encoding") == "gzip"
+    assert "Accept-Encoding" in response.headers.get("Vary")
+    identity_response = requests.get(
+        f"{http_service}/{test_endpoint}/",
+        headers={**test_headers, "Accept-Encoding": "identity"},
+    )
+    assert identity_response.headers.get("Content-Encoding") is None
+    assert identity_response.headers.get("ETag") != response.headers.get("ETag")
+    # n.b. requests decodes the gzip content encoding.
+    assert response.content == identity_response.content
+
+
+def test_iiif_store_public_iiif_get_manifest_items_slice(http_service):
+    test_endpoint = f"iiif/manifest/{test_data_store.get('manifest')}"
+    manifest = requests.get(f"{http_service}/{test_endpoint}/", headers=test_headers)
+    manifest_json = manifest.json()
+    canvas_id = manifest_json.get("items")[0].get("id")
+
+    status = 200
+    response = requests.get(
+        f"{http_service}/{test_endpoint}/?offset=0&limit=1", headers=test_headers
+    )
+    assert response.status_code == status
+    assert response.json() == {**manifest_json, "items": manifest_json.get("items")[:1]}
+    assert response.headers.get("ETag") != manifest.headers.get("ETag")
+
+    response = requests.get(
+        f"{http_service}/{test_endpoint}/?canvas={canvas_id}&radius=0", headers=test_headers
+    )
+    assert response.status_code == status
+    assert response.json().get("items") == manifest_json.get("items")[:1]
+
+    response = requests.get(
+        f"{http_service}/{test_endpoint}/?offset={len(manifest_json.get('items'))}&limit=1",
+        headers=test_headers,
+    )
+    assert response.status_code == status
+    assert response.json().get("items") == []
+    assert 'rel="prev"' in response.headers.get("Link")
+
+    response = requests.get(
+        f"{http_service}/{test_endpoint}/?offset=0&limit=1",
+        headers={**test_headers, "If-None-Match": response.headers.get("ETag")},
+    )
+    assert response.status_code == status
+    response = requests.get(
+        f"{http_service}/{test_endpoint}/?offset=0&limit=1",
+        headers={**test_headers, "If-None-Match": response.headers.get("ETag")},
+    )
+    assert response.status_code == 304
+
+    response = requests.get(
+        f"{http_service}/{test_endpoint}/?canvas=https://example.org/unknown",
+        headers=test_headers,
+    )
+    assert response.status_code == 404
+
+
+def test_iiif_store_public_iiif_list_iiif_type_not_modified(http_service):
+    test_endpoint = "iiif/canvas"
+    response = requests.get(f"{http_service}/{test_endpoint}/", headers=test_headers)
+    assert response.status_code == 200
+    assert response.json().get("count") == 1
+    etag = response.headers.get("ETag")
+
+    status = 304
+    response = requests.get(
+        f"{http_service}/{test_endpoint}/",
+        headers={**test_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == status
+    assert response.headers.get("ETag") == etag
+
+    # Each page, and query, of the list has its own ETag.
+    response = requests.get(
+        f"{http_service}/{test_endpoint}/?page=1",
+        headers={**test_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.headers.get("ETag") != etag
+
+
 def test_iiif_store_public_iiif_get_canvas(http_service):
     test_endpoint = f"iiif/canvas/{test_data_store.get('canvas')}"
     status = 200
@@ -0,0 +1,97 @@
+import copy
+import json
+import pytest
+import requests
+
+
+app_endpoint = "api/iiif_store"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+
+test_data_store = {}
+
+
+@pytest.fixture
+def simple_iiif3_manifest(tests_dir):
+    return json.load(
+        (tests_dir / "fixtures/simple_iiif3_manifest.json").open(encoding="utf-8")
+    )
+
+
+def test_iiif_store_api_iiif_stream_manifest(http_service, simple_iiif3_manifest):
+    test_endpoint = "iiif/stream"
+    status = 201
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/",
+        headers=test_headers,
+        data=json.dumps(simple_iiif3_manifest),
+    )
+    assert response.status_code == status
+    response_json = response.json()
+    assert response_json.get("id") is not None
+    assert response_json.get("iiif_type") == "manifest"
+    assert response_json.get("original_id") == simple_iiif3_manifest.get("id")
+    assert response_json.get("resources") == 2
+    assert response_json.get("relationships") == 1
+    test_data_store["manifest"] = response_json.get("id")
+
+
+def test_iiif_store_api_iiif_stream_list(http_service):
+    test_endpoint = "iiif"
+    status = 200
+    response = requests.get(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/", headers=test_headers
+    )
+    assert response.status_code == status
+    response_json = response.json()
+    assert response_json.get("count") == 2
+    for result in response_json["results"]:
+        test_data_store[result.get("iiif_type")] = result.get("id")
+    assert test_data_store.get("canvas") is not None
+
+
+def test_iiif_store_public_iiif_get_streamed_manifest(
+    http_service, simple_iiif3_manifest
+):
+    test_endpoint = f"iiif/manifest/{test_data_store.get('manifest')}"
+    status = 200
+    response = requests.get(f"{http_service}/{test_endpoint}/", headers=test_headers)
+    assert response.status_code == status
+    response_json = response.json()
+    canvas_id = f"http://localhost:8000/iiif/canvas/{test_data_store.get('canvas')}/"
+    assert (
+        response_json.pop("id")
+        == f"http://localhost:8000/iiif/manifest/{test_data_store.get('manifest')}/"
+    )
+    assert response_json["items"][0]["id"] == canvas_id
+    assert response_json["items"][0]["items"][0]["items"][0]["target"] == canvas_id
+    expected_manifest = copy.deepcopy(simple_iiif3_manifest)
+    expected_manifest.pop("id")
+    expected_manifest.pop("items")
+    response_json.pop("items")
+    assert response_json == expected_manifest
+
+
+def test_iiif_store_api_iiif_stream_invalid(http_service):
+    test_endpoint = "iiif/stream"
+    status = 400
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/",
+        headers=test_headers,
+        data='{"id": "https://example.org/manifest", "type": "Manifest", "items": [{',
+    )
+    assert response.status_code == status
+
+
+def test_iiif_store_api_iiif_stream_delete(http_service):
+    test_endpoint = f"iiif/{test_data_store.get('manifest')}"
+    status = 204
+    response = requests.delete(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/", headers=test_headers
+    )
+    assert response.status_code == status
+
+    test_endpoint = "iiif"
+    response = requests.get(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/", headers=test_headers
+    )
+    assert response.json().get("count") == 0
@@ -0,0 +1,107 @@
+import copy
+import json
+import pytest
+import requests
+
+
+app_endpoint = "api/iiif_store"
+test_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+
+test_data_store = {}
+
+
+@pytest.fixture
+def search_manifest(tests_dir):
+    return json.load(
+        (tests_dir / "fixtures/search/iiif3/search_manifest_2.json").open(encoding="utf-8")
+    )
+
+
+def test_iiif_store_api_iiif_update_create_manifest(http_service, search_manifest):
+    test_endpoint = "iiif"
+    status = 201
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/?update=true",
+        headers=test_headers,
+        json={"iiif_json": search_manifest},
+    )
+    assert response.status_code == status
+    response_json = response.json()
+    assert len(response_json.get("resources")) == 3
+    assert len(response_json.get("relationships")) == 2
+    assert response_json.get("deleted") == []
+    for resource in response_json.get("resources"):
+        test_data_store[resource.get("original_id")] = resource.get("id")
+
+    # The public manifest is rendered (and cached, if enabled) before the update.
+    manifest_id = test_data_store.get(search_manifest.get("id"))
+    response = requests.get(
+        f"{http_service}/iiif/manifest/{manifest_id}/", headers=test_headers
+    )
+    assert response.status_code == 200
+    assert len(response.json().get("items")) == 2
+
+
+def test_iiif_store_api_iiif_update_manifest(http_service, search_manifest):
+    updated_manifest = copy.deepcopy(search_manifest)
+    updated_manifest["items"][0]["label"] = {"en": ["Updated canvas"]}
+    removed_canvas = updated_manifest["items"].pop()
+    test_endpoint = "iiif"
+    status = 201
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/?update=true",
+        headers=test_headers,
+        json={"iiif_json": updated_manifest},
+    )
+    assert response.status_code == status
+    response_json = response.json()
+    assert len(response_json.get("resources")) == 2
+    assert response_json.get("relationships") == []
+    assert response_json.get("unchanged") == []
+    assert response_json.get("deleted") == [test_data_store.get(removed_canvas.get("id"))]
+
+    manifest_id = test_data_store.get(search_manifest.get("id"))
+    response = requests.get(
+        f"{http_service}/iiif/manifest/{manifest_id}/", headers=test_headers
+    )
+    assert response.status_code == 200
+    response_json = response.json()
+    assert len(response_json.get("items")) == 1
+    assert response_json["items"][0].get("label") == {"en": ["Updated canvas"]}
+    assert (
+        response_json["items"][0].get("id")
+        == f"http://localhost:8000/iiif/canvas/{test_data_store.get(search_manifest['items'][0]['id'])}/"
+    )
+
+
+def test_iiif_store_api_iiif_update_delete(http_service, search_manifest):
+    test_endpoint = f"iiif/{test_data_store.get(search_manifest.get('id'))}"
+    status = 204
+    response = requests.delete(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/", headers=test_headers
+    )
+    assert response.status_code == status
+
+    test_endpoint = "iiif"
+    response = requests.get(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/", headers=test_headers
+    )
+    assert response.json().get("count") == 0
+
+
+@pytest.mark.parametrize("async_ingest", ["false", "true"])
+def test_iiif_store_api_iiif_update_invalid_iiif_type(http_service, async_ingest):
+    test_endpoint = "iiif"
+    status = 400
+    iiif_range = {
+        "id": "https://example.org/iiif/range/1",
+        "type": "Range",
+        "items": [],
+    }
+    response = requests.post(
+        f"{http_service}/{app_endpoint}/{test_endpoint}/?update=true&async={async_ingest}",
+        headers=test_headers,
+        json={"iiif_json": iiif_range},
+    )
+    assert response.status_code == status
+    assert response.json().get("iiif_json")
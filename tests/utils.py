@@ -1,3 +1,6 @@
+import json
+import re
+
 import requests
 from requests.exceptions import ConnectionError
 
@@ -14,3 +17,24 @@ def is_responsive_404(url):
     except ConnectionError:
         return False
 
+
+
+UUID_PATTERN = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+)
+
+
+def normalise_uuids(iiif_json):
+    """
+    Replace the uuids in the public ids of the iiif_json with placeholders, numbered
+    in order of their first appearance, so that the iiif_json served by services
+    with different databases can be compared.
+    :param iiif_json:
+    :return:
+    """
+    placeholders = {}
+
+    def placeholder(match):
+        return placeholders.setdefault(match.group(0), f"uuid-{len(placeholders)}")
+
+    return json.loads(UUID_PATTERN.sub(placeholder, json.dumps(iiif_json)))